@@ -5,11 +5,14 @@ __author__ = "Jeroen Van Der Donckt, Emiel Deprost, Jonas Van Der Donckt"
 import math
 import os
 import random
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 
 import dill
+import multiprocess
 import numpy as np
 import pandas as pd
 import pytest
@@ -19,9 +22,13 @@ from scipy.stats import linregress
 from tsflex.features import (
     FeatureCollection,
     FeatureDescriptor,
+    FeaturePlan,
+    FeatureResult,
     FuncWrapper,
     MultipleFeatureDescriptors,
+    WorkerPool,
 )
+from tsflex.features.scheduling import get_task_cost, load_task_costs, schedule_tasks
 from tsflex.utils.data import flatten
 
 from .utils import dummy_data
@@ -2307,3 +2314,506 @@ def test_feature_collection_various_timezones_segment_start_idxs():
         s_usa, segment_start_idxs=s_none.index[:3].values, n_jobs=0, return_df=True
     )
     assert np.all(res.values == [])
+
+
+def test_shared_segmentation_feature_collection(dummy_data, monkeypatch):
+    from tsflex.features.segmenter import StridedRollingFactory
+
+    get_segmenter = StridedRollingFactory.get_segmenter
+    nb_calls = []
+
+    def counting_get_segmenter(*args, **kwargs):
+        nb_calls.append(1)
+        return get_segmenter(*args, **kwargs)
+
+    monkeypatch.setattr(
+        StridedRollingFactory, "get_segmenter", staticmethod(counting_get_segmenter)
+    )
+
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, np.mean, np.std, np.sum],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    assert res_df.shape[1] == 5 * 2 * 2
+    # Only one segmentation per (series_key, window, stride) group
+    assert len(nb_calls) == 2 * 2
+
+    nb_calls.clear()
+    fc.calculate(dummy_data, stride="30s", return_df=True, n_jobs=0)
+    assert len(nb_calls) == 2 * 2
+
+    # The (cached) segmentations are released after the calculation
+    from tsflex.features import feature_collection
+
+    assert feature_collection.get_stroll_func is None
+    fc.calculate_grouped(
+        dummy_data.assign(group=np.arange(len(dummy_data)) // 5_000),
+        group_by="group",
+        n_jobs=0,
+    )
+    assert feature_collection.get_stroll_func is None
+
+
+def test_group_tasks_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, np.max, np.mean, np.std],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides="15s",
+            ),
+            FeatureDescriptor(np.sum, "EDA", "30s", "20s"),
+        ]
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    for n_jobs in [0, 2]:
+        res_grouped = fc.calculate(
+            dummy_data, return_df=True, n_jobs=n_jobs, group_tasks=True
+        )
+        assert_frame_equal(res_df, res_grouped)
+
+    res_list = fc.calculate(dummy_data, n_jobs=0, group_tasks=True)
+    # One DataFrame per (series, window, stride) segmentation
+    assert len(res_list) == 2 * 2 + 1
+    assert sum(df.shape[1] for df in res_list) == fc.get_nb_output_features()
+
+
+def test_fast_aggregates_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.sum, np.mean, np.std, np.min, FuncWrapper(np.max, axis=0)],
+            series_names=["EDA", "TMP", "ACC_x"],
+            windows=["30s", "5min"],
+            strides="2s",
+        )
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    res_fast = fc.calculate(dummy_data, return_df=True, n_jobs=0, fast_aggregates=True)
+    assert_frame_equal(res_df, res_fast, rtol=1e-4)
+    # The min and max are exact
+    cols = [
+        c for c in res_df.columns if c.split("__")[1] in ["min", "amin", "max", "amax"]
+    ]
+    assert len(cols) == 12
+    assert_frame_equal(res_df[cols], res_fast[cols], check_exact=True)
+
+
+def test_worker_pool_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    chunks = [dummy_data.iloc[i : i + 5_000] for i in range(0, 20_000, 5_000)]
+    expected = [fc.calculate(chunk, return_df=True, n_jobs=0) for chunk in chunks]
+
+    with WorkerPool(n_jobs=2) as pool:
+        for group_tasks in [False, True]:
+            for chunk, df_expected in zip(chunks, expected):
+                res_df = fc.calculate(
+                    chunk, return_df=True, group_tasks=group_tasks, executor=pool
+                )
+                assert_frame_equal(res_df, df_expected)
+        pids = [p.pid for p in pool.pool._pool]
+
+        # The feature collection is shared (i.e., serialized) once
+        fc_descriptor = pool.share(fc, version=fc._version)
+        assert list(pool._shared) == [fc_descriptor[0]]
+        # The workers are detached from the series data of the previous calls
+        assert pool.broadcast(_get_nb_worker_shared_memory_blocks) == [0, 0]
+
+        # The worker processes are reused, also when the feature collection changes
+        fc.add(FeatureDescriptor(np.std, "EDA", "30s", "15s"))
+        res_df = fc.calculate(chunks[0], return_df=True, executor=pool)
+        assert_frame_equal(res_df, fc.calculate(chunks[0], return_df=True, n_jobs=0))
+        assert [p.pid for p in pool.pool._pool] == pids
+        # The shared memory of the previous version of the collection is released
+        assert len(pool._shared) == 1
+        assert fc_descriptor[0] not in pool._shared
+
+
+def _get_nb_worker_shared_memory_blocks() -> int:
+    from tsflex.features import feature_collection
+
+    return len(getattr(feature_collection, "shared_memory_blocks", []))
+
+
+def test_thread_executor_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[
+                np.min,
+                FuncWrapper(np.max, vectorized=True, axis=-1),
+                FuncWrapper(np.mean, input_type=pd.Series),
+            ],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    for group_tasks in [False, True]:
+        res_threads = fc.calculate(
+            dummy_data,
+            return_df=True,
+            n_jobs=4,
+            executor="threads",
+            group_tasks=group_tasks,
+        )
+        assert_frame_equal(res_df, res_threads)
+
+    # A custom (in-process) executor
+    with ThreadPoolExecutor(max_workers=2) as thread_pool:
+        res_custom = fc.calculate(
+            dummy_data, return_df=True, executor=thread_pool, show_progress=True
+        )
+    assert_frame_equal(res_df, res_custom)
+
+
+def test_invalid_executor_feature_collection(dummy_data):
+    fc = FeatureCollection(FeatureDescriptor(np.min, "EDA", "30s", "15s"))
+    with pytest.raises(ValueError):
+        fc.calculate(dummy_data, executor="gpu")
+    with pytest.raises(ValueError):
+        fc.calculate(dummy_data, executor=ProcessPoolExecutor(max_workers=1))
+
+    # An error in a thread halts the feature extraction
+    def failing_func(x):
+        raise ValueError("failing")
+
+    fc.add(FeatureDescriptor(failing_func, "TMP", "30s", "15s"))
+    with pytest.raises(RuntimeError):
+        fc.calculate(dummy_data, n_jobs=2, executor="threads")
+
+
+def test_cost_aware_scheduling_feature_collection(dummy_data, tmp_path):
+    def slow_func(x):
+        time.sleep(0.01)
+        return np.mean(x)
+
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, slow_func],
+            series_names=["EDA", "TMP"],
+            windows=["5min", "10min"],
+            strides="5min",
+        )
+    )
+    cost_file_path = tmp_path / "costs.json"
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    for _ in range(2):
+        res_scheduled = fc.calculate(
+            dummy_data, return_df=True, n_jobs=2, cost_file_path=cost_file_path
+        )
+        assert_frame_equal(res_df, res_scheduled)
+
+    # The cost model holds the durations of both runs
+    costs = load_task_costs(cost_file_path)
+    assert set(costs.keys()) == {"amin", "amax", "slow_func"}
+    assert set(costs["slow_func"].keys()) == {"5m", "10m"}
+    # 2 runs of 2 series
+    assert costs["slow_func"]["5m"][1] == 2 * 2
+    assert get_task_cost(costs, "slow_func", pd.Timedelta("5min")) > get_task_cost(
+        costs, "amin", pd.Timedelta("5min")
+    )
+    assert get_task_cost(costs, "unknown_func", pd.Timedelta("5min")) is None
+
+    # The (sequential) calculation also updates the cost model
+    fc.calculate(dummy_data, n_jobs=0, cost_file_path=cost_file_path)
+    assert load_task_costs(cost_file_path)["slow_func"]["5m"][1] == 3 * 2
+
+    # The scheduled (bundled) tasks return the same output list shape
+    for group_tasks in [False, True]:
+        res_list = fc.calculate(dummy_data, n_jobs=0, group_tasks=group_tasks)
+        res_list_scheduled = fc.calculate(
+            dummy_data,
+            n_jobs=2,
+            group_tasks=group_tasks,
+            cost_file_path=cost_file_path,
+        )
+        assert len(res_list_scheduled) == len(res_list)
+        assert sorted(df.shape for df in res_list_scheduled) == sorted(
+            df.shape for df in res_list
+        )
+
+
+def test_schedule_tasks():
+    tasks = [[0], [1], [2, 3], [4], [5]]
+    costs = [0.001, 5.0, 0.002, 1.0, 0.001]
+    # Longest-first & the cheap tasks are bundled
+    assert schedule_tasks(tasks, costs, n_jobs=2) == [[1], [4], [2, 3, 0, 5]]
+    # Enough bundles to balance the load over the workers
+    assert schedule_tasks([[i] for i in range(8)], [1.0] * 8, n_jobs=2) == [
+        [i] for i in range(8)
+    ]
+
+
+def test_calculate_grouped_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    chunks = {
+        subject: dummy_data.iloc[i : i + 5_000]
+        for subject, i in zip(["b", "a", "c"], range(0, 15_000, 5_000))
+    }
+    df_long = pd.concat(
+        [chunk.assign(subject=subject) for subject, chunk in chunks.items()]
+    )
+
+    expected = pd.concat(
+        [
+            fc.calculate(chunks[subject], return_df=True, n_jobs=0)
+            for subject in ["a", "b", "c"]
+        ],
+        keys=["a", "b", "c"],
+        names=["subject"],
+    )
+    for n_jobs, executor, group_tasks in [
+        (0, None, False),
+        (2, None, False),
+        (2, "threads", True),
+    ]:
+        res_df = fc.calculate_grouped(
+            df_long,
+            group_by="subject",
+            n_jobs=n_jobs,
+            executor=executor,
+            group_tasks=group_tasks,
+        )
+        assert res_df.index.names == ["subject", "timestamp"]
+        assert_frame_equal(res_df, expected)
+
+
+def test_calculate_grouped_invalid_args(dummy_data):
+    fc = FeatureCollection(FeatureDescriptor(np.min, "EDA", "30s", "15s"))
+    df_long = dummy_data.iloc[:1000].assign(subject=1)
+    with pytest.raises(KeyError):
+        fc.calculate_grouped(df_long, group_by="id")
+    with pytest.raises(ValueError):
+        with WorkerPool(n_jobs=1) as pool:
+            fc.calculate_grouped(df_long, group_by="subject", executor=pool)
+
+
+def test_npy_data_feature_collection(dummy_data, tmp_path):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    df = dummy_data.tz_convert(None).rename_axis("index")
+    np.save(tmp_path / "index.npy", df.index.values)
+    for col in df.columns:
+        np.save(tmp_path / f"{col}.npy", df[col].values)
+
+    expected = fc.calculate(df, return_df=True, n_jobs=0)
+    for n_jobs in [0, 2]:
+        res_df = fc.calculate(tmp_path, return_df=True, n_jobs=n_jobs)
+        assert_frame_equal(res_df, expected)
+    res_df = fc.calculate(str(tmp_path), return_df=True, n_jobs=0)
+    assert_frame_equal(res_df, expected)
+
+
+def test_lazy_result_feature_collection(dummy_data, tmp_path):
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides="15s",
+            ),
+            FeatureDescriptor(np.std, "ACC_x", "10s", "7s"),
+        ]
+    )
+    df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    res = fc.calculate(dummy_data, return_lazy=True, n_jobs=0)
+    assert isinstance(res, FeatureResult)
+    assert res.columns == list(df.columns)
+    assert_frame_equal(res.to_pandas(), df)
+
+    # Column selection & index slicing only merge the selected features
+    cols = ["ACC_x__std__w=10s", "TMP__amax__w=1m"]
+    start, end = df.index[10], df.index[500]
+    assert_frame_equal(res[cols].to_pandas(), df[cols].dropna(how="all"))
+    assert_frame_equal(res[start:end].to_pandas(), df.loc[start:end])
+    assert_frame_equal(
+        res.select("TMP__amax__w=1m").slice(start=start).to_pandas(),
+        df.loc[start:, ["TMP__amax__w=1m"]].dropna(),
+    )
+
+    index, columns, values = res[cols].to_numpy()
+    assert columns == sorted(cols)
+    assert values.shape == (len(index), 2)
+
+    res[cols].to_parquet(tmp_path / "features.parquet")
+    assert list(pd.read_parquet(tmp_path / "features.parquet").columns) == sorted(cols)
+    with pytest.raises(KeyError):
+        res.select("unknown")
+
+
+def test_reduced_precision_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.mean, FuncWrapper(np.std, output_dtype=np.float64)],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    df_f32 = fc.calculate(dummy_data, return_df=True, n_jobs=0, output_dtype=np.float32)
+    assert_frame_equal(df_f32, df, check_dtype=False, rtol=1e-6)
+    std_cols = [c for c in df.columns if "__std__" in c]
+    assert (df_f32[std_cols].dtypes == np.float64).all()
+    assert (df_f32.drop(columns=std_cols).dtypes == np.float32).all()
+
+    # Calculate the features on the float32 series
+    df_in_f32 = fc.calculate(
+        dummy_data, return_df=True, n_jobs=0, input_dtype="float32"
+    )
+    assert (df_in_f32.drop(columns=std_cols).dtypes == np.float32).all()
+    assert_frame_equal(df_in_f32, df, check_dtype=False, rtol=1e-5)
+
+
+def test_compiled_plan_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides="15s",
+            ),
+            FeatureDescriptor(np.std, "ACC_x", "10s", ["7s", "10s"]),
+        ]
+    )
+    # Only the columns & index dtype of the data are used for compiling the plan
+    plan = fc.compile(dummy_data.iloc[:0])
+    assert isinstance(plan, FeaturePlan)
+    assert sorted(plan.required_series) == ["ACC_x", "EDA", "TMP"]
+
+    for data in [dummy_data.iloc[1000:5000], dummy_data]:
+        df = fc.calculate(data, return_df=True, n_jobs=0)
+        assert plan.columns == list(df.columns)
+        assert_frame_equal(plan.run(data, return_df=True), df)
+        assert_frame_equal(plan.run(data, return_lazy=True).to_pandas(), df)
+        assert plan.run(data, return_np=True)[1] == list(df.columns)
+
+    # The plan is not affected by later changes to the feature collection
+    fc.add(FeatureDescriptor(np.min, "ACC_x", "10s", "7s"))
+    assert_frame_equal(plan.run(dummy_data, return_df=True), df)
+
+    plan = fc.compile(dummy_data, stride="30s", output_dtype=np.float32)
+    df = fc.calculate(dummy_data, stride="30s", return_df=True, n_jobs=0)
+    assert_frame_equal(
+        plan.run(dummy_data, return_df=True), df, check_dtype=False, rtol=1e-6
+    )
+    assert (plan.run(dummy_data, return_df=True).dtypes == np.float32).all()
+
+    with pytest.raises(KeyError):
+        plan.run(dummy_data.drop(columns=["TMP"]))
+    with pytest.raises(KeyError):
+        fc.compile(dummy_data[["EDA", "TMP"]])
+
+
+def test_shared_memory_feature_collection(dummy_data):
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+            series_names=["EDA", "TMP"],
+            windows=["30s", "1min"],
+            strides="15s",
+        )
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    for group_tasks in [False, True]:
+        res_shm = fc.calculate(
+            dummy_data,
+            return_df=True,
+            n_jobs=2,
+            use_shared_memory=True,
+            group_tasks=group_tasks,
+        )
+        assert_frame_equal(res_df, res_shm)
+
+    # Sequence-indexed data
+    df = dummy_data.reset_index(drop=True)
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors([np.min, np.max], ["EDA", "TMP"], 400, 100)
+    )
+    res_df = fc.calculate(df, return_df=True, n_jobs=0)
+    res_shm = fc.calculate(df, return_df=True, n_jobs=2, use_shared_memory=True)
+    assert_frame_equal(res_df, res_shm)
+
+    # The spawned worker processes only receive the shared memory descriptors
+    start_method = multiprocess.get_start_method()
+    multiprocess.set_start_method("spawn", force=True)
+    try:
+        res_shm = fc.calculate(df, return_df=True, n_jobs=2, use_shared_memory=True)
+    finally:
+        multiprocess.set_start_method(start_method, force=True)
+    assert_frame_equal(res_df, res_shm)
+
+
+def test_columnar_output_assembly(dummy_data):
+    def count_int(x):
+        return np.int64(len(x))
+
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, FuncWrapper(count_int, output_names="count")],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides=["15s", "20s"],
+            ),
+            FeatureDescriptor(np.max, "ACC_x", "10s", "7s"),
+        ]
+    )
+    res_list = fc.calculate(dummy_data, n_jobs=0)
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+
+    # Compare with the outer concatenation of the per-feature outputs
+    expected = pd.concat(res_list, axis=1, join="outer")
+    expected = expected.reindex(sorted(expected.columns), axis=1)
+    assert_frame_equal(res_df, expected)
+    assert res_df.index.is_monotonic_increasing
+    # Integer columns are promoted to float (bc of missing values)
+    assert res_df["EDA__count__w=30s"].dtype == np.float64
+
+    index, columns, values = fc.calculate(dummy_data, return_np=True, n_jobs=0)
+    assert isinstance(index, np.ndarray) and isinstance(values, np.ndarray)
+    assert columns == list(res_df.columns)
+    assert np.all(index == res_df.index.values)
+    assert np.allclose(values, res_df.values, equal_nan=True)
+
+    # Outputs with the same index retain their dtype
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors(
+            [np.min, FuncWrapper(count_int, output_names="count")], "EDA", "30s", "15s"
+        )
+    )
+    res_df = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+    assert res_df["EDA__count__w=30s"].dtype == np.int64
+    assert res_df["EDA__amin__w=30s"].dtype == np.float32
+    index, columns, values = fc.calculate(dummy_data, return_np=True, n_jobs=0)
+    assert columns == ["EDA__amin__w=30s", "EDA__count__w=30s"]
+    assert values.dtype == np.float64
+    assert np.all(values == res_df.values)
@@ -105,3 +105,15 @@ def test_error_func_wrapper_wrong_outputnames_type():
 def test_illegal_func_wrapper_vectorized_wrong_input_type():
     with pytest.raises(AssertionError):
         FuncWrapper(np.min, input_type=pd.Series, vectorized=True, axis=1)
+
+
+def test_illegal_func_wrapper_ragged_not_vectorized():
+    with pytest.raises(AssertionError):
+        FuncWrapper(np.ma.min, ragged=True, axis=1)
+
+
+def test_illegal_func_wrapper_max_batch_windows():
+    with pytest.raises(AssertionError):
+        FuncWrapper(np.min, max_batch_windows=10)
+    with pytest.raises(AssertionError):
+        FuncWrapper(np.min, vectorized=True, max_batch_windows=0, axis=1)
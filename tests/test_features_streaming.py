@@ -0,0 +1,128 @@
+"""Tests for the streaming feature collection functionality."""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from tsflex.features import (
+    FeatureCollection,
+    FeatureDescriptor,
+    FuncWrapper,
+    MultipleFeatureDescriptors,
+    StreamingFeatureCollection,
+)
+
+from .utils import dummy_data
+
+
+def _push_in_chunks(sfc, df, chunk_sizes):
+    outputs, start = [], 0
+    for chunk_size in chunk_sizes:
+        outputs.append(sfc.push(df.iloc[start : start + chunk_size]))
+        start += chunk_size
+    outputs.append(sfc.push(df.iloc[start:]))
+    return pd.concat([o for o in outputs if len(o)])
+
+
+def test_streaming_time_index(dummy_data):
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides=["15s", "20s"],
+            ),
+            FeatureDescriptor(np.std, ("ACC_x"), "10s", "7s"),
+        ]
+    )
+    expected = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+
+    for chunk_sizes in [[1000] * 20, [1, 5, 2000, 37, 7000, 3]]:
+        sfc = StreamingFeatureCollection(fc)
+        out = _push_in_chunks(sfc, dummy_data, chunk_sizes)
+        out = out.groupby(level=0).first()  # combine the outputs of the windows
+        assert_frame_equal(out.reindex(sorted(out.columns), axis=1), expected)
+        # Only the tail of the data is retained
+        assert all(len(s) < 60 * 4 + 1000 for s in sfc._buffers.values())
+
+
+def test_streaming_sequence_index(dummy_data):
+    df = dummy_data.reset_index(drop=True)
+    fc = FeatureCollection(
+        MultipleFeatureDescriptors([np.min, np.sum], ["EDA", "TMP"], 400, 100)
+    )
+    expected = fc.calculate(df, return_df=True, n_jobs=0)
+
+    sfc = StreamingFeatureCollection(fc)
+    out = _push_in_chunks(sfc, df, [250] * 100)
+    assert_frame_equal(out, expected)
+
+    # Overriding the stride
+    expected = fc.calculate(df, stride=[150, 200], return_df=True, n_jobs=0)
+    sfc = StreamingFeatureCollection(fc, stride=[150, 200])
+    out = _push_in_chunks(sfc, df, [1000] * 25)
+    assert_frame_equal(out, expected)
+
+
+def test_streaming_errors(dummy_data):
+    fc = FeatureCollection(FeatureDescriptor(np.min, "EDA", "30s", "15s"))
+    sfc = StreamingFeatureCollection(fc)
+    # No output when there are no completed windows
+    assert sfc.push(dummy_data.iloc[:10]).empty
+    with pytest.raises(ValueError):
+        sfc.push(dummy_data.iloc[:20])
+
+    sfc.reset()
+    assert len(sfc.push(dummy_data.iloc[:1000]))
+
+    # The window & stride types must match the index type
+    sfc = StreamingFeatureCollection(
+        FeatureCollection(FeatureDescriptor(np.min, "EDA", 400, 100))
+    )
+    with pytest.raises(ValueError):
+        sfc.push(dummy_data.iloc[:1000])
+    with pytest.raises(ValueError):
+        StreamingFeatureCollection(fc).push(dummy_data.reset_index(drop=True))
+
+
+def test_streaming_calculate_parquet(dummy_data, tmp_path):
+    pytest.importorskip("pyarrow")
+    fc = FeatureCollection(
+        [
+            MultipleFeatureDescriptors(
+                functions=[np.min, np.max, FuncWrapper(np.mean, input_type=pd.Series)],
+                series_names=["EDA", "TMP"],
+                windows=["30s", "1min"],
+                strides=["15s", "20s"],
+            ),
+            FeatureDescriptor(np.std, ("ACC_x"), "10s", "7s"),
+        ]
+    )
+    expected = fc.calculate(dummy_data, return_df=True, n_jobs=0)
+
+    # A partitioned dataset with small row groups
+    (tmp_path / "data").mkdir()
+    for i, start in enumerate(range(0, len(dummy_data), 7_000)):
+        dummy_data.iloc[start : start + 7_000].to_parquet(
+            tmp_path / "data" / f"part_{i}.parquet", row_group_size=1_000
+        )
+    sfc = StreamingFeatureCollection(fc)
+    sfc.calculate_parquet(tmp_path / "data", tmp_path / "features.parquet")
+    out = pd.read_parquet(tmp_path / "features.parquet")
+    assert_frame_equal(out, expected, check_dtype=False, check_freq=False)
+
+    # Only the required series are read and the index column can be passed
+    df = dummy_data.reset_index()
+    df.to_parquet(tmp_path / "data.parquet", row_group_size=2_500)
+    sfc.calculate_parquet(
+        [tmp_path / "data.parquet"],
+        tmp_path / "features_2.parquet",
+        index_column="timestamp",
+        batch_size=500,
+    )
+    out = pd.read_parquet(tmp_path / "features_2.parquet")
+    assert_frame_equal(out, expected, check_dtype=False, check_freq=False)
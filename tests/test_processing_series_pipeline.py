@@ -3,6 +3,7 @@
 __author__ = "Jeroen Van Der Donckt, Emiel Deprost, Jonas Van Der Donckt"
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import dill
@@ -10,7 +11,12 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from tsflex.processing import SeriesPipeline, SeriesProcessor, dataframe_func
+from tsflex.processing import (
+    ProcessingCache,
+    SeriesPipeline,
+    SeriesProcessor,
+    dataframe_func,
+)
 from tsflex.processing.series_pipeline import _ProcessingError
 
 from .utils import dummy_data
@@ -434,3 +440,261 @@ def test_serialization(dummy_data):
         equal_nan=True,
     )
     os.remove(save_path)
+
+
+def test_parallel_series_pipeline(dummy_data):
+    def interpolate(series: pd.Series) -> pd.Series:
+        return series.interpolate()
+
+    def clip(series: pd.Series, lower: float = 0) -> pd.Series:
+        return series.clip(lower=lower)
+
+    def diff(series: pd.Series) -> pd.Series:
+        return series.diff().rename(f"{series.name}_diff")
+
+    def ratio(s1: pd.Series, s2: pd.Series) -> pd.Series:
+        return (s1 / s2).rename(f"{s1.name}_{s2.name}_ratio")
+
+    inp = dummy_data.copy()
+    inp.loc[inp["TMP"] > 31.5, "TMP"] = np.nan
+    series_pipeline = SeriesPipeline(
+        [
+            SeriesProcessor(interpolate, ["TMP", "EDA", "ACC_x"]),  # 0
+            SeriesProcessor(clip, "EDA", lower=0.3),  # 1: depends on 0
+            SeriesProcessor(diff, ["ACC_x", "ACC_y"]),  # 2: depends on 0
+            SeriesProcessor(clip, "ACC_y", lower=-5),  # 3: depends on 2
+            SeriesProcessor(ratio, [("TMP", "EDA")]),  # 4: depends on 0 & 1
+            SeriesProcessor(
+                diff, "TMP", processor_options={"output_names": "TMP_diff"}
+            ),  # 5
+        ]
+    )
+    assert series_pipeline._get_step_dependencies(set(inp.columns)) == [
+        set(),
+        {0},
+        {0},
+        {2},
+        {0, 1},
+        # The new TMP_diff series might be output by the undeclared processors
+        {0, 1, 2, 3, 4},
+    ]
+
+    expected = series_pipeline.process(inp, return_df=True)
+    expected_list = series_pipeline.process(inp, return_all_series=False)
+    for executor in ["threads", "processes", ThreadPoolExecutor(max_workers=2)]:
+        res = series_pipeline.process(inp, return_df=True, n_jobs=3, executor=executor)
+        pd.testing.assert_frame_equal(res, expected)
+        res_list = series_pipeline.process(
+            inp, return_all_series=False, n_jobs=3, executor=executor
+        )
+        assert [s.name for s in res_list] == [s.name for s in expected_list]
+
+    with pytest.raises(_ProcessingError):
+        SeriesPipeline(
+            [
+                SeriesProcessor(
+                    interpolate, "EDA", processor_options={"output_names": "x"}
+                )
+            ]
+        ).process(inp, n_jobs=2)
+    with pytest.raises(ValueError):
+        series_pipeline.process(inp, n_jobs=2, executor="unknown")
+
+
+def test_pruned_outputs_series_pipeline(dummy_data):
+    calls = []
+
+    def interpolate(series: pd.Series) -> pd.Series:
+        calls.append(("interpolate", series.name))
+        return series.interpolate()
+
+    def diff(series: pd.Series) -> pd.Series:
+        calls.append(("diff", series.name))
+        return series.diff().rename(f"{series.name}_diff")
+
+    def ratio(s1: pd.Series, s2: pd.Series) -> pd.Series:
+        calls.append(("ratio", s1.name))
+        return (s1 / s2).rename(f"{s1.name}_{s2.name}_ratio")
+
+    series_pipeline = SeriesPipeline(
+        [
+            SeriesProcessor(interpolate, ["TMP", "EDA"]),
+            SeriesProcessor(interpolate, ["ACC_x", "ACC_y"]),
+            SeriesProcessor(
+                diff,
+                ["TMP", "ACC_x"],
+                processor_options={"output_names": ["TMP_diff", "ACC_x_diff"]},
+            ),
+            SeriesProcessor(
+                ratio,
+                [("ACC_x", "ACC_y")],
+                processor_options={"output_names": "ACC_x_ACC_y_ratio"},
+            ),
+        ]
+    )
+    expected = series_pipeline.process(dummy_data, return_df=True)
+
+    calls.clear()
+    res = series_pipeline.process(
+        dummy_data, return_df=True, outputs=["TMP_diff", "EDA"]
+    )
+    # The ratio step is skipped
+    assert ("ratio", "ACC_x") not in calls
+    assert ("interpolate", "EDA") in calls and ("diff", "TMP") in calls
+    assert sorted(res.columns) == ["EDA", "TMP_diff"]
+    pd.testing.assert_frame_equal(
+        res.dropna(how="all"), expected[res.columns].dropna(how="all")
+    )
+
+    calls.clear()
+    res_list = series_pipeline.process(dummy_data, outputs=["ACC_x_ACC_y_ratio"])
+    assert [s.name for s in res_list] == ["ACC_x_ACC_y_ratio"]
+    assert ("interpolate", "TMP") not in calls and ("diff", "TMP") not in calls
+    pd.testing.assert_series_equal(res_list[0], expected["ACC_x_ACC_y_ratio"])
+
+    assert series_pipeline.get_required_steps(["TMP"]) == [
+        series_pipeline.processing_steps[0]
+    ]
+    with pytest.raises(KeyError):
+        series_pipeline.process(dummy_data, outputs=["unknown"])
+
+
+def test_cached_series_pipeline(dummy_data, tmp_path, monkeypatch):
+    calls = []
+    processor_call = SeriesProcessor.__call__
+    monkeypatch.setattr(
+        SeriesProcessor,
+        "__call__",
+        lambda self, series_dict: calls.append(self.name)
+        or processor_call(self, series_dict),
+    )
+
+    def interpolate(series: pd.Series) -> pd.Series:
+        return series.interpolate()
+
+    def clip(series: pd.Series, lower: float) -> pd.Series:
+        return series.clip(lower=lower)
+
+    inp = dummy_data.copy()
+    inp.loc[inp["TMP"] > 31.5, "TMP"] = np.nan
+    cache = ProcessingCache(tmp_path / "cache")
+    series_pipeline = SeriesPipeline(
+        [
+            SeriesProcessor(interpolate, ["TMP", "EDA"]),
+            SeriesProcessor(clip, "EDA", lower=0.3),
+        ]
+    )
+    expected = series_pipeline.process(inp, return_df=True)
+    calls.clear()
+    res = series_pipeline.process(inp, return_df=True, cache=cache)
+    pd.testing.assert_frame_equal(res, expected)
+    assert calls == ["interpolate", "clip"]
+
+    # The outputs are loaded from the cache
+    calls.clear()
+    res = series_pipeline.process(inp, return_df=True, cache=cache, n_jobs=2)
+    pd.testing.assert_frame_equal(res, expected)
+    assert calls == []
+
+    # Corrupt (e.g., truncated) outputs are removed and recomputed
+    paths = sorted((tmp_path / "cache").iterdir())
+    paths[0].write_bytes(paths[0].read_bytes()[:100])
+    paths[1].write_bytes(b"not a pickle")
+    res = series_pipeline.process(inp, return_df=True, cache=cache)
+    pd.testing.assert_frame_equal(res, expected)
+    assert sorted(calls) == ["clip", "interpolate"]
+    calls.clear()
+    series_pipeline.process(inp, cache=cache)
+    assert calls == []
+
+    # Only the changed step (and the steps on changed inputs) are recomputed
+    series_pipeline.processing_steps[1] = SeriesProcessor(clip, "EDA", lower=0.4)
+    series_pipeline.process(inp, cache=cache)
+    assert calls == ["clip"]
+    calls.clear()
+    inp.iloc[0, inp.columns.get_loc("TMP")] = 30
+    series_pipeline.process(inp, cache=cache)
+    assert calls == ["interpolate"]
+
+    # Least recently used outputs are evicted
+    assert len(list((tmp_path / "cache").iterdir())) == 4
+    max_size = cache.size * 2 // 3
+    small_cache = ProcessingCache(tmp_path / "cache", max_size=max_size)
+    calls.clear()
+    inp.iloc[1, inp.columns.get_loc("TMP")] = 30.5
+    series_pipeline.process(inp, cache=small_cache)
+    assert calls == ["interpolate"]
+    assert small_cache.size <= max_size
+    assert len(list((tmp_path / "cache").iterdir())) < 5
+    # The most recently used outputs are retained
+    calls.clear()
+    series_pipeline.process(inp, cache=small_cache)
+    assert calls == []
+    small_cache.clear()
+    assert small_cache.size == 0
+
+
+def test_inplace_series_pipeline(dummy_data):
+    def scale(series: pd.Series, factor: float) -> pd.Series:
+        values = series.values
+        values *= factor  # Modify the input buffer in place
+        return series
+
+    def new_index(series: pd.Series) -> pd.Series:
+        # Output with an equal (but not the same) index object
+        return pd.Series(
+            series.values + 1, index=series.index.copy(), name=f"{series.name}_1"
+        )
+
+    inp = dummy_data[["EDA", "TMP"]].dropna()
+    inp_copy = inp.copy()
+    series_pipeline = SeriesPipeline(
+        [
+            SeriesProcessor(
+                scale, "EDA", processor_options={"inplace": True}, factor=2
+            ),
+            SeriesProcessor(new_index, "EDA"),
+            SeriesProcessor(
+                scale, ["EDA", "EDA_1"], processor_options={"inplace": True}, factor=3
+            ),
+        ]
+    )
+    for n_jobs in [1, 2]:
+        for copy in [False, True]:
+            res = series_pipeline.process(inp, copy=copy, n_jobs=n_jobs)
+            # The passed data is not modified
+            pd.testing.assert_frame_equal(inp, inp_copy)
+            res = {s.name: s for s in res}
+            np.testing.assert_allclose(res["EDA"].values, inp["EDA"].values * 6)
+            np.testing.assert_allclose(
+                res["EDA_1"].values, (inp["EDA"].values * 2 + 1) * 3
+            )
+            if copy:
+                assert not np.shares_memory(res["TMP"].values, inp["TMP"].values)
+            # Equal indexes are shared
+            assert res["EDA_1"].index is res["EDA"].index
+    assert series_pipeline._get_step_dependencies(set(inp.columns)) == [
+        set(),
+        {0},
+        {0, 1},
+    ]
+
+    # A series that shares its buffer with another series is copied
+    def view(series: pd.Series) -> pd.Series:
+        return pd.Series(series.values, index=series.index, name=f"{series.name}_view")
+
+    series_pipeline = SeriesPipeline(
+        [
+            SeriesProcessor(
+                scale, "EDA", processor_options={"inplace": True}, factor=2
+            ),
+            SeriesProcessor(view, "EDA"),
+            SeriesProcessor(
+                scale, "EDA_view", processor_options={"inplace": True}, factor=3
+            ),
+        ]
+    )
+    res = {s.name: s for s in series_pipeline.process(inp)}
+    np.testing.assert_allclose(res["EDA"].values, inp["EDA"].values * 2)
+    np.testing.assert_allclose(res["EDA_view"].values, inp["EDA"].values * 6)
+    pd.testing.assert_frame_equal(inp, inp_copy)
@@ -662,3 +662,81 @@ def test_error_series_list_no_valid_output_series_processor(dummy_data):
 
 
 ### Test output types (np.float32)
+
+
+def test_parallel_series_processor(dummy_data):
+    from scipy.signal import butter, sosfiltfilt
+
+    def bandpass(series: pd.Series, low: float, high: float) -> np.ndarray:
+        sos = butter(2, [low, high], btype="band", fs=32, output="sos")
+        return sosfiltfilt(sos, series.values)
+
+    def diff(s1: pd.Series, s2: pd.Series) -> pd.Series:
+        return (s1 - s2).rename(f"{s1.name}-{s2.name}")
+
+    series_dict = dataframe_to_series_dict(
+        dummy_data[["ACC_x", "ACC_y", "ACC_z"]].dropna()
+    )
+    for function, series_names, kwargs in [
+        (bandpass, ["ACC_x", "ACC_y", "ACC_z"], dict(low=0.5, high=5)),
+        (diff, [("ACC_x", "ACC_y"), ("ACC_y", "ACC_z")], {}),
+    ]:
+        expected = SeriesProcessor(function, series_names, **kwargs)(series_dict)
+        for executor in ["threads", "processes"]:
+            processor = SeriesProcessor(
+                function,
+                series_names,
+                processor_options={"n_jobs": 2, "executor": executor},
+                **kwargs,
+            )
+            res = processor(series_dict)
+            # The outputs are merged in the order of the series_names
+            assert list(res.keys()) == list(expected.keys())
+            for key in expected:
+                assert_series_equal(res[key], expected[key])
+
+    with pytest.raises(ValueError):
+        SeriesProcessor(
+            diff,
+            [("ACC_x", "ACC_y")],
+            processor_options={"n_jobs": 2, "executor": "unknown"},
+        )
+
+    # An n_jobs keyword argument is passed to the function
+    def scale(series: pd.Series, n_jobs: int) -> pd.Series:
+        return series * n_jobs
+
+    processor = SeriesProcessor(scale, ["ACC_x", "ACC_y"], n_jobs=4)
+    assert processor.n_jobs == 1
+    res = processor(series_dict)
+    for key in ["ACC_x", "ACC_y"]:
+        assert_series_equal(res[key], series_dict[key] * 4)
+
+
+def test_processor_options_series_processor(dummy_data):
+    def add_suffix(series: pd.Series, output_names: str) -> pd.Series:
+        return series.rename(f"{series.name}_{output_names}")
+
+    series_dict = dataframe_to_series_dict(dummy_data[["TMP", "EDA"]])
+    # The keyword arguments are passed to the function
+    processor = SeriesProcessor(add_suffix, ["TMP", "EDA"], output_names="new")
+    assert processor.get_output_series() is None
+    assert list(processor(series_dict).keys()) == ["TMP_new", "EDA_new"]
+
+    # The processor options are not passed to the function
+    processor = SeriesProcessor(
+        add_suffix,
+        ["TMP", "EDA"],
+        processor_options={"output_names": ["TMP_new", "EDA_new"]},
+        output_names="new",
+    )
+    assert processor.get_output_series() == ["TMP_new", "EDA_new"]
+    assert list(processor(series_dict).keys()) == ["TMP_new", "EDA_new"]
+    processor = SeriesProcessor(
+        add_suffix, "TMP", processor_options={"output_names": "x"}, output_names="new"
+    )
+    with pytest.raises(AssertionError):
+        processor(series_dict)
+
+    with pytest.raises(ValueError):
+        SeriesProcessor(add_suffix, "TMP", processor_options={"unknown": 1})
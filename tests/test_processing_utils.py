@@ -5,7 +5,12 @@ from typing import List
 import pandas as pd
 
 from tsflex.chunking import chunk_data
-from tsflex.processing import SeriesPipeline, SeriesProcessor, dataframe_func
+from tsflex.processing import (
+    SeriesPipeline,
+    SeriesProcessor,
+    WorkerPool,
+    dataframe_func,
+)
 from tsflex.processing.utils import process_chunks_multithreaded
 
 from .utils import dummy_data
@@ -45,3 +50,34 @@ def test_process_chunks_multithreaded(dummy_data):
     assert len(out) == 1
     assert isinstance(out[0], pd.DataFrame)
     assert set(out[0].columns) == set(dummy_data.columns)
+
+
+def test_process_chunks_multithreaded_worker_pool(dummy_data):
+    def clip(series: pd.Series, upper: float) -> pd.Series:
+        return series.clip(upper=upper)
+
+    series_pipeline = SeriesPipeline(
+        [SeriesProcessor(series_names="TMP", function=clip, upper=31.5)]
+    )
+    chunks = chunk_data(
+        data=dummy_data[["TMP", "EDA"]],
+        fs_dict={"TMP": 4, "EDA": 4},
+        max_chunk_dur="10min",
+    )
+    assert len(chunks) > 2
+    expected = [series_pipeline.process(c, return_df=True) for c in chunks]
+
+    with WorkerPool(n_jobs=2) as pool:
+        for _ in range(2):  # The worker processes are reused
+            out = process_chunks_multithreaded(
+                chunks,
+                series_pipeline,
+                show_progress=False,
+                executor=pool,
+                return_df=True,
+            )
+            assert len(out) == len(expected)
+            for df, df_expected in zip(out, expected):
+                pd.testing.assert_frame_equal(df, df_expected)
+            # The shared memory of the pipeline is released after each call
+            assert not len(pool._shared)
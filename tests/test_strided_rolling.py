@@ -1860,3 +1860,324 @@ def test_various_time_zones():
             window=pd.Timedelta(3, unit="h"),
             strides=[pd.Timedelta(3, unit="h")],
         )
+
+
+def test_stroll_apply_funcs(dummy_data):
+    funcs = [
+        FuncWrapper(np.min),
+        FuncWrapper(np.max),
+        FuncWrapper(np.percentile, output_names=["q10", "q90"], q=[10, 90]),
+    ]
+    for stroll in [
+        TimeStridedRolling(
+            dummy_data["EDA"], window=pd.Timedelta("30s"), strides=pd.Timedelta("5s")
+        ),
+        TimeIndexSampleStridedRolling(dummy_data["EDA"], window=100, strides=50),
+    ]:
+        out = stroll.apply_funcs(funcs)
+        assert out.shape[1] == 4
+        expected = pd.concat([stroll.apply_func(f) for f in funcs], axis=1)
+        pd.testing.assert_frame_equal(out, expected)
+
+
+def test_stroll_rolling_aggregates(dummy_data):
+    # Irregularly sampled data (i.e., windows with a varying number of samples)
+    eda = dummy_data["EDA"].sample(frac=0.8, random_state=42).sort_index()
+    eda_int = (eda * 1000).astype("int32")
+    funcs = [np.sum, np.mean, np.var, np.std, np.min, np.max]
+    for s in [eda, eda_int, eda.astype("float64")]:
+        for fast_aggregates in [False, True]:
+            stroll = TimeStridedRolling(
+                s,
+                window=pd.Timedelta("1min"),
+                strides=pd.Timedelta("3s"),
+                approve_sparsity=True,
+                fast_aggregates=fast_aggregates,
+            )
+            out = stroll.apply_funcs([FuncWrapper(f) for f in funcs])
+            # Compare with applying the functions on each (non-vectorized) window
+            expected = stroll.apply_funcs(
+                [
+                    FuncWrapper(lambda x, f=f: f(x), output_names=f.__name__)
+                    for f in funcs
+                ]
+            )
+            assert out.dtypes.equals(expected.dtypes)
+            exact_cols = [
+                c
+                for c in out.columns
+                if c.split("__")[1] in ["min", "amin", "max", "amax"]
+            ]
+            assert len(exact_cols) == 2
+            if s.dtype.kind == "i":
+                exact_cols += [c for c in out.columns if "__sum__" in c]
+            pd.testing.assert_frame_equal(
+                out[exact_cols], expected[exact_cols], check_exact=True
+            )
+            rtol = 1e-4 if s.dtype == "float32" and fast_aggregates else 1e-7
+            pd.testing.assert_frame_equal(
+                out, expected, rtol=rtol, check_exact=not fast_aggregates
+            )
+
+    # NaNs propagate as in numpy
+    s = eda.copy()
+    s.iloc[100] = np.nan
+    stroll = TimeStridedRolling(
+        s, window=pd.Timedelta("1min"), strides=pd.Timedelta("3s"), fast_aggregates=True
+    )
+    out = stroll.apply_funcs([FuncWrapper(np.mean), FuncWrapper(np.max)])
+    assert out.isna().sum().tolist() == [10, 10]
+    expected = stroll.apply_funcs(
+        [FuncWrapper(lambda x, f=f: f(x), output_names=f.__name__) for f in funcs]
+    )
+    pd.testing.assert_frame_equal(out, expected[out.columns], rtol=1e-4)
+    # The max is also exact for the windows that contain a nan
+    max_col = [c for c in out.columns if "__amax__" in c or "__max__" in c]
+    assert len(max_col) == 1
+    pd.testing.assert_frame_equal(out[max_col], expected[max_col], check_exact=True)
+
+
+def test_stroll_apply_func_vectorized_ragged(dummy_data):
+    # Irregularly sampled data with a gap (i.e., empty windows)
+    eda = dummy_data["EDA"].sample(frac=0.8, random_state=42).sort_index()
+    gap = (eda.index > eda.index[0] + pd.Timedelta("2min")) & (
+        eda.index < eda.index[0] + pd.Timedelta("4min")
+    )
+    eda = eda[~gap]
+
+    def median_mean(x, axis):
+        return np.ma.median(x, axis=axis), np.ma.mean(x, axis=axis)
+
+    def median_mean_robust(x):
+        return (np.median(x), np.mean(x)) if len(x) else (np.nan, np.nan)
+
+    f_vect = FuncWrapper(
+        median_mean, output_names=["med", "mean"], vectorized=True, ragged=True, axis=1
+    )
+    f = FuncWrapper(median_mean_robust, output_names=["med", "mean"])
+    stroll = TimeStridedRolling(
+        eda,
+        window=pd.Timedelta("30s"),
+        strides=pd.Timedelta("10s"),
+        approve_sparsity=True,
+    )
+    out = stroll.apply_func(f_vect)
+    assert out.isna().any().all()  # the empty windows
+    pd.testing.assert_frame_equal(out, stroll.apply_func(f), rtol=1e-5)
+
+    # The non-ragged vectorized function requires an equal nb. of samples per window
+    with pytest.raises(Exception):
+        stroll.apply_func(FuncWrapper(np.median, vectorized=True, axis=1))
+
+
+def test_stroll_apply_func_vectorized_batches(dummy_data):
+    def centered_std_max(x, axis):
+        centered = x - x.mean(axis=axis, keepdims=True)
+        assert len(centered) <= 7  # the max nb. of windows per batch
+        return np.std(centered, axis=axis), np.max(centered, axis=axis)
+
+    f = FuncWrapper(
+        centered_std_max, output_names=["std", "max"], vectorized=True, axis=1
+    )
+    f_batched = FuncWrapper(
+        centered_std_max,
+        output_names=["std", "max"],
+        vectorized=True,
+        max_batch_windows=7,
+        axis=1,
+    )
+    stroll = TimeStridedRolling(
+        dummy_data["EDA"], window=pd.Timedelta("30s"), strides=pd.Timedelta("10s")
+    )
+    with pytest.raises(AssertionError):
+        stroll.apply_func(f)
+    out = stroll.apply_func(f_batched)
+    assert len(out) > 7 and len(out) % 7 != 0
+    expected = stroll.apply_func(
+        FuncWrapper(lambda x: centered_std_max(x[None], 1)[0][0], output_names="std")
+    )
+    pd.testing.assert_series_equal(out.iloc[:, 0], expected.iloc[:, 0], rtol=1e-5)
+
+    # The default batch size of the StridedRolling (also for ragged functions)
+    stroll = TimeStridedRolling(
+        dummy_data["EDA"],
+        window=pd.Timedelta("30s"),
+        strides=pd.Timedelta("10s"),
+        max_batch_windows=7,
+    )
+    pd.testing.assert_frame_equal(stroll.apply_func(f), out)
+    f_ragged = FuncWrapper(
+        centered_std_max,
+        output_names=["std", "max"],
+        vectorized=True,
+        ragged=True,
+        axis=1,
+    )
+    pd.testing.assert_frame_equal(
+        stroll.apply_func(f_ragged), out, atol=1e-6, check_dtype=False
+    )
+
+
+def test_stroll_apply_func_compiled(dummy_data, monkeypatch):
+    from tsflex.features.segmenter import compiled_kernel
+
+    def range_corr(x, y, scale=1.0):
+        return (np.max(x) - np.min(x)) * scale, np.corrcoef(x, y)[0, 1]
+
+    # Irregularly sampled data
+    df = dummy_data[["EDA", "TMP"]].sample(frac=0.8, random_state=42).sort_index()
+    stroll = TimeStridedRolling(
+        df,
+        window=pd.Timedelta("30s"),
+        strides=pd.Timedelta("3s"),
+        approve_sparsity=True,
+    )
+    output_names = ["range", "corr"]
+    f = FuncWrapper(range_corr, output_names=output_names, scale=2.0)
+    f_compiled = FuncWrapper(
+        range_corr, output_names=output_names, compiled=True, scale=2.0
+    )
+    expected = stroll.apply_func(f)
+
+    # Falls back to the regular execution when numba is not installed
+    with monkeypatch.context() as m:
+        m.setattr(compiled_kernel, "numba", None)
+        pd.testing.assert_frame_equal(stroll.apply_func(f_compiled), expected)
+
+    pytest.importorskip("numba")
+    pd.testing.assert_frame_equal(stroll.apply_func(f_compiled), expected)
+
+    with pytest.raises(AssertionError):
+        FuncWrapper(range_corr, compiled=True, vectorized=True, axis=1)
+
+
+def test_stroll_apply_func_output_dtypes(dummy_data):
+    stroll = SequenceStridedRolling(
+        dummy_data["EDA"].reset_index(drop=True), window=100, strides=30
+    )
+    funcs = {
+        "float64": FuncWrapper(lambda x: float(x[0]), output_names="f64"),
+        "float32": FuncWrapper(lambda x: x[0], output_names="f32"),
+        "int64": FuncWrapper(len, output_names="len"),
+        "bool": FuncWrapper(lambda x: bool(x[0] > 0.5), output_names="b"),
+        "object": FuncWrapper(lambda x: "a" * (len(x) // 50), output_names="s"),
+    }
+    for dtype, f in funcs.items():
+        out = stroll.apply_func(f)
+        assert out.iloc[:, 0].dtype == dtype
+        assert len(out) == len(stroll.index)
+
+    # Multiple outputs, of which the first window (i.e., the dtype probe) is float64
+    def first_and_len(x):
+        return float(x[0]), len(x) if len(x) < 100 else 100.5
+
+    out = stroll.apply_func(FuncWrapper(first_and_len, output_names=["first", "len"]))
+    assert (out.dtypes == "float64").all()
+    assert out.iloc[:, 1].eq(100.5).all()
+    np.testing.assert_array_equal(
+        out.iloc[:, 0].values,
+        stroll.series_containers[0].values[stroll.series_containers[0].start_indexes],
+    )
+
+
+def test_stroll_apply_func_mixed_output_dtypes(dummy_data):
+    stroll = SequenceStridedRolling(
+        dummy_data["EDA"].reset_index(drop=True), window=100, strides=30
+    )
+    sc = stroll.series_containers[0]
+    first_values = sc.values[sc.start_indexes]
+    # The windows (after the first window) of which the output dtype differs
+    is_other = first_values > np.median(first_values)
+    is_other[0] = False
+    threshold = first_values[is_other].min()
+
+    # The first window output is a float, some later outputs are complex
+    def float_or_complex(x):
+        return complex(x[0], 1) if x[0] >= threshold else float(x[0])
+
+    out = stroll.apply_func(FuncWrapper(float_or_complex, output_names="c"))
+    assert out.iloc[:, 0].dtype == np.complex128
+    np.testing.assert_array_equal(out.iloc[:, 0].values.real, first_values)
+    np.testing.assert_array_equal(out.iloc[:, 0].values.imag, is_other)
+
+    # The first window output is a float, some later outputs are None
+    def float_or_none(x):
+        return None if x[0] >= threshold else float(x[0])
+
+    out = stroll.apply_func(FuncWrapper(float_or_none, output_names="n"))
+    assert out.iloc[:, 0].dtype == object
+    assert all(v is None for v in out.iloc[is_other, 0])
+    assert list(out.iloc[~is_other, 0]) == list(first_values[~is_other])
+
+
+def test_stroll_apply_func_reduced_precision(dummy_data):
+    data = dummy_data["EDA"].reset_index(drop=True)
+    stroll = SequenceStridedRolling(data, window=100, strides=30)
+    f32_stroll = SequenceStridedRolling(
+        data, window=100, strides=30, output_dtype=np.float32
+    )
+    for f in [
+        FuncWrapper(np.mean),
+        FuncWrapper(np.mean, vectorized=True, axis=1),
+        FuncWrapper(len),
+    ]:
+        expected = stroll.apply_func(f)
+        out = f32_stroll.apply_func(f)
+        assert (out.dtypes == np.float32).all()
+        np.testing.assert_allclose(out.values, expected.values, rtol=1e-6)
+
+    # The output_dtype of the FuncWrapper overrides the one of the stroll
+    out = f32_stroll.apply_func(FuncWrapper(len, output_dtype="int32"))
+    assert (out.dtypes == np.int32).all()
+    # Non-numeric outputs are not cast
+    out = f32_stroll.apply_func(FuncWrapper(lambda x: bool(x[0] > 0.5)))
+    assert out.dtypes.apply(pd.api.types.is_bool_dtype).all()
+
+    # Float outputs are cast to an integer output_dtype, unless they are non-finite
+    def max_div(x, denominator=1, axis=None):
+        return np.max(x, axis=axis) / denominator
+
+    for kwargs in [{}, {"vectorized": True, "axis": 1}]:
+        out = stroll.apply_func(FuncWrapper(max_div, output_dtype="int32", **kwargs))
+        assert (out.dtypes == np.int32).all()
+        f = FuncWrapper(max_div, output_dtype="int32", denominator=0, **kwargs)
+        with pytest.raises(ValueError), np.errstate(divide="ignore"):
+            stroll.apply_func(f)
+
+
+def test_stroll_cached_window_views(dummy_data, monkeypatch):
+    from tsflex.features.segmenter import strided_rolling
+
+    data = dummy_data[["EDA", "TMP"]].reset_index(drop=True)
+    stroll = SequenceStridedRolling(data, window=100, strides=30)
+    nb_calls = []
+    sliding_window = strided_rolling._sliding_strided_window_1d
+    monkeypatch.setattr(
+        strided_rolling,
+        "_sliding_strided_window_1d",
+        lambda *args: nb_calls.append(1) or sliding_window(*args),
+    )
+
+    def mean_diff(x, y, axis=None):
+        return np.mean(x - y, axis=axis)
+
+    def max_sum(x, y, axis=None):
+        return np.max(x + y, axis=axis)
+
+    out = stroll.apply_funcs(
+        [
+            FuncWrapper(mean_diff, vectorized=True, axis=1),
+            FuncWrapper(max_sum, vectorized=True, axis=1),
+            FuncWrapper(mean_diff, vectorized=True, axis=1, output_names="diff2"),
+        ]
+    )
+    # The views are constructed once (per series) and reused by all the functions
+    assert len(nb_calls) == 2
+    expected = SequenceStridedRolling(data, window=100, strides=30).apply_funcs(
+        [
+            FuncWrapper(mean_diff),
+            FuncWrapper(max_sum),
+            FuncWrapper(mean_diff, output_names="diff2"),
+        ]
+    )
+    pd.testing.assert_frame_equal(out, expected)
@@ -2,9 +2,10 @@
 
 __author__ = "Jeroen Van Der Donckt, Emiel Deprost, Jonas Van Der Donckt"
 
+import numpy as np
 import pandas as pd
 
-from tsflex.utils.data import load_empatica_data
+from tsflex.utils.data import load_empatica_data, load_npy_series
 from tsflex.utils.time import timedelta_to_str
 
 
@@ -53,3 +54,62 @@ def test_load_empatica_data():
 
     df_ibi, df_gsr = load_empatica_data(["IBI", "gsr"])
     assert "EDA" in df_gsr.columns
+
+
+def test_series_dict_shared_memory():
+    import numpy as np
+
+    from tsflex.utils.shared_memory import (
+        close_shared_memory,
+        series_dict_from_shared_memory,
+        series_dict_to_shared_memory,
+    )
+
+    series_dict = {
+        "time": pd.Series(
+            np.arange(10.0),
+            index=pd.date_range("2020", periods=10, freq="1s", tz="Europe/Brussels"),
+            name="time",
+        ),
+        "seq": pd.Series(np.arange(5), index=np.arange(5) * 0.5, name="seq"),
+        "obj": pd.Series(["a", "b"], name="obj"),
+        "empty": pd.Series([], dtype=float, name="empty"),
+    }
+    descriptor, shms = series_dict_to_shared_memory(series_dict)
+    try:
+        shared_dict, attached_shms = series_dict_from_shared_memory(descriptor)
+        assert shared_dict.keys() == series_dict.keys()
+        for key, s in series_dict.items():
+            pd.testing.assert_series_equal(s, shared_dict[key], check_freq=False)
+        # The shared values are read-only views
+        assert not shared_dict["time"].values.flags.writeable
+        assert not shared_dict["seq"].index.values.flags.writeable
+        del shared_dict
+        close_shared_memory(attached_shms, unlink=False)
+    finally:
+        close_shared_memory(shms, unlink=True)
+
+
+def test_load_npy_series(tmp_path):
+    index = pd.date_range("2022-01-01", periods=100, freq="1s")
+    np.save(tmp_path / "index.npy", index.values)
+    np.save(tmp_path / "a.npy", np.arange(100, dtype=np.float32))
+    np.save(tmp_path / "b.npy", np.arange(50))
+    np.save(tmp_path / "b.index.npy", np.arange(50) * 2)
+
+    series_list = load_npy_series(tmp_path)
+    assert [s.name for s in series_list] == ["a", "b"]
+    a, b = series_list
+    assert isinstance(a.values, np.memmap) and a.dtype == np.float32
+    assert a.index.equals(index.tz_localize(None)) and a.index.name == "index"
+    assert b.index.equals(pd.Index(np.arange(50) * 2))
+    assert [s.name for s in load_npy_series(tmp_path, series_names=["b"])] == ["b"]
+
+    # A structured array, without index field
+    arr = np.zeros(10, dtype=[("x", np.float64), ("y", np.int32)])
+    arr["x"] = np.arange(10) / 2
+    np.save(tmp_path / "structured.npy", arr)
+    x, y = load_npy_series(tmp_path / "structured.npy")
+    assert x.name == "x" and y.dtype == np.int32
+    assert np.all(x.values == np.arange(10) / 2)
+    assert x.index.equals(pd.RangeIndex(10))
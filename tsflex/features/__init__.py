@@ -7,11 +7,15 @@
 __author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt, Emiel Deprost"
 
 from .. import __pdoc__
+from ..utils.worker_pool import WorkerPool
 from .feature import FeatureDescriptor, MultipleFeatureDescriptors
 from .feature_collection import FeatureCollection
 from .function_wrapper import FuncWrapper
 from .logger import get_feature_logs, get_function_stats, get_series_names_stats
+from .plan import FeaturePlan
+from .result import FeatureResult
 from .segmenter import StridedRollingFactory
+from .streaming import StreamingFeatureCollection
 
 __pdoc__["FuncWrapper.__call__"] = True
 
@@ -19,9 +23,13 @@ __all__ = [
     "FeatureDescriptor",
     "MultipleFeatureDescriptors",
     "FeatureCollection",
+    "FeatureResult",
+    "FeaturePlan",
+    "StreamingFeatureCollection",
     "FuncWrapper",
     "StridedRollingFactory",
     "get_feature_logs",
     "get_function_stats",
     "get_series_names_stats",
+    "WorkerPool",
 ]
@@ -1,6 +1,7 @@
 """FeatureCollection class for bookkeeping and calculation of time-series features.
 
 Methods, next to `FeatureCollection.calculate()`, worth looking at: \n
+* `FeatureCollection.compile()` - compile an execution plan for repeated calculation
 * `FeatureCollection.serialize()` - serialize the FeatureCollection to a file
 * `FeatureCollection.reduce()` - reduce the number of features after feature selection
 
@@ -13,11 +14,18 @@ import warnings
 __author__ = "Jonas Van Der Donckt, Emiel Deprost, Jeroen Van Der Donckt"
 
 import os
+import tempfile
 import traceback
 import uuid
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from copy import deepcopy
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import dill
 import numpy as np
@@ -27,13 +35,28 @@ from tqdm.auto import tqdm
 
 from ..features.function_wrapper import FuncWrapper
 from ..utils.attribute_parsing import AttributeParser
-from ..utils.data import flatten, to_list, to_series_list
+from ..utils.data import flatten, load_npy_series, to_list, to_series_list
 from ..utils.logging import add_logging_handler, delete_logging_handlers
+from ..utils.shared_memory import (
+    close_shared_memory,
+    series_dict_from_shared_memory,
+    series_dict_to_shared_memory,
+)
 from ..utils.time import parse_time_arg, timedelta_to_str
+from ..utils.worker_pool import WorkerPool, get_shared_object
 from .feature import FeatureDescriptor, MultipleFeatureDescriptors
 from .logger import logger
+from .plan import FeaturePlan
+from .result import FeatureResult
+from .scheduling import get_scheduled_tasks, load_task_costs, update_task_costs
 from .segmenter import StridedRolling, StridedRollingFactory
-from .utils import _check_start_end_array, _determine_bounds
+from .utils import (
+    _blocks_to_df,
+    _blocks_to_np,
+    _check_start_end_array,
+    _get_series_dict,
+    _merge_feature_outputs,
+)
 
 
 class FeatureCollection:
@@ -83,6 +106,9 @@ class FeatureCollection:
         self._feature_desc_dict: Dict[
             Tuple[Tuple[str, ...], Union[float, pd.Timedelta]], List[FeatureDescriptor]
         ] = {}
+        # The version of the collection, which is incremented when a feature is added
+        # (allows a WorkerPool to reuse the shared collection across calls)
+        self._version = 0
 
         if feature_descriptors:
             self.add(feature_descriptors)
@@ -216,6 +242,7 @@ class FeatureCollection:
             self._feature_desc_dict[series_win_stride_key].append(feature)
         else:
             self._feature_desc_dict[series_win_stride_key] = [feature]
+        self._version = getattr(self, "_version", 0) + 1
 
     def add(
         self,
@@ -263,7 +290,270 @@ class FeatureCollection:
     def _executor(idx: int):
         # global get_stroll_func
         stroll, function = get_stroll_func(idx)
-        return stroll.apply_func(function)
+        return stroll._apply_funcs([function])
+
+    @staticmethod
+    def _entity_executor(
+        task: Tuple[int, Iterable[int]]
+    ) -> Tuple[int, List[Tuple[pd.Index, Dict[str, np.ndarray]]]]:
+        # global get_stroll_func
+        entity_idx, idxs = task
+        return entity_idx, FeatureCollection._group_executor(idxs)
+
+    @staticmethod
+    def _group_executor(
+        idxs: Iterable[int],
+    ) -> List[Tuple[pd.Index, Dict[str, np.ndarray]]]:
+        # global get_stroll_func
+        # Gather the functions per segmentation (i.e., StridedRolling instance), as
+        # features of the same group with the same stride share their segmentation
+        stroll_funcs: Dict[int, Tuple[StridedRolling, List[FuncWrapper]]] = {}
+        for idx in idxs:
+            stroll, function = get_stroll_func(idx)
+            stroll_funcs.setdefault(id(stroll), (stroll, []))[1].append(function)
+        return [stroll._apply_funcs(funcs) for stroll, funcs in stroll_funcs.values()]
+
+    @staticmethod
+    def _bundle_executor(
+        idxs: Iterable[int],
+    ) -> List[Tuple[pd.Index, Dict[str, np.ndarray]]]:
+        # global get_stroll_func
+        # Return the output of each stroll-feature separately (as for the unbundled
+        # tasks), the segmentations are still shared via the stroll cache
+        return [FeatureCollection._executor(idx) for idx in idxs]
+
+    @staticmethod
+    def _init_shared_memory_worker(
+        feature_collection: FeatureCollection,
+        series_descriptor: Dict[str, dict],
+        stroll_kwargs: dict,
+    ):
+        """Initialize a worker process that uses the shared memory series data."""
+        global get_stroll_func, shared_memory_blocks
+        try:
+            # Keep the shared memory blocks alive as long as the worker lives
+            series_dict, shared_memory_blocks = series_dict_from_shared_memory(
+                series_descriptor
+            )
+            get_stroll_func = feature_collection._stroll_feat_generator(
+                series_dict, **stroll_kwargs
+            )
+        except Exception:
+            # Do not raise, as a failing initializer results in endlessly restarting
+            # worker processes. The tasks of this worker will raise an error instead.
+            traceback.print_exc()
+            get_stroll_func = None
+
+    @staticmethod
+    def _worker_pool_executor(args: Tuple[tuple, tuple, Callable, Any]):
+        """Execute a (group) task in a worker process of a `WorkerPool`."""
+        global get_stroll_func, shared_memory_blocks, worker_pool_call_token
+        fc_descriptor, call_descriptor, task_executor, task = args
+        if globals().get("worker_pool_call_token") != call_descriptor[0]:
+            # First task of this call in this worker -> release the data of the
+            # previous call (if not released yet) and attach to the shared memory
+            # data of this call
+            FeatureCollection._release_worker_pool_call()
+            series_descriptor, stroll_kwargs = get_shared_object(call_descriptor)
+            FeatureCollection._init_shared_memory_worker(
+                get_shared_object(fc_descriptor), series_descriptor, stroll_kwargs
+            )
+            worker_pool_call_token = call_descriptor[0]
+        return task_executor(task)
+
+    @staticmethod
+    def _release_worker_pool_call():
+        """Release (i.e., detach from) the shared memory data of the previous call."""
+        global get_stroll_func, shared_memory_blocks, worker_pool_call_token
+        get_stroll_func = None
+        for shm in globals().get("shared_memory_blocks", []):
+            try:
+                shm.close()
+            except BufferError:  # still referenced, closed when garbage collected
+                pass
+        shared_memory_blocks = []
+        worker_pool_call_token = None
+
+    def _calculate_in_worker_pool(
+        self,
+        worker_pool: WorkerPool,
+        task_executor: Callable,
+        tasks: Iterable,
+        series_dict: Dict[str, pd.Series],
+        stroll_kwargs: dict,
+        show_progress: bool,
+    ) -> Optional[list]:
+        """Calculate the tasks in the worker processes of the `WorkerPool`.
+
+        The feature collection is shared (once per version, i.e., until a feature is
+        added) with the worker processes, whereas the series data is passed via shared
+        memory for each call. The workers detach from this data at the end of the
+        call.
+
+        Returns
+        -------
+        Optional[list]
+            The output of the tasks, None if an error occurred (the traceback is then
+            printed).
+
+        """
+        fc_descriptor = worker_pool.share(self, version=getattr(self, "_version", 0))
+        series_descriptor, shms = series_dict_to_shared_memory(series_dict)
+        call_descriptor = worker_pool.share((series_descriptor, stroll_kwargs))
+        try:
+            results = worker_pool.imap_unordered(
+                self._worker_pool_executor,
+                [(fc_descriptor, call_descriptor, task_executor, t) for t in tasks],
+            )
+            if show_progress:
+                results = tqdm(results, total=len(tasks))
+            return [f for f in results]
+        except Exception:
+            traceback.print_exc()
+        finally:
+            try:
+                worker_pool.broadcast(FeatureCollection._release_worker_pool_call)
+            finally:
+                worker_pool.unshare(call_descriptor)
+                close_shared_memory(shms, unlink=True)
+        return None
+
+    def _calculate_in_executor(
+        self,
+        executor: Executor,
+        task_executor: Callable,
+        tasks: Iterable,
+        nb_stroll_funcs: Optional[int],
+        show_progress: bool,
+    ) -> Optional[list]:
+        """Calculate the tasks in the (in-process) workers of the executor.
+
+        The workers share the series data and the (cached) segmentations, which are
+        constructed beforehand (when `nb_stroll_funcs` is passed) so that each
+        segmentation is computed only once.
+
+        Returns
+        -------
+        Optional[list]
+            The output of the tasks, None if an error occurred (the traceback is then
+            printed).
+
+        """
+        if nb_stroll_funcs is not None and not self._construct_strolls(nb_stroll_funcs):
+            return None
+        futures = [executor.submit(task_executor, task) for task in tasks]
+        results = as_completed(futures)
+        if show_progress:
+            results = tqdm(results, total=len(futures))
+        try:
+            for future in results:
+                future.result()
+            return [future.result() for future in futures]
+        except Exception:
+            traceback.print_exc()
+            for future in futures:
+                future.cancel()
+        return None
+
+    def _execute_tasks(
+        self,
+        task_executor: Callable,
+        tasks: Sequence,
+        n_jobs: int,
+        executor: Optional[Union[str, Executor]],
+        show_progress: bool,
+        nb_stroll_funcs: Optional[int] = None,
+        pool_kwargs: Optional[dict] = None,
+        chunksize: int = 1,
+    ) -> Optional[list]:
+        """Execute the tasks with the executor (backend).
+
+        Parameters
+        ----------
+        task_executor : Callable
+            The function that executes a task (via the global `get_stroll_func`).
+        tasks : Sequence
+            The tasks.
+        n_jobs : int
+            The number of workers; if 0 or 1, the tasks are executed sequentially.
+        executor : Union[str, Executor], optional
+            The backend, see the `executor` argument of `calculate`.
+        show_progress : bool
+            Whether a progress bar is shown.
+        nb_stroll_funcs : int, optional
+            The number of stroll-features whose segmentations are constructed before
+            the (parallel) execution, by default None. If None, the segmentations are
+            constructed by the workers.
+        pool_kwargs : dict, optional
+            The additional keyword arguments of the process pool, by default None.
+        chunksize : int, optional
+            The number of tasks that are sent at once to a worker process, by
+            default 1.
+
+        Returns
+        -------
+        Optional[list]
+            The output of the tasks, None if an error occurred (the traceback is then
+            printed).
+
+        """
+        if isinstance(executor, Executor):
+            return self._calculate_in_executor(
+                executor, task_executor, tasks, nb_stroll_funcs, show_progress
+            )
+        elif n_jobs in [0, 1]:
+            if show_progress:
+                tasks = tqdm(tasks)
+            try:
+                return [task_executor(task) for task in tasks]
+            except Exception:
+                traceback.print_exc()
+            return None
+        elif executor == "threads":
+            with ThreadPoolExecutor(max_workers=n_jobs) as thread_pool:
+                return self._calculate_in_executor(
+                    thread_pool, task_executor, tasks, nb_stroll_funcs, show_progress
+                )
+
+        # Note: the (cached) segmentations are constructed before the pool is
+        # created, this way the forked worker processes inherit them and each
+        # segmentation is computed only once (instead of once in every process).
+        if nb_stroll_funcs is not None and not self._construct_strolls(nb_stroll_funcs):
+            return None
+        calculated_feature_list = None
+        with Pool(processes=n_jobs, **(pool_kwargs or {})) as pool:
+            results = pool.imap_unordered(task_executor, tasks, chunksize)
+            if show_progress:
+                results = tqdm(results, total=len(tasks))
+            try:
+                calculated_feature_list = [f for f in results]
+            except Exception:
+                traceback.print_exc()
+                pool.terminate()
+            finally:
+                # Close & join because: https://github.com/uqfoundation/pathos/issues/131
+                pool.close()
+                pool.join()
+        return calculated_feature_list
+
+    @staticmethod
+    def _construct_strolls(nb_stroll_funcs: int) -> bool:
+        """Construct (and thus cache) the segmentation of every feature.
+
+        Returns
+        -------
+        bool
+            True if all segmentations were constructed successfully, False otherwise
+            (the traceback is then printed).
+
+        """
+        try:
+            for idx in range(nb_stroll_funcs):
+                get_stroll_func(idx)
+        except Exception:
+            traceback.print_exc()
+            return False
+        return True
 
     # def _get_stroll(self, kwargs):
     #     return StridedRollingFactory.get_segmenter(**kwargs)
@@ -279,6 +569,9 @@ class FeatureCollection:
         window_idx: str,
         include_final_window: bool,
         approve_sparsity: bool,
+        fast_aggregates: bool,
+        max_batch_windows: Union[int, None],
+        output_dtype: Union[np.dtype, None],
     ) -> Callable[[int], Tuple[StridedRolling, FuncWrapper]]:
         # --- Future work ---
         # We could also make the StridedRolling creation multithreaded
@@ -288,6 +581,47 @@ class FeatureCollection:
             [len(self._feature_desc_dict[k]) for k in keys_wins_strides]
         )
 
+        # All the features of a (series_key, window, stride) group share the same
+        # segmentation (i.e., start & end indexes and output index). As the segment
+        # indices and bounds are the same for every feature in this call, we cache
+        # the StridedRolling instances on the remaining part of the segmentation key.
+        stroll_cache: Dict[tuple, StridedRolling] = {}
+
+        def get_stroll(
+            key: Tuple[str, ...],
+            win: Union[float, pd.Timedelta, None],
+            stride: Union[List[Union[float, pd.Timedelta]], None],
+            func_data_type: Union[np.array, pd.Series],
+        ) -> StridedRolling:
+            stroll_key = (
+                key,
+                win,
+                None if stride is None else tuple(stride),
+                func_data_type,
+            )
+            if stroll_key not in stroll_cache:
+                # The factory method will instantiate the right StridedRolling object
+                stroll_arg_dict = dict(
+                    data=[series_dict[k] for k in key],
+                    window=win,
+                    strides=stride,
+                    segment_start_idxs=segment_start_idxs,
+                    segment_end_idxs=segment_end_idxs,
+                    start_idx=start_idx,
+                    end_idx=end_idx,
+                    window_idx=window_idx,
+                    include_final_window=include_final_window,
+                    approve_sparsity=approve_sparsity,
+                    fast_aggregates=fast_aggregates,
+                    max_batch_windows=max_batch_windows,
+                    output_dtype=output_dtype,
+                    func_data_type=func_data_type,
+                )
+                stroll_cache[stroll_key] = StridedRollingFactory.get_segmenter(
+                    **stroll_arg_dict
+                )
+            return stroll_cache[stroll_key]
+
         def get_stroll_function(idx) -> Tuple[StridedRolling, FuncWrapper]:
             key_idx = np.searchsorted(lengths, idx, "right")  # right bc idx starts at 0
             key, win = keys_wins_strides[key_idx]
@@ -297,21 +631,7 @@ class FeatureCollection:
             ]
             stride = feature.stride if calc_stride is None else calc_stride
             function: FuncWrapper = feature.function
-            # The factory method will instantiate the right StridedRolling object
-            stroll_arg_dict = dict(
-                data=[series_dict[k] for k in key],
-                window=win,
-                strides=stride,
-                segment_start_idxs=segment_start_idxs,
-                segment_end_idxs=segment_end_idxs,
-                start_idx=start_idx,
-                end_idx=end_idx,
-                window_idx=window_idx,
-                include_final_window=include_final_window,
-                approve_sparsity=approve_sparsity,
-                func_data_type=function.input_type,
-            )
-            stroll = StridedRollingFactory.get_segmenter(**stroll_arg_dict)
+            stroll = get_stroll(key, win, stride, function.input_type)
             return stroll, function
 
         return get_stroll_function
@@ -321,6 +641,19 @@ class FeatureCollection:
             len(self._feature_desc_dict[k]) for k in self._feature_desc_dict.keys()
         )
 
+    def _get_stroll_feat_keys(self, manual_window: bool) -> List[Tuple[str, Any]]:
+        """Return the (function name, window) of each stroll-feature."""
+        return [
+            (fd.function.func.__name__, None if manual_window else win)
+            for (_, win), fds in self._feature_desc_dict.items()
+            for fd in fds
+        ]
+
+    def _get_stroll_feat_groups(self) -> List[range]:
+        """Return the stroll-feature indices of each (series_key, window) group."""
+        lengths = np.cumsum([0] + [len(v) for v in self._feature_desc_dict.values()])
+        return [range(start, end) for start, end in zip(lengths[:-1], lengths[1:])]
+
     def _check_no_multiple_windows(self):
         assert (
             self._get_nb_output_features_without_window()
@@ -330,6 +663,114 @@ class FeatureCollection:
             + " can only have 1 window (or None)"
         )
 
+    @staticmethod
+    def _get_n_jobs(n_jobs: Optional[int], executor: Any, nb_tasks: int) -> int:
+        """Return the number of workers (i.e., processes or threads) for the tasks."""
+        if (
+            os.name == "nt" and executor != "threads"
+        ):  # On Windows no multiprocessing is supported, see https://github.com/predict-idlab/tsflex/issues/51
+            n_jobs = 1
+        elif n_jobs is None:
+            n_jobs = os.cpu_count()
+        return min(n_jobs, nb_tasks)
+
+    @staticmethod
+    def _check_executor(executor: Any):
+        """Check whether the executor (backend) is valid."""
+        if isinstance(executor, str) and executor not in ["processes", "threads"]:
+            raise ValueError(
+                f"Invalid executor '{executor}', must be either 'processes' or "
+                + "'threads' (or a WorkerPool / concurrent.futures.Executor)"
+            )
+        elif isinstance(executor, ProcessPoolExecutor):
+            raise ValueError(
+                "A ProcessPoolExecutor can not share the segmented data with its "
+                + "worker processes, use a WorkerPool instead"
+            )
+        elif not (
+            executor is None or isinstance(executor, (str, WorkerPool, Executor))
+        ):
+            raise ValueError(
+                "The executor must be either 'processes', 'threads', a WorkerPool or "
+                + f"a concurrent.futures.Executor, got {type(executor)}"
+            )
+
+    def _check_calculate_args(
+        self,
+        stride: Optional[Union[float, str, pd.Timedelta, List, None]],
+        segment_start_idxs: Optional[Union[list, np.ndarray, pd.Series, pd.Index]],
+        segment_end_idxs: Optional[Union[list, np.ndarray, pd.Series, pd.Index]],
+    ) -> Tuple[Optional[list], Optional[np.ndarray], Optional[np.ndarray]]:
+        """Check (and parse) the stride and segment indices of a calculate call.
+
+        Returns
+        -------
+        Tuple[Optional[list], Optional[np.ndarray], Optional[np.ndarray]]
+            The parsed stride (list), segment start indices and segment end indices.
+
+        """
+        # Convert to numpy array (if necessary)
+        if segment_start_idxs is not None:
+            segment_start_idxs = FeatureCollection._process_segment_idxs(
+                segment_start_idxs
+            )
+        if segment_end_idxs is not None:
+            segment_end_idxs = FeatureCollection._process_segment_idxs(segment_end_idxs)
+
+        if segment_start_idxs is not None and segment_end_idxs is not None:
+            # Check if segment indices have same length and whether every start idx
+            # <= end idx
+            _check_start_end_array(segment_start_idxs, segment_end_idxs)
+            # Check if there is either 1 or No(ne) window value for every output name -
+            # input_series combination
+            self._check_no_multiple_windows()
+
+        if segment_start_idxs is None or segment_end_idxs is None:
+            assert all(
+                fd.window is not None
+                for fd in flatten(self._feature_desc_dict.values())
+            ), (
+                "Each feature descriptor must have a window when not both "
+                + "segment_start_idxs and segment_end_idxs are provided"
+            )
+
+        if stride is None and segment_start_idxs is None and segment_end_idxs is None:
+            assert all(
+                fd.stride is not None
+                for fd in flatten(self._feature_desc_dict.values())
+            ), (
+                "Each feature descriptor must have a stride when no stride or "
+                + "segment indices are passed to this method!"
+            )
+        elif stride is not None and (
+            segment_start_idxs is not None or segment_end_idxs is not None
+        ):
+            raise ValueError(
+                "The stride and any segment index argument cannot be set together! "
+                + "At least one of both should be None."
+            )
+
+        if stride is not None:
+            # Verify whether the stride complies with the input data dtype
+            stride = [
+                parse_time_arg(s) if isinstance(s, str) else s for s in to_list(stride)
+            ]
+            self._check_feature_descriptors(skip_none=False, calc_stride=stride)
+        return stride, segment_start_idxs, segment_end_idxs
+
+    def _get_series_dict(
+        self,
+        data: Union[
+            pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path
+        ],
+        bound_method: str,
+        input_dtype: Optional[Union[np.dtype, type, str]] = None,
+    ) -> Tuple[Dict[str, pd.Series], Any, Any]:
+        """Return the (sorted) required series, sliced on their bounds."""
+        return _get_series_dict(
+            data, self.get_required_series(), bound_method, input_dtype
+        )
+
     @staticmethod
     def _process_segment_idxs(
         segment_idxs: Union[list, np.ndarray, pd.Series, pd.Index]
@@ -343,13 +784,17 @@ class FeatureCollection:
 
     def calculate(
         self,
-        data: Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]],
+        data: Union[
+            pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path
+        ],
         stride: Optional[Union[float, str, pd.Timedelta, List, None]] = None,
         segment_start_idxs: Optional[
             Union[list, np.ndarray, pd.Series, pd.Index]
         ] = None,
         segment_end_idxs: Optional[Union[list, np.ndarray, pd.Series, pd.Index]] = None,
         return_df: Optional[bool] = False,
+        return_np: Optional[bool] = False,
+        return_lazy: Optional[bool] = False,
         window_idx: Optional[str] = "end",
         include_final_window: Optional[bool] = False,
         bound_method: Optional[str] = "inner",
@@ -357,14 +802,32 @@ class FeatureCollection:
         show_progress: Optional[bool] = False,
         logging_file_path: Optional[Union[str, Path]] = None,
         n_jobs: Optional[int] = None,
-    ) -> Union[List[pd.DataFrame], pd.DataFrame]:
+        group_tasks: Optional[bool] = False,
+        use_shared_memory: Optional[bool] = False,
+        fast_aggregates: Optional[bool] = False,
+        max_batch_windows: Optional[int] = None,
+        output_dtype: Optional[Union[np.dtype, type, str]] = None,
+        input_dtype: Optional[Union[np.dtype, type, str]] = None,
+        executor: Optional[Union[str, WorkerPool, Executor]] = None,
+        cost_file_path: Optional[Union[str, Path]] = None,
+    ) -> Union[
+        List[pd.DataFrame],
+        pd.DataFrame,
+        Tuple[np.ndarray, List[str], np.ndarray],
+        FeatureResult,
+    ]:
         """Calculate features on the passed data.
 
         Parameters
         ----------
-        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]]
+        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path]
             Dataframe or Series or list thereof, with all the required data for the
             feature calculation. \n
+            Alternatively, the path of (memory-mapped) `.npy` files, i.e., a
+            directory with a `.npy` file for each series or a `.npy` file with a
+            structured array (see `tsflex.utils.data.load_npy_series`). The required
+            series are then segmented directly on the memory-mapped files, without
+            loading them into memory. \n
             **Assumptions**: \n
             * each Series / DataFrame must have a sortable index. This index represents
             the sequence position of the corresponding values, the index can be either
@@ -423,6 +886,22 @@ class FeatureCollection:
             Whether the output needs to be a DataFrame or a list thereof, by default
             False. If `True` the output dataframes will be merged to a DataFrame with an
             outer merge.
+        return_np : bool, optional
+            Whether the output needs to be returned as raw numpy arrays, by default
+            False. If `True` the outputs are merged (with an outer merge) and a tuple of
+            `(index, column_names, values)` is returned, with `values` a 2D array of
+            shape `(len(index), len(column_names))`. This takes precedence over
+            `return_df`.
+            .. note::
+                The `index` holds the index values of the output, i.e., a
+                time-index is returned as a (UTC) `np.datetime64` array.
+        return_lazy : bool, optional
+            Whether the output needs to be returned as a (lazy) `FeatureResult`, by
+            default False. This takes precedence over `return_np` and `return_df`. \n
+            The `FeatureResult` holds the output of each feature and only merges the
+            selected columns (and index range) upon materialization (e.g., with
+            `to_pandas()`), which avoids creating the full (outer merged) feature
+            matrix when only a subset of the features is required.
         window_idx : str, optional
             The window's index position which will be used as index for the
             feature_window aggregation. Must be either of: `["begin", "middle", "end"]`.
@@ -479,8 +958,9 @@ class FeatureCollection:
             to stdout. Otherwise, a logging `FileHandler` will write the logged messages
             to the given file path. See also the `tsflex.features.logger` module.
         n_jobs : int, optional
-            The number of processes used for the feature calculation. If `None`, then
-            the number returned by _os.cpu_count()_ is used, by default None. \n
+            The number of processes (or threads) used for the feature calculation. If
+            `None`, then the number returned by _os.cpu_count()_ is used, by default
+            None. \n
             If n_jobs is either 0 or 1, the code will be executed sequentially without
             creating a process pool. This is very useful when debugging, as the stack
             trace will be more comprehensible.
@@ -496,10 +976,105 @@ class FeatureCollection:
                 multiprocessing. So if your sequential feature extraction code runs
                 faster than ~1s, it might not be worth it to parallelize the process
                 (and thus better leave `n_jobs` to 0 or 1).
+        group_tasks : bool, optional
+            Whether a single task applies all the features of a
+            `(series_name(s), window)` group, by default False. If False, every
+            feature is calculated in a separate task. \n
+            Grouping the tasks reduces the scheduling and inter-process communication
+            overhead (as each task returns one block of feature columns), which is
+            especially beneficial for collections with many features per group.
+            .. note::
+                When `return_df` is False, the output list will contain one DataFrame
+                per group (and stride) instead of one DataFrame per feature.
+        use_shared_memory : bool, optional
+            Whether the data is passed to the worker processes via shared memory, by
+            default False. Only relevant when multiprocessing is used (i.e., `n_jobs`
+            > 1). \n
+            If True, the index and values of every required series are placed (once)
+            in shared memory and each worker process attaches read-only views to
+            them, instead of inheriting (or receiving a copy of) the pandas objects.
+            This makes large inputs usable with many processes and also supports the
+            *spawn* start method (e.g., via `multiprocess.set_start_method("spawn")`),
+            for which the worker processes do not inherit the memory of the main
+            process.
+            .. note::
+                In this mode, the segmentation of a group is constructed by the worker
+                process(es) that calculate its features (instead of once in the main
+                process), so combine this with `group_tasks` to avoid redundant
+                segmentations.
+        fast_aggregates : bool, optional
+            Whether the recognised numpy aggregates (i.e., the sum, mean, var, std,
+            min and max) are calculated directly on the segment bounds, by default
+            False. \n
+            This takes O(1) per window instead of O(window size), which is orders of
+            magnitude faster for large, overlapping windows (also on irregularly
+            sampled data). The output of the sum, mean, var and std on floating point
+            data might however slightly differ (i.e., floating point errors) from
+            applying the function on each window.
+            .. note::
+                The min, max and integer sum are exact.
+        max_batch_windows : int, optional
+            The maximum number of segmented windows that are passed at once to a
+            vectorized function, by default None. If None, all windows are passed at
+            once. \n
+            Feeding the windows in batches bounds the memory usage of vectorized
+            functions that create temporary arrays with the size of their input, which
+            is especially relevant for long series with large, overlapping windows.
+            .. note::
+                This default is overridden by the `max_batch_windows` of a
+                `FuncWrapper`.
+        output_dtype : Union[np.dtype, type, str], optional
+            The dtype to which the numeric (i.e., integer and float) feature outputs
+            are cast, by default None. If None, the output dtype of each function is
+            retained. \n
+            Use e.g., `np.float32` to halve the memory of the (merged) feature output;
+            the outputs are directly written into (and merged in) arrays of this
+            dtype.
+            .. note::
+                This default is overridden by the `output_dtype` of a `FuncWrapper`.
+        input_dtype : Union[np.dtype, type, str], optional
+            The dtype to which the numeric (i.e., integer and float) series are cast
+            before the feature calculation, by default None. If None, the series are
+            not cast. \n
+            Use e.g., `np.float32` to calculate the features in reduced precision.
+        executor : Union[str, WorkerPool, Executor], optional
+            The backend that executes the feature calculation (when `n_jobs` > 1),
+            by default None. Must be either of: \n
+            * `"processes"` (or None): a process pool with `n_jobs` processes.
+            * `"threads"`: a thread pool with `n_jobs` threads. The threads share
+              the series data and segmentations in-process, so nothing is
+              serialized. This is the fastest backend for functions that release
+              the GIL, e.g., (vectorized) numpy / scipy functions on large windows.
+            * A (persistent) `WorkerPool` whose worker processes are (re)used for
+              the feature calculation; `n_jobs` and `use_shared_memory` are then
+              ignored. \n
+              The worker processes are reused across calls, which avoids the overhead
+              of creating a process pool for each call. The feature collection is
+              shared only once with the workers, whereas the data is passed via
+              shared memory for each call. This is especially useful when
+              `calculate` is called many times, e.g., for each chunk of a large
+              dataset.
+            * A custom `concurrent.futures.Executor` (e.g., a `ThreadPoolExecutor`
+              that is shared with other work) whose workers share the memory of this
+              process; `n_jobs` is then ignored. Use a `WorkerPool` for reusable
+              worker processes instead of a `ProcessPoolExecutor`.
+        cost_file_path : Union[str, Path], optional
+            The (json) file path of the cost model that is used to schedule the
+            (parallel) feature calculation, by default None. \n
+            The cost model holds the mean duration of each function-window
+            combination, as logged during the previous runs (see
+            `get_function_stats`). The tasks are then executed longest-first and
+            cheap tasks are bundled, which avoids idle workers at the tail of the
+            calculation. After the calculation, the durations of this run are added
+            to the cost model (and the cost file is created if it does not exist).
+            .. note::
+                The durations are only logged by processes that are created by this
+                call, i.e., the cost model is not updated when a `WorkerPool` is
+                used.
 
         Returns
         -------
-        Union[List[pd.DataFrame], pd.DataFrame]
+        Union[List[pd.DataFrame], pd.DataFrame, Tuple[np.ndarray, List[str], np.ndarray], FeatureResult]
             The calculated features.
 
         Raises
@@ -518,92 +1093,30 @@ class FeatureCollection:
 
 
         """
+        self._check_executor(executor)
+        stride, segment_start_idxs, segment_end_idxs = self._check_calculate_args(
+            stride, segment_start_idxs, segment_end_idxs
+        )
+
         # Delete other logging handlers
         delete_logging_handlers(logger)
-        # Add logging handler (if path provided)
-        if logging_file_path:
-            f_handler = add_logging_handler(logger, logging_file_path)
-
-        # Convert to numpy array (if necessary)
-        if segment_start_idxs is not None:
-            segment_start_idxs = FeatureCollection._process_segment_idxs(
-                segment_start_idxs
+        # The durations are logged in a temporary file to update the cost model when
+        # no logging file is provided
+        log_file_path = logging_file_path
+        if cost_file_path is not None and not logging_file_path:
+            log_file_path = os.path.join(
+                tempfile.gettempdir(), f"tsflex_costs_{uuid.uuid4().hex}.log"
             )
-        if segment_end_idxs is not None:
-            segment_end_idxs = FeatureCollection._process_segment_idxs(segment_end_idxs)
-
-        if segment_start_idxs is not None and segment_end_idxs is not None:
-            # Check if segment indices have same length and whether every start idx
-            # <= end idx
-            _check_start_end_array(segment_start_idxs, segment_end_idxs)
-            # Check if there is either 1 or No(ne) window value for every output name -
-            # input_series combination
-            self._check_no_multiple_windows()
-
-        if segment_start_idxs is None or segment_end_idxs is None:
-            assert all(
-                fd.window is not None
-                for fd in flatten(self._feature_desc_dict.values())
-            ), (
-                "Each feature descriptor must have a window when not both "
-                + "segment_start_idxs and segment_end_idxs are provided"
-            )
-
-        if stride is None and segment_start_idxs is None and segment_end_idxs is None:
-            assert all(
-                fd.stride is not None
-                for fd in flatten(self._feature_desc_dict.values())
-            ), (
-                "Each feature descriptor must have a stride when no stride or "
-                + "segment indices are passed to this method!"
-            )
-        elif stride is not None and (
-            segment_start_idxs is not None or segment_end_idxs is not None
-        ):
-            raise ValueError(
-                "The stride and any segment index argument cannot be set together! "
-                + "At least one of both should be None."
-            )
-
-        if stride is not None:
-            # Verify whether the stride complies with the input data dtype
-            stride = [
-                parse_time_arg(s) if isinstance(s, str) else s for s in to_list(stride)
-            ]
-            self._check_feature_descriptors(skip_none=False, calc_stride=stride)
-
-        # Convert the data to a series_dict
-        series_dict: Dict[str, pd.Series] = {}
-        for s in to_series_list(data):
-            if not s.index.is_monotonic_increasing:
-                warnings.warn(
-                    f"The index of series '{s.name}' is not monotonic increasing. "
-                    + "The series will be sorted by the index.",
-                    RuntimeWarning,
-                )
-                s = s.sort_index(ascending=True, inplace=False, ignore_index=False)
-
-            # Assert the assumptions we make!
-            assert s.index.is_monotonic_increasing
-
-            if s.name in self.get_required_series():
-                series_dict[str(s.name)] = s
+        # Add logging handler (if path provided)
+        if log_file_path:
+            f_handler = add_logging_handler(logger, log_file_path)
 
-        # Determine the bounds of the series dict items and slice on them
-        # TODO: is dit wel nodig `hier? want we doen dat ook in de strided rolling
-        start, end = _determine_bounds(bound_method, list(series_dict.values()))
-        series_dict = {
-            n: s.loc[
-                s.index.dtype.type(start) : s.index.dtype.type(end)
-            ]  # TODO: check memory efficiency of ths
-            for n, s, in series_dict.items()
-        }
+        series_dict, start, end = self._get_series_dict(data, bound_method, input_dtype)
 
         # Note: this variable has a global scope so this is shared in multiprocessing
         # TODO: try to make this more efficient (but is not really the bottleneck)
         global get_stroll_func
-        get_stroll_func = self._stroll_feat_generator(
-            series_dict,
+        stroll_kwargs = dict(
             calc_stride=stride,
             segment_start_idxs=segment_start_idxs,
             segment_end_idxs=segment_end_idxs,
@@ -612,40 +1125,242 @@ class FeatureCollection:
             window_idx=window_idx,
             include_final_window=include_final_window,
             approve_sparsity=approve_sparsity,
+            fast_aggregates=fast_aggregates,
+            max_batch_windows=max_batch_windows,
+            output_dtype=output_dtype,
         )
         nb_stroll_funcs = self._get_stroll_feat_length()
 
-        if (
-            os.name == "nt"
-        ):  # On Windows no multiprocessing is supported, see https://github.com/predict-idlab/tsflex/issues/51
-            n_jobs = 1
-        elif n_jobs is None:
-            n_jobs = os.cpu_count()
-        n_jobs = min(n_jobs, nb_stroll_funcs)
+        if group_tasks:
+            tasks = self._get_stroll_feat_groups()
+            task_executor = self._group_executor
+        else:
+            tasks = range(nb_stroll_funcs)
+            task_executor = self._executor
+        nb_tasks = len(tasks)
+
+        n_jobs = self._get_n_jobs(n_jobs, executor, nb_tasks)
+
+        if cost_file_path is not None and (
+            isinstance(executor, (WorkerPool, Executor)) or n_jobs > 1
+        ):
+            scheduled_tasks = get_scheduled_tasks(
+                [list(task) if group_tasks else [task] for task in tasks],
+                self._get_stroll_feat_keys(
+                    manual_window=segment_start_idxs is not None
+                    and segment_end_idxs is not None
+                ),
+                load_task_costs(cost_file_path),
+                executor.n_jobs if isinstance(executor, WorkerPool) else n_jobs,
+            )
+            if scheduled_tasks is not None:
+                # The scheduled tasks are bundles of stroll-feature indices, which
+                # return the same outputs as their (unbundled) tasks
+                tasks = scheduled_tasks
+                task_executor = (
+                    self._group_executor if group_tasks else self._bundle_executor
+                )
+                group_tasks = True  # i.e., each task returns a list of outputs
+                nb_tasks = len(tasks)
 
         calculated_feature_list = None
-        if n_jobs in [0, 1]:
-            idxs = range(nb_stroll_funcs)
-            if show_progress:
-                idxs = tqdm(idxs)
+        get_stroll_func = self._stroll_feat_generator(series_dict, **stroll_kwargs)
+        try:
+            if isinstance(executor, WorkerPool):
+                calculated_feature_list = self._calculate_in_worker_pool(
+                    executor,
+                    task_executor,
+                    tasks,
+                    series_dict,
+                    stroll_kwargs,
+                    show_progress,
+                )
+            else:
+                shms, pool_kwargs = [], {}
+                if use_shared_memory and n_jobs > 1 and executor in [None, "processes"]:
+                    # Only the (small) shared memory descriptor of the series_dict is
+                    # passed to the worker processes
+                    series_descriptor, shms = series_dict_to_shared_memory(series_dict)
+                    pool_kwargs["initializer"] = self._init_shared_memory_worker
+                    pool_kwargs["initargs"] = (self, series_descriptor, stroll_kwargs)
+                try:
+                    calculated_feature_list = self._execute_tasks(
+                        task_executor,
+                        tasks,
+                        n_jobs,
+                        executor,
+                        show_progress,
+                        # In shared memory mode, the workers construct the segmentations
+                        nb_stroll_funcs=None if use_shared_memory else nb_stroll_funcs,
+                        pool_kwargs=pool_kwargs,
+                    )
+                finally:
+                    close_shared_memory(shms, unlink=True)
+        finally:
+            # Release the series (and the cached segmentations) of this call
+            get_stroll_func = None
+
+        # Close the file handler (this avoids PermissionError: [WinError 32])
+        if log_file_path:
+            f_handler.close()
+            logger.removeHandler(f_handler)
+
+        if cost_file_path is not None:
             try:
-                calculated_feature_list = [self._executor(idx) for idx in idxs]
+                if calculated_feature_list is not None:
+                    update_task_costs(cost_file_path, log_file_path)
             except Exception:
-                traceback.print_exc()
+                warnings.warn(
+                    f"Could not update the cost model ({cost_file_path}) with the "
+                    + f"logged durations:\n{traceback.format_exc()}",
+                    RuntimeWarning,
+                )
+            finally:
+                if log_file_path != logging_file_path:
+                    os.remove(log_file_path)
+
+        if calculated_feature_list is None:
+            raise RuntimeError(
+                "Feature Extraction halted due to error while extracting one "
+                + "(or multiple) feature(s)! See stack trace above."
+            )
+
+        if group_tasks:
+            # Each group task returns a list of outputs
+            calculated_feature_list = list(flatten(calculated_feature_list))
+
+        if return_lazy:
+            return FeatureResult(calculated_feature_list)
+        elif return_np or return_df:
+            # Outer merge the outputs into (sorted) column blocks
+            out_index, blocks = _merge_feature_outputs(calculated_feature_list)
+            if return_np:
+                return _blocks_to_np(out_index, blocks)
+            return _blocks_to_df(out_index, blocks)
         else:
-            with Pool(processes=n_jobs) as pool:
-                results = pool.imap_unordered(self._executor, range(nb_stroll_funcs))
-                if show_progress:
-                    results = tqdm(results, total=nb_stroll_funcs)
-                try:
-                    calculated_feature_list = [f for f in results]
-                except Exception:
-                    traceback.print_exc()
-                    pool.terminate()
-                finally:
-                    # Close & join because: https://github.com/uqfoundation/pathos/issues/131
-                    pool.close()
-                    pool.join()
+            return [
+                pd.DataFrame(index=index, data=feat_out)
+                for index, feat_out in calculated_feature_list
+            ]
+
+    def calculate_grouped(
+        self,
+        data: pd.DataFrame,
+        group_by: str,
+        stride: Optional[Union[float, str, pd.Timedelta, List, None]] = None,
+        window_idx: Optional[str] = "end",
+        include_final_window: Optional[bool] = False,
+        bound_method: Optional[str] = "inner",
+        approve_sparsity: Optional[bool] = False,
+        show_progress: Optional[bool] = False,
+        logging_file_path: Optional[Union[str, Path]] = None,
+        n_jobs: Optional[int] = None,
+        group_tasks: Optional[bool] = False,
+        fast_aggregates: Optional[bool] = False,
+        max_batch_windows: Optional[int] = None,
+        output_dtype: Optional[Union[np.dtype, type, str]] = None,
+        input_dtype: Optional[Union[np.dtype, type, str]] = None,
+        executor: Optional[Union[str, Executor]] = None,
+    ) -> pd.DataFrame:
+        """Calculate features on the passed data for each group (e.g., subject).
+
+        This is equivalent to calling `calculate` (with `return_df=True`) on the data
+        of each group, but the arguments are validated only once and the features of
+        all groups are calculated in one (parallel) execution, i.e., the tasks of
+        all groups and features are distributed jointly over the workers.
+
+        The arguments that are not listed below are the same as those of `calculate`
+        (see its docstring), except that the bounds of the data are determined per
+        group and that `group_tasks` groups the features of each (group, series,
+        window) combination.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Dataframe in long format, with the data of all groups (each group its
+            data sorted by its index) and a `group_by` column with the group keys.
+        group_by : str
+            The name of the column that holds the group keys.
+
+        Returns
+        -------
+        pd.DataFrame
+            The calculated features with a (group key, window index) MultiIndex.
+            The groups are sorted on their key.
+
+        """
+        self._check_executor(executor)
+        if isinstance(executor, WorkerPool):
+            raise ValueError("A WorkerPool is not supported for grouped calculation")
+        if group_by not in data.columns:
+            raise KeyError(f"The group_by column '{group_by}' is not in the data")
+        stride, _, _ = self._check_calculate_args(stride, None, None)
+
+        # Delete other logging handlers
+        delete_logging_handlers(logger)
+        # Add logging handler (if path provided)
+        if logging_file_path:
+            f_handler = add_logging_handler(logger, logging_file_path)
+
+        # Note: this variable has a global scope so this is shared in multiprocessing
+        global get_stroll_func
+        group_keys, group_stroll_funcs = [], []
+        for group_key, group_df in data.groupby(group_by, sort=True):
+            series_dict, start, end = self._get_series_dict(
+                group_df.drop(columns=[group_by]), bound_method, input_dtype
+            )
+            group_keys.append(group_key)
+            group_stroll_funcs.append(
+                self._stroll_feat_generator(
+                    series_dict,
+                    calc_stride=stride,
+                    segment_start_idxs=None,
+                    segment_end_idxs=None,
+                    start_idx=start,
+                    end_idx=end,
+                    window_idx=window_idx,
+                    include_final_window=include_final_window,
+                    approve_sparsity=approve_sparsity,
+                    fast_aggregates=fast_aggregates,
+                    max_batch_windows=max_batch_windows,
+                    output_dtype=output_dtype,
+                )
+            )
+        nb_stroll_funcs = self._get_stroll_feat_length()
+
+        def get_group_stroll_func(idx: int) -> Tuple[StridedRolling, FuncWrapper]:
+            # The stroll-features are numbered group after group
+            return group_stroll_funcs[idx // nb_stroll_funcs](idx % nb_stroll_funcs)
+
+        # A task consists of the stroll-feature(s) of one group, this way the outputs
+        # of the tasks can be assigned to their group
+        stroll_feat_groups = (
+            self._get_stroll_feat_groups()
+            if group_tasks
+            else [[idx] for idx in range(nb_stroll_funcs)]
+        )
+        tasks = [
+            (entity_idx, [entity_idx * nb_stroll_funcs + idx for idx in feat_group])
+            for entity_idx in range(len(group_keys))
+            for feat_group in stroll_feat_groups
+        ]
+        n_jobs = self._get_n_jobs(n_jobs, executor, max(len(tasks), 1))
+        # The segmentations are constructed by the workers (instead of sequentially
+        # beforehand); consecutive tasks (i.e., of the same group) are sent together
+        # to limit the scheduling overhead of the many (small) tasks.
+        get_stroll_func = get_group_stroll_func
+        try:
+            calculated_feature_list = self._execute_tasks(
+                self._entity_executor,
+                tasks,
+                n_jobs,
+                executor,
+                show_progress,
+                chunksize=max(1, len(tasks) // (4 * max(n_jobs, 1))),
+            )
+        finally:
+            # Release the series (and the cached segmentations) of this call
+            get_stroll_func = None
 
         # Close the file handler (this avoids PermissionError: [WinError 32])
         if logging_file_path:
@@ -658,12 +1373,113 @@ class FeatureCollection:
                 + "(or multiple) feature(s)! See stack trace above."
             )
 
-        if return_df:
-            # concatenate & sort the columns
-            df = pd.concat(calculated_feature_list, axis=1, join="outer", copy=False)
-            return df.reindex(sorted(df.columns), axis=1)
-        else:
-            return calculated_feature_list
+        # Outer merge the outputs of each group into (sorted) column blocks
+        group_outputs: List[list] = [[] for _ in group_keys]
+        for entity_idx, outputs in calculated_feature_list:
+            group_outputs[entity_idx].extend(outputs)
+        if not len(group_keys):
+            return pd.DataFrame()
+        return pd.concat(
+            [_blocks_to_df(*_merge_feature_outputs(o)) for o in group_outputs],
+            keys=group_keys,
+            names=[group_by],
+        )
+
+    def compile(
+        self,
+        data: Union[
+            pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path
+        ],
+        stride: Optional[Union[float, str, pd.Timedelta, List, None]] = None,
+        window_idx: Optional[str] = "end",
+        include_final_window: Optional[bool] = False,
+        bound_method: Optional[str] = "inner",
+        approve_sparsity: Optional[bool] = False,
+        fast_aggregates: Optional[bool] = False,
+        max_batch_windows: Optional[int] = None,
+        output_dtype: Optional[Union[np.dtype, type, str]] = None,
+        input_dtype: Optional[Union[np.dtype, type, str]] = None,
+    ) -> FeaturePlan:
+        """Compile the feature collection into an execution plan.
+
+        The returned `FeaturePlan` has already checked the arguments, determined the
+        segmenter class of each segmentation and grouped the features that share
+        their segmentation. Hence, `FeaturePlan.run` avoids the (per call) overhead
+        of `calculate`, which is useful when calculating the same features on many
+        small chunks of (new) data, e.g., in a low-latency inference setting.
+
+        The arguments that are not listed below are the same as those of `calculate`
+        (see its docstring); these are fixed when compiling the plan.
+
+        Parameters
+        ----------
+        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path]
+            A sample of the data on which the plan will be run. Only the names and
+            the index dtype of the series are used, hence this may also be an empty
+            DataFrame (with the same columns & index dtype as the data).
+
+        Returns
+        -------
+        FeaturePlan
+            The (immutable) execution plan.
+
+        Raises
+        ------
+        KeyError
+            Raised when a required series is not found in `data`.
+
+        Note
+        ----
+        The plan does not support `segment_start_idxs` / `segment_end_idxs`, as these
+        depend on the data; use `calculate` instead.
+
+        """
+        stride, _, _ = self._check_calculate_args(stride, None, None)
+
+        if isinstance(data, (str, Path)):
+            data = load_npy_series(data, series_names=self.get_required_series())
+        series_dict = {str(s.name): s for s in to_series_list(data)}
+        missing = set(self.get_required_series()).difference(series_dict)
+        if len(missing):
+            raise KeyError(f"The series {sorted(missing)} are not in the data")
+
+        groups = []
+        for (key, win), fds in self._feature_desc_dict.items():
+            # Gather the functions per segmentation (i.e., stride & input type)
+            stroll_funcs: Dict[tuple, List[FuncWrapper]] = {}
+            for fd in fds:
+                fd_stride = tuple(fd.stride if stride is None else stride)
+                stroll_funcs.setdefault((fd_stride, fd.function.input_type), [])
+                stroll_funcs[(fd_stride, fd.function.input_type)].append(fd.function)
+            for (fd_stride, func_data_type), funcs in stroll_funcs.items():
+                stroll_cls = StridedRollingFactory.get_segmenter_class(
+                    [series_dict[k] for k in key], win, list(fd_stride)
+                )
+                groups.append(
+                    (
+                        stroll_cls,
+                        key,
+                        win,
+                        fd_stride,
+                        func_data_type,
+                        tuple(deepcopy(funcs)),
+                    )
+                )
+
+        return FeaturePlan(
+            groups,
+            required_series=self.get_required_series(),
+            bound_method=bound_method,
+            input_dtype=input_dtype,
+            stroll_kwargs=dict(
+                window_idx=window_idx,
+                include_final_window=include_final_window,
+                approve_sparsity=approve_sparsity,
+                fast_aggregates=fast_aggregates,
+                max_batch_windows=max_batch_windows,
+                output_dtype=output_dtype,
+            ),
+        )
 
     def serialize(self, file_path: Union[str, Path]):
         """Serialize this FeatureCollection instance.
@@ -50,6 +50,54 @@ class FuncWrapper(FrozenClass):
             * The `input_type` should be `np.array` when `vectorized` is True. It does
               not make sense to use a `pd.Series`, as the index should be regularly
               sampled (see requirement above).
+    ragged: bool, optional
+        Flag indicating whether the vectorized `func` supports windows with a varying
+        number of samples, by default False. Only relevant when `vectorized` is True.
+        .. Info::
+            A ragged vectorized function receives (for each series) a
+            ``np.ma.MaskedArray`` with shape (nb. segmented windows, max window size),
+            in which the padded values of the shorter windows are masked. Hence, the
+            function can be applied on irregularly sampled data (e.g., with gaps or
+            jitter in the time index).
+            For example a ragged vectorized version of `np.max` is
+            ``FuncWrapper(np.ma.max, vectorized=True, ragged=True, axis=1)``.
+        .. Note::
+            * Masked values in the output of `func` (e.g., for empty windows) are
+              converted to NaNs.
+            * The padded array is a copy (not a view) of the data, which requires
+              (nb. segmented windows x max window size) memory.
+    max_batch_windows: int, optional
+        The maximum number of segmented windows that are passed at once to the
+        vectorized `func`, by default None. Only relevant when `vectorized` is True.
+        If None, the `max_batch_windows` of `FeatureCollection.calculate` is used
+        (which passes all windows at once by default).
+        .. Info::
+            The function is applied on consecutive batches of windows and the outputs
+            are concatenated. This bounds the memory usage of functions that create
+            temporary arrays with the size of their input (e.g.,
+            ``x - x.mean(axis=1, keepdims=True)``), at the cost of some overhead.
+    compiled: bool, optional
+        Flag indicating whether `func` should be executed as a compiled (numba)
+        kernel, by default False.
+        .. Info::
+            A compiled function takes one or multiple 1-dimensional arrays (i.e., the
+            windows of the series) and returns a scalar (or a tuple of scalars for
+            multiple outputs), just like a regular function. However, it is applied on
+            all the segmented windows via a compiled loop, i.e., without a Python call
+            per window. If `func` is not a numba dispatcher (e.g., a ``numba.njit``
+            function), it will be compiled with ``numba.njit``.
+        .. Note::
+            numba is an optional dependency. When numba is not installed, the function
+            is executed as a regular (non-compiled) function.
+    output_dtype: Union[np.dtype, type, str], optional
+        The dtype to which the numeric (i.e., integer and float) output(s) of `func`
+        are cast, by default None. If None, the `output_dtype` of
+        `FeatureCollection.calculate` is used (which retains the output dtype of
+        `func` by default).
+        .. Info::
+            Use e.g., ``output_dtype=np.float32`` to halve the memory of the feature
+            output. The per-window outputs are directly written into an array of this
+            dtype.
     **kwargs: dict, optional
         Keyword arguments which will be also passed to the `function`
 
@@ -66,6 +114,10 @@ class FuncWrapper(FrozenClass):
         output_names: Optional[Union[List[str], str]] = None,
         input_type: Optional[Union[np.array, pd.Series]] = np.array,
         vectorized: bool = False,
+        ragged: bool = False,
+        max_batch_windows: Optional[int] = None,
+        compiled: bool = False,
+        output_dtype: Optional[Union[np.dtype, type, str]] = None,
         **kwargs,
     ):
         """Create FuncWrapper instance."""
@@ -85,8 +137,21 @@ class FuncWrapper(FrozenClass):
         assert not (
             vectorized & (input_type is not np.array)
         ), "The input_type must be np.array if vectorized is True!"
+        assert not (
+            ragged & (not vectorized)
+        ), "The function must be vectorized if ragged is True!"
         self.input_type = input_type
         self.vectorized = vectorized
+        assert max_batch_windows is None or (
+            vectorized and max_batch_windows > 0
+        ), "max_batch_windows must be > 0 and can only be set for vectorized functions!"
+        self.ragged = ragged
+        self.max_batch_windows = max_batch_windows
+        assert not (
+            compiled & (vectorized | (input_type is not np.array))
+        ), "A compiled function can not be vectorized and requires np.array input!"
+        self.compiled = compiled
+        self.output_dtype = None if output_dtype is None else np.dtype(output_dtype)
 
         self._freeze()
 
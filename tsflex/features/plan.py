@@ -0,0 +1,198 @@
+"""FeaturePlan class for the repeated feature calculation on new data."""
+
+from __future__ import annotations
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.time import timedelta_to_str
+from .function_wrapper import FuncWrapper
+from .result import FeatureResult
+from .segmenter.strided_rolling import StridedRolling
+from .utils import (
+    _blocks_to_df,
+    _blocks_to_np,
+    _get_series_dict,
+    _merge_feature_outputs,
+)
+
+# A segmentation group, i.e., the StridedRolling class, the series key, the window,
+# the strides, the function input type and the functions of the group
+_PlanGroup = Tuple[
+    Type[StridedRolling],
+    Tuple[str, ...],
+    Any,
+    Optional[Tuple[Any, ...]],
+    Any,
+    Tuple[FuncWrapper, ...],
+]
+
+
+class FeaturePlan:
+    """A precompiled (immutable) execution plan of a `FeatureCollection`.
+
+    All the work of `FeatureCollection.calculate` that does not depend on the data
+    itself, i.e., checking the feature descriptors & calculate arguments, parsing the
+    strides, determining the segmenter (i.e., `StridedRolling`) class of each
+    segmentation and grouping the features that share their segmentation, is done
+    once when compiling the plan. Hence, `run` only segments the data and applies the
+    functions (sequentially, in this process).
+
+    A plan is constructed via `FeatureCollection.compile`.
+
+    Parameters
+    ----------
+    groups : List[_PlanGroup]
+        The segmentation groups, each group consists of the StridedRolling class, the
+        series key, the window, the strides, the function input type and the
+        functions of the group.
+    required_series : List[str]
+        The names of the required series.
+    bound_method : str
+        The bound method, see `FeatureCollection.calculate`.
+    input_dtype : Union[np.dtype, None]
+        The dtype to which the numeric series are cast, see
+        `FeatureCollection.calculate`.
+    stroll_kwargs : Dict[str, Any]
+        The additional keyword arguments of each `StridedRolling` instance.
+
+    Notes
+    -----
+    * The plan holds the state of the feature collection at compile time, i.e.,
+      features that are added afterwards to the collection are not calculated.
+    * The data that is passed to `run` should have the same index dtype as the data
+      that was passed to `FeatureCollection.compile`.
+
+    Examples
+    --------
+    ```python
+    plan = fc.compile(data)
+    for chunk in chunks:
+        df_feat = plan.run(chunk, return_df=True)
+    ```
+
+    """
+
+    def __init__(
+        self,
+        groups: List[_PlanGroup],
+        required_series: List[str],
+        bound_method: str,
+        input_dtype: Optional[np.dtype],
+        stroll_kwargs: Dict[str, Any],
+    ):
+        self._groups: Tuple[_PlanGroup, ...] = tuple(groups)
+        self._required_series: Tuple[str, ...] = tuple(required_series)
+        self._bound_method = bound_method
+        self._input_dtype = input_dtype
+        self._stroll_kwargs: Dict[str, Any] = dict(stroll_kwargs)
+        self._columns: Tuple[str, ...] = tuple(
+            sorted(
+                StridedRolling.construct_output_index(
+                    series_keys=key,
+                    feat_name=output_name,
+                    win_str=self._get_win_str(window),
+                )
+                for _, key, window, _, _, funcs in self._groups
+                for func in funcs
+                for output_name in func.output_names
+            )
+        )
+
+    @staticmethod
+    def _get_win_str(window: Any) -> str:
+        """Return the window string of the output names (see `StridedRolling`)."""
+        if isinstance(window, pd.Timedelta):
+            return timedelta_to_str(window)
+        return str(window)
+
+    @property
+    def required_series(self) -> List[str]:
+        """The names of the required series."""
+        return list(self._required_series)
+
+    @property
+    def columns(self) -> List[str]:
+        """The (sorted) names of the output feature columns."""
+        return list(self._columns)
+
+    def run(
+        self,
+        data: Union[
+            pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path
+        ],
+        return_df: Optional[bool] = False,
+        return_np: Optional[bool] = False,
+        return_lazy: Optional[bool] = False,
+    ) -> Union[
+        List[pd.DataFrame],
+        pd.DataFrame,
+        Tuple[np.ndarray, List[str], np.ndarray],
+        FeatureResult,
+    ]:
+        """Calculate the features of the plan on the data.
+
+        Parameters
+        ----------
+        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path]
+            Dataframe or Series or list thereof, with all the required data for the
+            feature calculation (or the path of the `.npy` file(s), see
+            `FeatureCollection.calculate`).
+        return_df, return_np, return_lazy : bool, optional
+            The output format, by default False. See the same arguments of
+            `FeatureCollection.calculate`.
+
+        Returns
+        -------
+        Union[List[pd.DataFrame], pd.DataFrame, Tuple[np.ndarray, List[str], np.ndarray], FeatureResult]
+            The calculated features, see `FeatureCollection.calculate`.
+
+        Raises
+        ------
+        KeyError
+            Raised when a required series is not found in `data`.
+
+        """
+        series_dict, start, end = _get_series_dict(
+            data, self._required_series, self._bound_method, self._input_dtype
+        )
+        missing = set(self._required_series).difference(series_dict)
+        if len(missing):
+            raise KeyError(f"The series {sorted(missing)} are not in the data")
+
+        calculated_feature_list = []
+        for stroll_cls, key, window, strides, func_data_type, funcs in self._groups:
+            stroll = stroll_cls(
+                [series_dict[k] for k in key],
+                window,
+                None if strides is None else list(strides),
+                start_idx=start,
+                end_idx=end,
+                func_data_type=func_data_type,
+                **self._stroll_kwargs,
+            )
+            calculated_feature_list.append(stroll._apply_funcs(list(funcs)))
+
+        if return_lazy:
+            return FeatureResult(calculated_feature_list)
+        elif return_np or return_df:
+            out_index, blocks = _merge_feature_outputs(calculated_feature_list)
+            if return_np:
+                return _blocks_to_np(out_index, blocks)
+            return _blocks_to_df(out_index, blocks)
+        return [
+            pd.DataFrame(index=index, data=feat_out)
+            for index, feat_out in calculated_feature_list
+        ]
+
+    def __repr__(self) -> str:
+        """Representation string of a FeaturePlan."""
+        return (
+            f"{self.__class__.__name__}({len(self._columns)} columns, "
+            + f"{len(self._groups)} segmentations)"
+        )
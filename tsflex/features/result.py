@@ -0,0 +1,164 @@
+"""FeatureResult class for lazy access to the calculated features."""
+
+from __future__ import annotations
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.data import to_list
+from .utils import _blocks_to_df, _blocks_to_np, _merge_feature_outputs
+
+
+class FeatureResult:
+    """The (lazy) output of a feature calculation.
+
+    The output of each calculated feature (i.e., its index and output arrays) is kept
+    as is, instead of outer merging all the features into one frame. Selecting
+    columns or slicing the index results in a new `FeatureResult` (that holds views
+    on the output arrays); only upon `to_pandas`, `to_numpy` or `to_parquet` the
+    selected features are merged (i.e., materialized).
+
+    Parameters
+    ----------
+    outputs : List[Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]]
+        The feature outputs, each output consists of an index and the output arrays
+        (with the column-names as key). A value of None denotes an empty output.
+
+    Examples
+    --------
+    ```python
+    res = fc.calculate(data, return_lazy=True)
+    # Only the selected columns (in the selected range) are merged
+    res = res[["EDA__mean__w=1m", "TMP__std__w=1m"]]["2022-01-01":"2022-01-02"]
+    df = res.to_pandas()
+    ```
+
+    """
+
+    def __init__(self, outputs: List[Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]]):
+        self._outputs = outputs
+
+    @property
+    def columns(self) -> List[str]:
+        """The (sorted) names of the feature columns."""
+        return sorted(col for _, feat_out in self._outputs for col in feat_out)
+
+    def select(self, columns: Union[str, List[str]]) -> FeatureResult:
+        """Select the given feature columns.
+
+        Parameters
+        ----------
+        columns : Union[str, List[str]]
+            The name(s) of the feature columns.
+
+        Returns
+        -------
+        FeatureResult
+            The result with only the selected feature columns.
+
+        Raises
+        ------
+        KeyError
+            Raised when a column is not present in this result.
+
+        """
+        columns = set(to_list(columns))
+        missing = columns.difference(self.columns)
+        if len(missing):
+            raise KeyError(f"The columns {sorted(missing)} are not in the result")
+        outputs = []
+        for index, feat_out in self._outputs:
+            selected = {col: v for col, v in feat_out.items() if col in columns}
+            if len(selected):
+                outputs.append((index, selected))
+        return FeatureResult(outputs)
+
+    def slice(self, start: Any = None, end: Any = None) -> FeatureResult:
+        """Select the features with an index in the (closed) range [start, end].
+
+        Parameters
+        ----------
+        start : Any, optional
+            The start of the range, by default None. If None, the range is not
+            bounded on the left.
+        end : Any, optional
+            The end of the range, by default None. If None, the range is not
+            bounded on the right.
+
+        Returns
+        -------
+        FeatureResult
+            The result with only the features in the range.
+
+        """
+        outputs = []
+        for index, feat_out in self._outputs:
+            if index.is_monotonic_increasing:
+                # Slice the output arrays (i.e., views)
+                sel = slice(
+                    0 if start is None else index.searchsorted(start, "left"),
+                    len(index) if end is None else index.searchsorted(end, "right"),
+                )
+            else:
+                sel = np.ones(len(index), dtype=bool)
+                if start is not None:
+                    sel &= index >= start
+                if end is not None:
+                    sel &= index <= end
+            outputs.append(
+                (
+                    index[sel],
+                    {col: None if v is None else v[sel] for col, v in feat_out.items()},
+                )
+            )
+        return FeatureResult(outputs)
+
+    def __getitem__(self, key: Union[str, List[str], slice]) -> FeatureResult:
+        """Select the feature column(s), or slice the index when `key` is a slice."""
+        if isinstance(key, slice):
+            assert key.step is None, "A slice with a step is not supported"
+            return self.slice(key.start, key.stop)
+        return self.select(key)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Return the (outer merged) features as a DataFrame.
+
+        This is equivalent to the output of `FeatureCollection.calculate` with
+        `return_df=True`.
+
+        """
+        return _blocks_to_df(*_merge_feature_outputs(self._outputs))
+
+    def to_numpy(self) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        """Return the (outer merged) features as a tuple of numpy arrays.
+
+        This is equivalent to the output of `FeatureCollection.calculate` with
+        `return_np=True`, i.e., a tuple of `(index, column_names, values)`.
+
+        """
+        return _blocks_to_np(*_merge_feature_outputs(self._outputs))
+
+    def to_parquet(self, path: Union[str, Path], **kwargs):
+        """Write the (outer merged) features to a Parquet file.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            The file path of the Parquet file.
+        **kwargs
+            Additional keyword arguments for `pd.DataFrame.to_parquet`.
+
+        """
+        self.to_pandas().to_parquet(path, **kwargs)
+
+    def __repr__(self) -> str:
+        """Representation string of a FeatureResult."""
+        return (
+            f"{self.__class__.__name__}({len(self.columns)} columns, "
+            + f"{len(self._outputs)} outputs)"
+        )
@@ -0,0 +1,183 @@
+"""Cost-aware scheduling of the feature calculation tasks.
+
+The duration of each executed function is logged by `StridedRolling` (see the
+`logging_file_path` of `FeatureCollection.calculate`). These durations are
+aggregated (via `get_function_stats`) into a cost model that is persisted in a
+(json) cost file, which is updated after every run. The cost model is used to
+
+* order the tasks longest-first (i.e., the LPT rule), so that no slow task is
+  scheduled at the tail while the other workers are idle, and
+* bundle cheap tasks into chunks, so that the scheduling overhead of the worker
+  pool does not dominate the calculation time of these tasks.
+
+"""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.time import timedelta_to_str
+from .logger import get_function_stats
+
+# The targeted (maximal) expected duration of a bundle of cheap tasks (in seconds)
+_TARGET_BUNDLE_DURATION_S = 0.1
+# The minimal number of bundles per worker (to balance the load at the tail)
+_MIN_BUNDLES_PER_JOB = 4
+
+
+def _window_to_str(window: Union[float, pd.Timedelta, None]) -> str:
+    """Return the string of the window, as parsed from the logged messages."""
+    if window is None:
+        return "manual"
+    if isinstance(window, pd.Timedelta):
+        return timedelta_to_str(window)
+    return str(window)
+
+
+def load_task_costs(cost_file_path: Union[str, Path]) -> Dict[str, Dict[str, list]]:
+    """Load the cost model from the cost file.
+
+    Parameters
+    ----------
+    cost_file_path : Union[str, Path]
+        The (json) file path of the cost model.
+
+    Returns
+    -------
+    Dict[str, Dict[str, list]]
+        The cost model, i.e., for each function name and window the (summed) duration
+        and number of executions. Empty if the cost file does not exist.
+
+    """
+    if not os.path.exists(cost_file_path):
+        return {}
+    with open(cost_file_path, "r") as f:
+        return json.load(f)
+
+
+def update_task_costs(
+    cost_file_path: Union[str, Path], logging_file_path: Union[str, Path]
+):
+    """Add the logged durations of a run to the cost model in the cost file.
+
+    Parameters
+    ----------
+    cost_file_path : Union[str, Path]
+        The (json) file path of the cost model.
+    logging_file_path : Union[str, Path]
+        The file path where the logged messages of the run are stored.
+
+    """
+    costs = load_task_costs(cost_file_path)
+    function_stats = get_function_stats(logging_file_path)["duration"]
+    for (func_name, window, _), stats in function_stats.iterrows():
+        func_costs = costs.setdefault(func_name, {})
+        duration, count = func_costs.get(str(window), [0.0, 0])
+        func_costs[str(window)] = [duration + stats["sum"], count + int(stats["count"])]
+    with open(cost_file_path, "w") as f:
+        json.dump(costs, f)
+
+
+def get_task_cost(
+    costs: Dict[str, Dict[str, list]],
+    func_name: str,
+    window: Union[float, pd.Timedelta, None],
+) -> Optional[float]:
+    """Return the expected duration of the function on the window.
+
+    If the function was not executed on this window, the mean duration of the
+    function (over all its windows) is returned. None if the function is unknown.
+
+    """
+    func_costs = costs.get(func_name)
+    if not func_costs:
+        return None
+    duration, count = func_costs.get(
+        _window_to_str(window), np.sum(list(func_costs.values()), axis=0)
+    )
+    return duration / max(count, 1)
+
+
+def schedule_tasks(
+    tasks: Sequence[Sequence[int]], task_costs: Sequence[float], n_jobs: int
+) -> List[List[int]]:
+    """Order the tasks longest-first and bundle the cheap (consecutive) tasks.
+
+    Parameters
+    ----------
+    tasks : Sequence[Sequence[int]]
+        The tasks, each task consists of the indices of its stroll-features.
+    task_costs : Sequence[float]
+        The expected duration of each task.
+    n_jobs : int
+        The number of workers.
+
+    Returns
+    -------
+    List[List[int]]
+        The bundled tasks (i.e., the stroll-feature indices of each bundle) in
+        decreasing order of expected duration.
+
+    """
+    order = np.argsort(-np.asarray(task_costs, dtype=float), kind="stable")
+    # The bundle duration is bounded, so that there are enough bundles to balance
+    # the load over the workers
+    target = min(
+        _TARGET_BUNDLE_DURATION_S,
+        np.sum(task_costs) / (_MIN_BUNDLES_PER_JOB * max(n_jobs, 1)),
+    )
+    bundles: List[List[int]] = []
+    bundle: List[int] = []
+    bundle_cost = 0.0
+    for task_idx in order:
+        if len(bundle) and bundle_cost + task_costs[task_idx] > target:
+            bundles.append(bundle)
+            bundle, bundle_cost = [], 0.0
+        bundle.extend(tasks[task_idx])
+        bundle_cost += task_costs[task_idx]
+    if len(bundle):
+        bundles.append(bundle)
+    return bundles
+
+
+def get_scheduled_tasks(
+    tasks: Sequence[Sequence[int]],
+    task_keys: Sequence[Tuple[str, Union[float, pd.Timedelta, None]]],
+    costs: Dict[str, Dict[str, list]],
+    n_jobs: int,
+) -> Optional[List[List[int]]]:
+    """Schedule the tasks with the cost model.
+
+    Parameters
+    ----------
+    tasks : Sequence[Sequence[int]]
+        The tasks, each task consists of the indices of its stroll-features.
+    task_keys : Sequence[Tuple[str, Union[float, pd.Timedelta, None]]]
+        The (function name, window) of each stroll-feature.
+    costs : Dict[str, Dict[str, list]]
+        The cost model, see `load_task_costs`.
+    n_jobs : int
+        The number of workers.
+
+    Returns
+    -------
+    Optional[List[List[int]]]
+        The scheduled (bundled) tasks, see `schedule_tasks`. None if none of the
+        functions are present in the cost model.
+
+    """
+    feat_costs = [get_task_cost(costs, *key) for key in task_keys]
+    known_costs = [c for c in feat_costs if c is not None]
+    if not len(known_costs):
+        return None
+    # Unknown functions are expected to take the median duration
+    default_cost = float(np.median(known_costs))
+    feat_costs = [default_cost if c is None else c for c in feat_costs]
+    task_costs = [sum(feat_costs[idx] for idx in task) for task in tasks]
+    return schedule_tasks(tasks, task_costs, n_jobs)
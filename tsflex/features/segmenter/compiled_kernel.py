@@ -0,0 +1,136 @@
+"""Compiled (numba) execution of functions on the segmented windows.
+
+The default (non-vectorized) execution calls the function once per window from
+Python, so that for cheap functions the interpreter overhead dominates. A
+`FuncWrapper` with `compiled=True` is instead driven by a numba-compiled loop over
+the segment bounds (i.e., the `start_indexes` and `end_indexes` of the series
+containers) that writes the function output directly into an output array.
+
+.. note::
+    numba is an optional dependency (`pip install tsflex[numba]`). When numba is not
+    installed, compiled functions are executed as regular functions (i.e., once per
+    window from Python).
+
+"""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..function_wrapper import FuncWrapper
+
+try:
+    import numba
+except ImportError:  # pragma: no cover
+    numba = None
+
+# The compiled functions (to avoid re-compiling the same function)
+_JIT_FUNCS: Dict[Callable, Callable] = {}
+# The compiled loops for (nb. series, nb. outputs, keyword argument names)
+_KERNEL_LOOPS: Dict[Tuple[int, int, Tuple[str, ...]], Callable] = {}
+
+
+def _jit(func: Callable) -> Callable:
+    """Return the numba-compiled (i.e., njit) version of the function."""
+    if isinstance(func, numba.core.dispatcher.Dispatcher):
+        return func
+    if func not in _JIT_FUNCS:
+        _JIT_FUNCS[func] = numba.njit(func)
+    return _JIT_FUNCS[func]
+
+
+def _get_kernel_loop(
+    nb_series: int, nb_outputs: int, kwarg_names: Tuple[str, ...]
+) -> Callable:
+    """Return the compiled loop that applies a function on each window.
+
+    The loop has the signature `(func, out, *kwarg_values, *series_args)`, with the
+    series args being `(values, start_indexes, end_indexes)` for each series. As numba
+    specializes the loop on the passed (compiled) function, one loop is generated for
+    each combination of the number of series, outputs, and keyword argument names.
+
+    """
+    key = (nb_series, nb_outputs, kwarg_names)
+    if key not in _KERNEL_LOOPS:
+        series_args = [f"v{i}, s{i}, e{i}" for i in range(nb_series)]
+        windows = [f"v{i}[s{i}[w] : e{i}[w]]" for i in range(nb_series)]
+        kwargs = [f"{k}=k{i}" for i, k in enumerate(kwarg_names)]
+        kwarg_args = [f"k{i}" for i in range(len(kwarg_names))]
+        if nb_outputs == 1:
+            assign = "        out[w, 0] = res"
+        else:
+            assign = "\n".join(
+                f"        out[w, {i}] = res[{i}]" for i in range(nb_outputs)
+            )
+        source = (
+            f"def kernel_loop(func, out, {', '.join(kwarg_args + series_args)}):\n"
+            + "    for w in range(out.shape[0]):\n"
+            + f"        res = func({', '.join(windows + kwargs)})\n"
+            + assign
+        )
+        namespace: dict = {}
+        exec(source, namespace)
+        _KERNEL_LOOPS[key] = numba.njit(namespace["kernel_loop"])
+    return _KERNEL_LOOPS[key]
+
+
+def compiled_kernel(func: FuncWrapper, series_containers: List) -> Optional[np.ndarray]:
+    """Apply the compiled function on each segmented window via a compiled loop.
+
+    Parameters
+    ----------
+    func : FuncWrapper
+        The function (with `compiled=True`) that is applied on the segmented series.
+        If the function is not yet compiled (i.e., a numba dispatcher), it will be
+        compiled with `numba.njit`.
+    series_containers : List
+        The series containers (with `values`, `start_indexes` and `end_indexes`) of
+        the segmented series.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The output of the function with shape (nb. windows, nb. outputs). None if
+        numba is not installed or there are no windows or the series are not
+        numeric (in which case the function should be applied on the segmented
+        windows from Python).
+
+    """
+    if numba is None or not len(series_containers[0].start_indexes):
+        return None
+    if any(sc.values.dtype.hasobject for sc in series_containers):
+        return None
+
+    jit_func = _jit(func.func)
+    kwarg_names = tuple(func.kwargs.keys())
+    kwarg_values = tuple(func.kwargs.values())
+
+    # Apply the function on the first window to determine the output (dtype)
+    res = jit_func(
+        *[
+            sc.values[sc.start_indexes[0] : sc.end_indexes[0]]
+            for sc in series_containers
+        ],
+        **func.kwargs,
+    )
+    nb_outputs = len(res) if isinstance(res, tuple) else 1
+    assert nb_outputs == len(
+        func.output_names
+    ), f"Func {func} returned incorrect number of outputs ({nb_outputs})!"
+    out_dtype = (
+        np.result_type(*res) if isinstance(res, tuple) else np.asarray(res).dtype
+    )
+
+    out = np.empty((len(series_containers[0].start_indexes), nb_outputs), out_dtype)
+    series_args = []
+    for sc in series_containers:
+        series_args += [
+            sc.values,
+            np.asarray(sc.start_indexes, dtype=np.int64),
+            np.asarray(sc.end_indexes, dtype=np.int64),
+        ]
+    kernel_loop = _get_kernel_loop(len(series_containers), nb_outputs, kwarg_names)
+    kernel_loop(jit_func, out, *kwarg_values, *series_args)
+    return out
@@ -0,0 +1,233 @@
+"""Fast rolling aggregates for commonly used (numpy) statistics.
+
+Applying e.g. `np.mean` on each segmented window costs O(window size) per window,
+whereas with overlapping windows (i.e., stride < window) most of this work is
+repeated. The aggregates in this module are calculated directly on the segment
+bounds (i.e., the `start_indexes` and `end_indexes` of the series container);
+
+* `np.sum`, `np.mean`, `np.var` and `np.std` via prefix sums, i.e., O(1) per window,
+* `np.min` and `np.max` via a range-extremum table, i.e., O(1) per window (after
+  building the table in O(n log(max window size))).
+
+As the segment bounds are used, this also works for irregularly sampled data (i.e.,
+windows with a varying number of samples), for which the vectorized function
+execution is not possible.
+
+"""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..function_wrapper import FuncWrapper
+
+
+def _rolling_sum(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    if values.dtype.kind in "iu":
+        # Integer sums are exact (and overflow just like np.sum)
+        dtype = np.int_ if values.dtype.kind == "i" else np.uint
+        cumsum = np.zeros(len(values) + 1, dtype=dtype)
+        np.cumsum(values, dtype=dtype, out=cumsum[1:])
+        return cumsum[end_idxs] - cumsum[start_idxs]
+    # Center the values to limit the (floating point) error of the prefix sums
+    values = values.astype(np.float64, copy=False)
+    center = np.mean(values)
+    cumsum = np.concatenate([[0.0], np.cumsum(values - center)])
+    return cumsum[end_idxs] - cumsum[start_idxs] + center * (end_idxs - start_idxs)
+
+
+def _rolling_mean(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    if values.dtype.kind == "f":
+        values = values.astype(np.float64, copy=False)
+    # Note: for integer values, the (exact) integer sums are used
+    return _rolling_sum(values, start_idxs, end_idxs) / (end_idxs - start_idxs)
+
+
+def _rolling_var(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    nb_samples = end_idxs - start_idxs
+    if values.dtype.kind in "iu":
+        # Use exact integer arithmetic when the (scaled) sums of squares fit in int64
+        max_abs = int(np.max(np.abs(values.astype(np.int64))))
+        if (int(np.max(nb_samples)) * max_abs) ** 2 < 2**62:
+            cumsum = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(values, dtype=np.int64, out=cumsum[1:])
+            cumsum_sq = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(np.square(values, dtype=np.int64), out=cumsum_sq[1:])
+            sums = cumsum[end_idxs] - cumsum[start_idxs]
+            sums_sq = cumsum_sq[end_idxs] - cumsum_sq[start_idxs]
+            return (nb_samples * sums_sq - np.square(sums)) / np.square(nb_samples)
+    # Center the values to limit the (floating point) error of the prefix sums
+    values = values.astype(np.float64, copy=False)
+    centered = values - np.mean(values)
+    cumsum = np.concatenate([[0.0], np.cumsum(centered)])
+    cumsum_sq = np.concatenate([[0.0], np.cumsum(np.square(centered))])
+    mean = (cumsum[end_idxs] - cumsum[start_idxs]) / nb_samples
+    mean_sq = (cumsum_sq[end_idxs] - cumsum_sq[start_idxs]) / nb_samples
+    # Clip the (tiny) negative values that are caused by floating point errors
+    return np.maximum(mean_sq - np.square(mean), 0)
+
+
+def _rolling_std(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    return np.sqrt(_rolling_var(values, start_idxs, end_idxs))
+
+
+def _rolling_extremum(
+    ufunc: np.ufunc, values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    """Calculate the rolling minimum / maximum with a range-extremum table.
+
+    At level k, the table holds the extremum of each range [i, i + 2**k). The
+    extremum of a window with size in [2**k, 2**(k+1)) is thus the extremum of the
+    two (overlapping) ranges at level k that start at the window its start and end
+    at the window its end. Only one level of the table is kept in memory.
+
+    """
+    # The level of each window, i.e., floor(log2(window size))
+    levels = np.frexp(end_idxs - start_idxs)[1] - 1
+    out = np.empty(len(start_idxs), dtype=values.dtype)
+    table = values
+    for level in range(levels.max() + 1):
+        if level > 0:
+            half = 1 << (level - 1)
+            table = ufunc(table[:-half], table[half:])
+        mask = levels == level
+        if np.any(mask):
+            out[mask] = ufunc(
+                table[start_idxs[mask]], table[end_idxs[mask] - (1 << level)]
+            )
+    return out
+
+
+def _rolling_min(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    return _rolling_extremum(np.minimum, values, start_idxs, end_idxs)
+
+
+def _rolling_max(
+    values: np.ndarray, start_idxs: np.ndarray, end_idxs: np.ndarray
+) -> np.ndarray:
+    return _rolling_extremum(np.maximum, values, start_idxs, end_idxs)
+
+
+# The recognised functions and their rolling implementation
+_ROLLING_AGGREGATES: Dict[Callable, Callable] = {
+    np.sum: _rolling_sum,
+    np.mean: _rolling_mean,
+    np.var: _rolling_var,
+    np.std: _rolling_std,
+    np.min: _rolling_min,
+    np.max: _rolling_max,
+    np.amin: _rolling_min,
+    np.amax: _rolling_max,
+}
+
+# The aggregates that are calculated via prefix sums (and thus require finite values)
+_PREFIX_SUM_AGGREGATES = (_rolling_sum, _rolling_mean, _rolling_var, _rolling_std)
+
+
+def _is_exact(rolling_func: Callable, values: np.ndarray) -> bool:
+    """Whether the rolling implementation yields exactly the numpy output."""
+    if rolling_func in (_rolling_min, _rolling_max):
+        return True
+    return rolling_func is _rolling_sum and values.dtype.kind in "iu"
+
+
+def _get_rolling_aggregate(func: FuncWrapper) -> Optional[Callable]:
+    """Return the rolling implementation of the function, None if not recognised."""
+    try:
+        rolling_func = _ROLLING_AGGREGATES.get(func.func)
+    except TypeError:  # unhashable function
+        return None
+    if rolling_func is None or func.input_type is not np.array:
+        return None
+    if len(func.output_names) != 1:
+        return None
+    # Only the default behavior (i.e., no keyword arguments) is recognised. A
+    # vectorized function should aggregate over the window axis.
+    kwargs = dict(func.kwargs)
+    if func.vectorized and kwargs.pop("axis", None) not in [1, -1]:
+        return None
+    if kwargs:
+        return None
+    return rolling_func
+
+
+def rolling_aggregate(
+    func: FuncWrapper, series_containers: List, approximate: bool = False
+) -> Optional[np.ndarray]:
+    """Calculate the function on the segmented series via its rolling implementation.
+
+    Parameters
+    ----------
+    func : FuncWrapper
+        The function that is applied on the segmented series.
+    series_containers : List
+        The series containers (with `values`, `start_indexes` and `end_indexes`) of
+        the segmented series.
+    approximate : bool, optional
+        Whether the aggregates that are calculated via prefix sums on floating point
+        values (i.e., sum, mean, var and std) may be used, by default False. The output
+        of these aggregates might slightly differ (i.e., floating point errors) from
+        applying the numpy function on each window. The min, max and integer sum are
+        always exact.
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The output of the function for each segmented window. None if the function
+        is not recognised or its rolling implementation is not applicable (in which
+        case the function should be applied on the segmented windows).
+
+    Note
+    ----
+    The rolling implementation is only applicable for a single, real numeric series
+    with non-empty windows (which are regularly segmented for vectorized functions).
+    The sum, mean, var and std additionally require finite values (as a nan / inf
+    would propagate through the prefix sums).
+
+    """
+    rolling_func = _get_rolling_aggregate(func)
+    if rolling_func is None or len(series_containers) != 1:
+        return None
+    sc = series_containers[0]
+    values = sc.values
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "iuf":
+        return None
+    if not (approximate or _is_exact(rolling_func, values)):
+        return None
+    start_idxs = np.asarray(sc.start_indexes, dtype=np.int64)
+    end_idxs = np.asarray(sc.end_indexes, dtype=np.int64)
+    if not len(start_idxs) or np.any(end_idxs <= start_idxs):
+        return None
+    if (
+        func.vectorized
+        and not func.ragged
+        and (
+            len(np.unique(end_idxs - start_idxs)) > 1
+            or len(np.unique(np.diff(start_idxs))) > 1
+        )
+    ):
+        # Vectorized functions require regularly segmented windows, hence, the
+        # vectorized execution is used (which will raise an error)
+        return None
+    if (
+        rolling_func in _PREFIX_SUM_AGGREGATES
+        and values.dtype.kind == "f"
+        and not np.all(np.isfinite(values))
+    ):
+        return None
+
+    # The output dtype of the numpy function (e.g., float32 for a float32 mean)
+    out_dtype = np.asarray(func.func(values[:1])).dtype
+    return rolling_func(values, start_idxs, end_idxs).astype(out_dtype, copy=False)
@@ -17,7 +17,8 @@ import time
 import warnings
 from abc import ABC, abstractmethod
 from collections import namedtuple
-from typing import List, Optional, Tuple, TypeVar, Union
+from itertools import starmap
+from typing import Dict, Iterator, List, Optional, Tuple, TypeVar, Union
 
 import numpy as np
 import pandas as pd
@@ -28,6 +29,8 @@ from ...utils.time import timedelta_to_str
 from ..function_wrapper import FuncWrapper
 from ..logger import logger
 from ..utils import _check_start_end_array, _determine_bounds
+from .compiled_kernel import compiled_kernel
+from .rolling_aggregates import rolling_aggregate
 
 # Declare a type variable
 T = TypeVar("T")
@@ -110,6 +113,23 @@ class StridedRolling(ABC):
         Bool indicating whether the user acknowledges that there may be sparsity (i.e.,
         irregularly sampled data), by default False.
         If False and sparsity is observed, a warning is raised.
+    fast_aggregates: bool, optional
+        Whether the recognised numpy aggregates (i.e., the sum, mean, var, std, min
+        and max) are calculated directly on the segment bounds, by default False.
+        This takes O(1) per window, but the output of the sum, mean, var and std on
+        floating point data might slightly differ (i.e., floating point errors) from
+        applying the function on each window.
+        .. Note::
+            The min, max and integer sum are exact. See the `rolling_aggregates`
+            module for more info.
+    max_batch_windows: int, optional
+        The maximum number of windows that are passed at once to a vectorized
+        function, by default None. If None, all windows are passed at once. This
+        default is overridden by the `max_batch_windows` of the `FuncWrapper`.
+    output_dtype: Union[np.dtype, type, str], optional
+        The dtype to which the numeric (i.e., integer and float) function outputs are
+        cast, by default None. If None, the output dtype of the functions is retained.
+        This default is overridden by the `output_dtype` of the `FuncWrapper`.
 
     Notes
     -----
@@ -142,6 +162,9 @@ class StridedRolling(ABC):
         window_idx: Optional[str] = "end",
         include_final_window: bool = False,
         approve_sparsity: Optional[bool] = False,
+        fast_aggregates: Optional[bool] = False,
+        max_batch_windows: Optional[int] = None,
+        output_dtype: Optional[Union[np.dtype, type, str]] = None,
     ):
         if strides is not None:
             strides = to_list(strides)
@@ -161,6 +184,10 @@ class StridedRolling(ABC):
         self.window_idx = window_idx
         self.include_final_window = include_final_window
         self.approve_sparsity = approve_sparsity
+        self.fast_aggregates = fast_aggregates
+        assert max_batch_windows is None or max_batch_windows > 0
+        self.max_batch_windows = max_batch_windows
+        self.output_dtype = None if output_dtype is None else np.dtype(output_dtype)
 
         assert func_data_type in SUPPORTED_STROLL_TYPES
         self.data_type = func_data_type
@@ -222,6 +249,8 @@ class StridedRolling(ABC):
         self.series_containers = self._construct_series_containers(
             series_list, np_start_times, np_end_times
         )
+        # The sliding window views for the vectorized functions (lazily constructed)
+        self._window_views: Optional[List[np.ndarray]] = None
 
         # 5. Check the sparsity assumption
         if not self.approve_sparsity and len(self.index):
@@ -355,7 +384,51 @@ class StridedRolling(ABC):
           the ``output_names`` attributes of its constructor.
 
         """
+        return self.apply_funcs([func])
+
+    def apply_funcs(self, funcs: List[FuncWrapper]) -> pd.DataFrame:
+        """Apply multiple functions to the segmented series.
+
+        All functions are applied on the same segmentation and their outputs are
+        gathered in one DataFrame (instead of one DataFrame per function).
+
+        Parameters
+        ----------
+        funcs : List[FuncWrapper]
+            The Callable wrapped functions which will be applied.
+
+        Returns
+        -------
+        pd.DataFrame
+            The merged output of the functions applied to every column in a
+            new DataFrame. The DataFrame's column-names have the format:
+                `<series_col_name(s)>_<feature_name>__w=<window>`.
+
+        """
+        index, feat_out = self._apply_funcs(funcs)
+        return pd.DataFrame(index=index, data=feat_out)
+
+    def _apply_funcs(
+        self, funcs: List[FuncWrapper]
+    ) -> Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]:
+        """Apply multiple functions to the segmented series.
+
+        Returns
+        -------
+        Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]
+            Tuple of 1st the output index, and 2nd the output arrays of the functions
+            (with the column-names as key).
+
+        """
+        feat_out = {}
+        for func in funcs:
+            feat_out.update(self._apply_func(func))
+        return self.index, feat_out
+
+    def _apply_func(self, func: FuncWrapper) -> Dict[str, Optional[np.ndarray]]:
+        """Apply a function to the segmented series and return its named output(s)."""
         feat_names = func.output_names
+        out_dtype = self._get_output_dtype(func)
 
         t_start = time.time()
 
@@ -363,12 +436,20 @@ class StridedRolling(ABC):
         # would be nice if we could optimize this double for loop with something
         # more vectorized
         #
-        # As for now we use a map to apply the function (as this evaluates its
+        # As for now we use a (lazy) map to apply the function (as this evaluates its
         # expression only once, whereas a list comprehension evaluates its expression
         # every time).
         # See more why: https://stackoverflow.com/a/59838723
-        out: np.array
-        if func.vectorized:
+        out: Optional[np.ndarray] = None
+        if self.fast_aggregates:
+            # Recognised aggregates (e.g., np.mean) are calculated directly on the
+            # segment bounds, i.e., in O(1) per window (see `rolling_aggregates`)
+            out = rolling_aggregate(func, self.series_containers, approximate=True)
+        if out is None and func.compiled:
+            # Compiled functions are applied via a compiled loop over the windows
+            out = compiled_kernel(func, self.series_containers)
+
+        if out is None and func.vectorized:
             # Vectorized function execution
 
             ## IMPL 1
@@ -399,72 +480,64 @@ class StridedRolling(ABC):
             #     )
             # )
 
-            views = []
-            for sc in self.series_containers:
-                if len(sc.start_indexes) == 0:
-                    # There are no feature windows  -> return empty array (see below)
-                    views = []
-                    break
-                elif len(sc.start_indexes) == 1:
-                    # There is only 1 feature window (bc no steps in the sliding window)
-                    views.append(
-                        np.expand_dims(
-                            sc.values[sc.start_indexes[0] : sc.end_indexes[0]],
-                            axis=0,
-                        )
-                    )
-                else:
-                    # There are >1 feature windows (bc >=1 steps in the sliding window)
-                    windows = sc.end_indexes - sc.start_indexes
-                    strides = sc.start_indexes[1:] - sc.start_indexes[:-1]
-                    assert np.all(windows == windows[0]), (
-                        "Vectorized functions require same number of samples in each "
-                        + "segmented window!"
-                    )
-                    assert np.all(
-                        strides == strides[0]
-                    ), "Vectorized functions require same number of samples as stride!"
-                    views.append(
-                        _sliding_strided_window_1d(
-                            sc.values[sc.start_indexes[0] :],
-                            windows[0],
-                            strides[0],
-                            len(self.index),
-                        )
+            if any(len(sc.start_indexes) == 0 for sc in self.series_containers):
+                # There are no feature windows  -> return empty array (see below)
+                views = []
+            elif func.ragged:
+                # Masked (padded) windows, which may have a varying nb. of samples
+                # Note: as these are copies, they are created per batch (see below)
+                views = [None] * len(self.series_containers)
+            else:
+                views = self._get_window_views()
+
+            def get_batch_views(batch: slice) -> List[np.ndarray]:
+                return [
+                    _ragged_window_1d(
+                        sc.values, sc.start_indexes[batch], sc.end_indexes[batch]
                     )
+                    if view is None
+                    else view[batch]
+                    for sc, view in zip(self.series_containers, views)
+                ]
 
             # Assign empty array as output when there is no view to apply the vectorized
             # function on (this is the case when there is at least for one series no
             # feature windows)
-            out = func(*views) if len(views) >= 1 else np.array([])
-
-            out_type = type(out)
-            out = np.asarray(out)
-            # When multiple outputs are returned (= tuple) they should be transposed
-            # when combining into an array
-            out = out.T if out_type is tuple else out
+            out = np.array([])
+            if len(views) >= 1:
+                # The vectorized function is applied on batches of (at most)
+                # `max_batch_windows` windows, which bounds the size of the temporary
+                # arrays that are created by the function
+                nb_windows = len(self.index)
+                batch_size = func.max_batch_windows or self.max_batch_windows
+                batch_size = nb_windows if batch_size is None else batch_size
+                # Note: each batch output is cast, so that the concatenated output is
+                # directly allocated in the output dtype
+                outs = [
+                    _cast_output(
+                        _apply_vectorized_func(
+                            func, get_batch_views(slice(idx, idx + batch_size))
+                        ),
+                        out_dtype,
+                    )
+                    for idx in range(0, nb_windows, batch_size)
+                ]
+                if len(outs) > 1 and all(o.ndim > 0 for o in outs):
+                    out = np.concatenate(outs, axis=0)
+                else:
+                    out = outs[0]
 
-        else:
+        elif out is None:
             # Sequential function execution (default)
-            out = np.array(
-                list(
-                    map(
-                        func,
-                        *[
-                            [
-                                sc.values[sc.start_indexes[idx] : sc.end_indexes[idx]]
-                                for idx in range(len(self.index))
-                            ]
-                            for sc in self.series_containers
-                        ],
-                    )
-                )
+            out = _apply_func_per_window(
+                func, self.series_containers, len(self.index), out_dtype
             )
 
         # Check if the function output is valid.
         # This assertion will be raised when e.g. np.max is applied vectorized without
         # specifying axis=1.
         assert out.ndim > 0, "Vectorized function returned only 1 (non-array) value!"
+        out = _cast_output(out, out_dtype)
 
         # Aggregate function output in a dictionary
         feat_out = {}
@@ -498,7 +571,55 @@ class StridedRolling(ABC):
             f"[{log_window}, {log_strides}] in [{elapsed} seconds]!"
         )
 
-        return pd.DataFrame(index=self.index, data=feat_out)
+        return feat_out
+
+    def _get_window_views(self) -> List[np.ndarray]:
+        """Return the (cached) sliding window views of the series containers.
+
+        The views (and the checks on their windows & strides) are constructed only
+        once, and are then reused by all the vectorized functions that are applied
+        on this segmentation.
+
+        """
+        if self._window_views is not None:
+            return self._window_views
+        views = []
+        for sc in self.series_containers:
+            if len(sc.start_indexes) == 1:
+                # There is only 1 feature window (bc no steps in the sliding window)
+                views.append(
+                    np.expand_dims(
+                        sc.values[sc.start_indexes[0] : sc.end_indexes[0]],
+                        axis=0,
+                    )
+                )
+            else:
+                # There are >1 feature windows (bc >=1 steps in the sliding window)
+                windows = sc.end_indexes - sc.start_indexes
+                strides = sc.start_indexes[1:] - sc.start_indexes[:-1]
+                assert np.all(windows == windows[0]), (
+                    "Vectorized functions require same number of samples in each "
+                    + "segmented window (or should be ragged, see FuncWrapper)!"
+                )
+                assert np.all(
+                    strides == strides[0]
+                ), "Vectorized functions require same number of samples as stride!"
+                views.append(
+                    _sliding_strided_window_1d(
+                        sc.values[sc.start_indexes[0] :],
+                        windows[0],
+                        strides[0],
+                        len(self.index),
+                    )
+                )
+        self._window_views = views
+        return views
+
+    def _get_output_dtype(self, func: FuncWrapper) -> Optional[np.dtype]:
+        """Return the dtype to which the (numeric) output of the function is cast."""
+        if func.output_dtype is not None:
+            return func.output_dtype
+        return self.output_dtype
 
     # --------------------------------- STATIC METHODS ---------------------------------
     @staticmethod
@@ -595,8 +716,18 @@ class TimeStridedRolling(StridedRolling):
     ) -> pd.Index:
         assert start_idxs.dtype.type == np.datetime64
         assert end_idxs.dtype.type == np.datetime64
-        start_idxs = pd.to_datetime(start_idxs, utc=True).tz_convert(self._tz_index)
-        end_idxs = pd.to_datetime(end_idxs, utc=True).tz_convert(self._tz_index)
+        # Note: constructing a DatetimeIndex is (a lot) faster than `pd.to_datetime`
+        # (the unit is set as an empty array may have a generic datetime64 dtype)
+        start_idxs = start_idxs.astype("datetime64[ns]", copy=False)
+        end_idxs = end_idxs.astype("datetime64[ns]", copy=False)
+        if self._tz_index is None:
+            start_idxs = pd.DatetimeIndex(start_idxs)
+            end_idxs = pd.DatetimeIndex(end_idxs)
+        else:
+            # The numpy datetimes are in UTC
+            start_idxs = pd.DatetimeIndex(start_idxs, tz="UTC")
+            start_idxs = start_idxs.tz_convert(self._tz_index)
+            end_idxs = pd.DatetimeIndex(end_idxs, tz="UTC").tz_convert(self._tz_index)
         return super()._get_output_index(start_idxs, end_idxs, name)
 
     # ------------------------------- Overridden methods -------------------------------
@@ -682,11 +813,12 @@ class TimeIndexSampleStridedRolling(SequenceStridedRolling):
         # we want to assure that the window-stride arguments are integers (samples)
         assert all(isinstance(p, int) for p in [self.window] + self.strides)
 
-    def apply_func(self, func: FuncWrapper) -> pd.DataFrame:
-        # Apply the function and stitch back the time-index
-        df = super().apply_func(func)
-        df.index = self._series_index[df.index]
-        return df
+    def _apply_funcs(
+        self, funcs: List[FuncWrapper]
+    ) -> Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]:
+        # Apply the functions and stitch back the time-index
+        index, feat_out = super()._apply_funcs(funcs)
+        return self._series_index[index], feat_out
 
     # ---------------------------- Overridden methods ------------------------------
     def _update_start_end_indices_to_stroll_type(self, series_list: List[pd.Series]):
@@ -741,3 +873,136 @@ def _sliding_strided_window_1d(
     return np.lib.stride_tricks.as_strided(
         data, shape=shape, strides=strides  # , writeable=False
     )
+
+
+def _ragged_window_1d(
+    data: np.ndarray, start_indexes: np.ndarray, end_indexes: np.ndarray
+) -> np.ma.MaskedArray:
+    """Padded sliding window for 1-dimensional data with varying window sizes.
+
+    Parameters
+    ----------
+    data: np.array
+        The 1-dimensional series to slide over.
+    start_indexes: np.array
+        The start index (position) of each window.
+    end_indexes: np.array
+        The (exclusive) end index (position) of each window.
+
+    Returns
+    -------
+    np.ma.MaskedArray
+        The windows with shape (nb. windows, max window size) in which the padded
+        values (i.e., beyond the end of each window) are masked.
+
+    """
+    assert data.ndim == 1, "data must be 1 dimensional"
+    window_sizes = end_indexes - start_indexes
+    # Note: a max window size of (at least) 1 avoids zero-sized window axes
+    offsets = np.arange(max(int(np.max(window_sizes)), 1))
+    mask = offsets >= window_sizes[:, None]
+    if not len(data):
+        return np.ma.MaskedArray(np.zeros(mask.shape, dtype=data.dtype), mask=mask)
+    idxs = np.minimum(start_indexes[:, None] + offsets, len(data) - 1)
+    return np.ma.MaskedArray(data[idxs], mask=mask)
+
+
+def _masked_to_nan(arr: np.ndarray) -> np.ndarray:
+    """Replace the masked values of a masked array with NaNs."""
+    if not isinstance(arr, np.ma.MaskedArray):
+        return arr
+    if not np.any(np.ma.getmaskarray(arr)):
+        return arr.data
+    if arr.dtype.kind not in "fc":
+        arr = arr.astype(np.float64)
+    return arr.filled(np.nan)
+
+
+def _apply_vectorized_func(func: FuncWrapper, views: List[np.ndarray]) -> np.ndarray:
+    """Apply the vectorized function on the views and return its output array."""
+    out = func(*views)
+    if func.ragged:
+        # Convert the masked output values (e.g., of empty windows) to NaNs
+        out = (
+            tuple(map(_masked_to_nan, out))
+            if isinstance(out, tuple)
+            else _masked_to_nan(out)
+        )
+
+    out_type = type(out)
+    out = np.asarray(out)
+    # When multiple outputs are returned (= tuple) they should be transposed
+    # when combining into an array
+    return out.T if out_type is tuple else out
+
+
+def _cast_output(out: np.ndarray, dtype: Optional[np.dtype]) -> np.ndarray:
+    """Cast the numeric (i.e., integer or float) output to the given dtype.
+
+    Raises a ValueError when a float output with non-finite values (i.e., NaN or inf)
+    is cast to an integer dtype, as these values cannot be represented.
+
+    """
+    if dtype is None or out.dtype.kind not in "iuf":
+        return out
+    if out.dtype.kind == "f" and dtype.kind in "iu" and not np.isfinite(out).all():
+        raise ValueError(
+            f"Cannot cast the non-finite (i.e., NaN or inf) float output to {dtype}"
+        )
+    return out.astype(dtype, copy=False)
+
+
+def _apply_func_per_window(
+    func: FuncWrapper,
+    series_containers: List,
+    nb_windows: int,
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    """Apply the function on each segmented window and return its output array.
+
+    The windows are sliced lazily (i.e., one at a time). When the output of the first
+    window is a float64 or complex128 (array), or a numeric output that is cast to
+    `dtype`, the outputs are written into a preallocated array. Otherwise the outputs
+    are collected in a list, as the output dtype (e.g., of integers or strings) might
+    change over the windows.
+
+    .. note::
+        When a later window output does not fit in the preallocated array (e.g., a
+        complex or None output after float outputs), the remaining outputs are
+        collected in a list as well, so that the output dtype is the same as the
+        dtype of ``np.array`` on all the window outputs.
+
+    """
+    if not nb_windows:
+        return np.array([])
+
+    def get_windows(sc) -> Iterator[Union[np.ndarray, pd.Series]]:
+        for start, end in zip(sc.start_indexes, sc.end_indexes):
+            yield sc.values[start:end]
+
+    windows = zip(*[get_windows(sc) for sc in series_containers])
+    outputs = starmap(func, windows)
+    first_out = next(outputs)
+    probe = np.asarray(first_out)
+    if (
+        dtype is not None
+        and probe.dtype.kind in "iuf"
+        and np.can_cast(probe.dtype, dtype, casting="same_kind")
+    ):
+        out_dtype = dtype
+    elif probe.dtype in [np.float64, np.complex128]:
+        out_dtype = probe.dtype
+    else:
+        return np.array([first_out, *outputs])
+    out = np.empty((nb_windows, *probe.shape), dtype=out_dtype)
+    out[0] = probe
+    for idx, window_out in enumerate(outputs, start=1):
+        window_out_arr = np.asarray(window_out)
+        if window_out_arr.shape != probe.shape or not np.can_cast(
+            window_out_arr.dtype, out_dtype, casting="same_kind"
+        ):
+            # The output does not fit in the preallocated array -> fall back to
+            # collecting the (remaining) outputs in a list
+            return np.array([*out[:idx], window_out, *outputs])
+        out[idx] = window_out_arr
+    return out
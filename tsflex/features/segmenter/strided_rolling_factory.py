@@ -9,6 +9,8 @@ Factory class for creating the proper StridedRolling instances.
 
 __author__ = "Jonas Van Der Donckt"
 
+from typing import Type
+
 from ...utils.attribute_parsing import AttributeParser, DataType
 from .strided_rolling import (
     SequenceStridedRolling,
@@ -26,6 +28,48 @@ class StridedRollingFactory:
         DataType.SEQUENCE: SequenceStridedRolling,
     }
 
+    @staticmethod
+    def get_segmenter_class(data, window, strides) -> Type[StridedRolling]:
+        """Get the appropriate StridedRolling class for the passed data.
+
+        The returned class will be determined by the data its index type and the
+        type of the window & stride(s).
+
+        Parameters
+        ----------
+        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]]
+            The data to segment, only the dtype of its index is used.
+        window : Union[float, pd.TimeDelta]
+             The window size to use for the segmentation.
+        strides : Union[List[Union[float, pd.TimeDelta]], None]
+            The stride(s) to use for the segmentation.
+
+        Raises
+        ------
+        ValueError
+            When incompatible data & window-stride data types are passed (e.g. time
+            window-stride args on sequence data-index).
+
+        Returns
+        -------
+        Type[StridedRolling]
+            The StridedRolling class.
+
+        """
+        data_dtype = AttributeParser.determine_type(data)
+        if strides is None:
+            args_dtype = AttributeParser.determine_type(window)
+        else:
+            args_dtype = AttributeParser.determine_type([window] + strides)
+
+        if window is None or data_dtype.value == args_dtype.value:
+            return StridedRollingFactory._datatype_to_stroll[data_dtype]
+        elif data_dtype == DataType.TIME and args_dtype == DataType.SEQUENCE:
+            # Note: this is very niche and thus requires advanced knowledge
+            return TimeIndexSampleStridedRolling
+        elif data_dtype == DataType.SEQUENCE and args_dtype == DataType.TIME:
+            raise ValueError("Cannot segment a sequence-series with a time window")
+
     @staticmethod
     def get_segmenter(data, window, strides, **kwargs) -> StridedRolling:
         """Get the appropriate StridedRolling instance for the passed data.
@@ -63,18 +107,5 @@ class StridedRollingFactory:
             The constructed StridedRolling instance.
 
         """
-        data_dtype = AttributeParser.determine_type(data)
-        if strides is None:
-            args_dtype = AttributeParser.determine_type(window)
-        else:
-            args_dtype = AttributeParser.determine_type([window] + strides)
-
-        if window is None or data_dtype.value == args_dtype.value:
-            return StridedRollingFactory._datatype_to_stroll[data_dtype](
-                data, window, strides, **kwargs
-            )
-        elif data_dtype == DataType.TIME and args_dtype == DataType.SEQUENCE:
-            # Note: this is very niche and thus requires advanced knowledge
-            return TimeIndexSampleStridedRolling(data, window, strides, **kwargs)
-        elif data_dtype == DataType.SEQUENCE and args_dtype == DataType.TIME:
-            raise ValueError("Cannot segment a sequence-series with a time window")
+        stroll_cls = StridedRollingFactory.get_segmenter_class(data, window, strides)
+        return stroll_cls(data, window, strides, **kwargs)
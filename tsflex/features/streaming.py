@@ -0,0 +1,388 @@
+"""StreamingFeatureCollection class for incremental feature calculation.
+
+Instead of re-calculating all the features on a (sliding) buffer of data, the
+`StreamingFeatureCollection` only calculates the features of the windows that are
+completed by the newly pushed data. This also allows to calculate the features
+on (Parquet) data that does not fit in memory, see
+`StreamingFeatureCollection.calculate_parquet`.
+
+.. note::
+    pyarrow is an optional dependency (`pip install tsflex[parquet]`), which is only
+    required for `StreamingFeatureCollection.calculate_parquet`.
+
+"""
+
+from __future__ import annotations
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ..utils.attribute_parsing import AttributeParser
+from ..utils.data import to_list, to_series_list
+from ..utils.time import parse_time_arg
+from .feature_collection import FeatureCollection
+from .function_wrapper import FuncWrapper
+from .segmenter import StridedRolling, StridedRollingFactory
+from .utils import _blocks_to_df, _merge_feature_outputs
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None
+
+
+class StreamingFeatureCollection:
+    """Calculate the features of a `FeatureCollection` on a stream of data.
+
+    Data is passed in (chronological) chunks via `push`, which returns the features
+    of all the windows that are completed by that chunk. Only the tail of the data
+    that is still required for the next windows is retained.
+
+    Parameters
+    ----------
+    feature_collection : FeatureCollection
+        The feature collection whose features will be calculated.
+    stride : Union[float, str, pd.Timedelta, List[Union[float, str, pd.Timedelta]]], optional
+        The stride size(s), by default None. If None, the stride of the
+        `FeatureDescriptor` objects will be used. See the `stride` argument of
+        `FeatureCollection.calculate` for more info.
+    window_idx : str, optional
+        The window's index position which will be used as index for the
+        feature_window aggregation. Must be either of: `["begin", "middle", "end"]`, by
+        default "end".
+    approve_sparsity : bool, optional
+        Bool indicating whether the user acknowledges that there may be sparsity
+        (i.e., irregularly sampled data), by default False.
+        If False and sparsity is observed, a warning is raised.
+
+    Notes
+    -----
+    * The windows are aligned on the (inner) start of the first pushed data, and a
+      window is completed when the data of all required series reaches its end.
+      Hence, concatenating the outputs of `push` results in the same features as
+      calling `FeatureCollection.calculate` (with `return_df=True`) on all the data.
+    * The features are calculated on the windows with the window and stride
+      arguments of the `FeatureDescriptor`s; passing segment indices,
+      `include_final_window` or sample-based windows on time-indexed data is not
+      supported.
+
+    """
+
+    def __init__(
+        self,
+        feature_collection: FeatureCollection,
+        stride: Optional[Union[float, str, pd.Timedelta, List, None]] = None,
+        window_idx: Optional[str] = "end",
+        approve_sparsity: Optional[bool] = False,
+    ):
+        self.feature_collection = feature_collection
+        if stride is not None:
+            stride = [
+                parse_time_arg(s) if isinstance(s, str) else s for s in to_list(stride)
+            ]
+        self.stride = stride
+        self.window_idx = window_idx
+        self.approve_sparsity = approve_sparsity
+
+        # The segmentations of the feature collection, i.e., a dict with as key the
+        # (series_key, window, strides) and as value the functions
+        self._segmentations: Dict[
+            Tuple[Tuple[str, ...], Union[float, pd.Timedelta], tuple], List[FuncWrapper]
+        ] = {}
+        for (series_key, win), fds in feature_collection._feature_desc_dict.items():
+            for fd in fds:
+                strides = self.stride if self.stride is not None else fd.stride
+                assert win is not None and strides is not None, (
+                    "Each feature descriptor must have a window and stride (or pass a "
+                    + "stride to the StreamingFeatureCollection)"
+                )
+                self._segmentations.setdefault(
+                    (series_key, win, tuple(strides)), []
+                ).append(fd.function)
+
+        self._required_series = feature_collection.get_required_series()
+        self.reset()
+
+    def reset(self):
+        """Reset the state, i.e., discard the buffered data and window alignment."""
+        self._buffers: Dict[str, pd.Series] = {}
+        # The start (alignment) of the windows, set when data for all series arrives
+        self._start = None
+        # The number of the next (not yet completed) segment for each stride of each
+        # segmentation
+        self._next_segments: Dict[tuple, List[int]] = {
+            k: [0] * len(k[2]) for k in self._segmentations
+        }
+
+    def _append_to_buffers(self, data):
+        for s in to_series_list(data):
+            name = str(s.name)
+            if name not in self._required_series or not len(s):
+                continue
+            if not s.index.is_monotonic_increasing:
+                raise ValueError(f"The index of series '{name}' is not sorted!")
+            buffer = self._buffers.get(name)
+            if buffer is not None and len(buffer):
+                if s.index[0] <= buffer.index[-1]:
+                    raise ValueError(
+                        f"The pushed data of series '{name}' must come after the "
+                        + "previously pushed data!"
+                    )
+                s = pd.concat([buffer, s])
+            self._buffers[name] = s
+
+    def _check_segmentation_types(self, series_list: List[pd.Series]):
+        """Check whether the window & stride types match the index type of the data.
+
+        Raises
+        ------
+        ValueError
+            When the window-stride data type of a segmentation differs from the data
+            type of the index (e.g., integer windows on time-indexed data).
+
+        """
+        data_dtype = AttributeParser.determine_type(series_list)
+        for series_key, window, strides in self._segmentations:
+            args_dtype = AttributeParser.determine_type([window, *strides])
+            if args_dtype != data_dtype:
+                raise ValueError(
+                    f"The window-stride data type ({args_dtype.name}) of {series_key} "
+                    + f"does not match the data type of the index ({data_dtype.name})"
+                )
+
+    def _get_np_segment_starts(self, stride, first_segment: int, nb_segments: int):
+        """Get the start indexes of the given range of segments for the stride."""
+        if isinstance(self._start, pd.Timestamp):
+            starts = pd.date_range(
+                self._start + first_segment * stride,
+                periods=max(nb_segments - first_segment, 0),
+                freq=stride,
+            )
+            # Note: this is the (UTC) datetime64 array
+            return starts.values
+        return self._start + np.arange(first_segment, nb_segments) * stride
+
+    def _pop_completed_starts(self, seg_key: tuple, end) -> np.ndarray:
+        """Get the starts of the (new) completed windows of the segmentation.
+
+        The next segment of each stride (of the segmentation) is updated accordingly.
+
+        """
+        _, window, strides = seg_key
+        start_list = []
+        for stride_idx, stride in enumerate(strides):
+            # Note: same nb. of segments as `StridedRolling` with include_final_window
+            # set to False
+            nb_segments = max((end - self._start - window) // stride + 1, 0)
+            first_segment = self._next_segments[seg_key][stride_idx]
+            start_list.append(
+                self._get_np_segment_starts(stride, first_segment, nb_segments)
+            )
+            self._next_segments[seg_key][stride_idx] = max(first_segment, nb_segments)
+        # note - np.unique also sorts the array
+        return np.unique(np.concatenate(start_list))
+
+    def push(
+        self, data: Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]]
+    ) -> pd.DataFrame:
+        """Push new data and calculate the features of the completed windows.
+
+        Parameters
+        ----------
+        data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]]
+            Dataframe or Series or list thereof, with the newly arrived data. The data
+            of each series must come after the previously pushed data of that series.
+
+        Returns
+        -------
+        pd.DataFrame
+            The features of the windows which are completed by the pushed data (an
+            outer merge of the features, as in `FeatureCollection.calculate`).
+
+        """
+        self._append_to_buffers(data)
+        if not all(name in self._buffers for name in self._required_series):
+            # Wait until there is data for all the required series
+            return pd.DataFrame()
+
+        series_list = [self._buffers[name] for name in self._required_series]
+        if self._start is None:
+            self._check_segmentation_types(series_list)
+            # Align the windows on the inner bound of the first data
+            self._start = max(s.index[0] for s in series_list)
+        end = min(s.index[-1] for s in series_list)
+
+        outputs = []
+        for seg_key, funcs in self._segmentations.items():
+            series_key, win, _ = seg_key
+            new_starts = self._pop_completed_starts(seg_key, end)
+            if not len(new_starts):
+                continue
+            for func_data_type in {f.input_type for f in funcs}:
+                stroll: StridedRolling = StridedRollingFactory.get_segmenter(
+                    data=[self._buffers[k] for k in series_key],
+                    window=win,
+                    strides=None,
+                    segment_start_idxs=new_starts,
+                    start_idx=self._start,
+                    end_idx=end,
+                    window_idx=self.window_idx,
+                    approve_sparsity=self.approve_sparsity,
+                    func_data_type=func_data_type,
+                )
+                outputs.append(
+                    stroll._apply_funcs(
+                        [f for f in funcs if f.input_type is func_data_type]
+                    )
+                )
+
+        self._trim_buffers()
+        if not len(outputs):
+            return pd.DataFrame()
+        return _blocks_to_df(*_merge_feature_outputs(outputs))
+
+    def _get_watermark(self):
+        """Return the smallest output index of the windows that are not completed.
+
+        Hence, the features of the (already) outputted windows with a smaller index
+        are final, i.e., no other window will be outputted at that index.
+
+        """
+        offset = {"begin": 0, "middle": 0.5, "end": 1}[self.window_idx]
+        return min(
+            self._start + next_segment * stride + window * offset
+            for (_, window, strides), next_segments in self._next_segments.items()
+            for stride, next_segment in zip(strides, next_segments)
+        )
+
+    def calculate_parquet(
+        self,
+        source: Union[str, Path, List[Union[str, Path]]],
+        destination: Union[str, Path],
+        index_column: Optional[str] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Calculate the features on a Parquet dataset that does not fit in memory.
+
+        The dataset is read in batches (of at most one row group) which are pushed
+        to the streaming feature collection, so that only the tail of the data that
+        is required for the next windows is kept in memory. The features are
+        written to the destination Parquet file as soon as they are final.
+
+        Parameters
+        ----------
+        source : Union[str, Path, List[Union[str, Path]]]
+            The Parquet file, the directory of a (partitioned) Parquet dataset, or a
+            list of Parquet files. The data must be sorted chronologically (over the
+            files). Only the index column and the required series (i.e., the columns
+            in `get_required_series()`) are read.
+        destination : Union[str, Path]
+            The file path of the output Parquet file with the features.
+        index_column : str, optional
+            The name of the column that holds the (time) index, by default None. If
+            None, the (single) index column of the pandas metadata of the dataset is
+            used.
+        batch_size : int, optional
+            The maximum number of rows of a batch, by default None. If None, pyarrow
+            its default batch size is used.
+
+        Notes
+        -----
+        * The streaming state is reset before (and after) the calculation.
+        * The output contains one row for each window index (as in
+          `FeatureCollection.calculate` with `return_df=True`), with the integer
+          features stored as float64 (as missing values might occur).
+
+        """
+        if pa is None:  # pragma: no cover
+            raise ImportError(
+                "pyarrow is required for calculate_parquet, install it via "
+                + "`pip install tsflex[parquet]`"
+            )
+        if isinstance(source, list):
+            source = [str(f) for f in source]
+        dataset = ds.dataset(source, format="parquet")
+        if index_column is None:
+            pandas_metadata = dataset.schema.pandas_metadata or {}
+            index_columns = [
+                c
+                for c in pandas_metadata.get("index_columns", [])
+                if isinstance(c, str)
+            ]
+            if len(index_columns) != 1:
+                raise ValueError(
+                    "The index_column must be passed when the dataset has no (single) "
+                    + "pandas index column"
+                )
+            index_column = index_columns[0]
+        columns = [index_column] + [
+            c for c in self._required_series if c in dataset.schema.names
+        ]
+
+        def to_float_ints(df: pd.DataFrame) -> pd.DataFrame:
+            int_cols = [c for c in df.columns if df[c].dtype.kind in "iu"]
+            return df.astype({c: np.float64 for c in int_cols})
+
+        def to_table(df: pd.DataFrame, schema=None) -> pa.Table:
+            df = df.reindex(columns=out_columns)
+            return pa.Table.from_pandas(df, schema=schema, preserve_index=True)
+
+        self.reset()
+        writer, out_columns = None, None
+        pending = pd.DataFrame()
+        try:
+            batch_kwargs = {} if batch_size is None else {"batch_size": batch_size}
+            for batch in dataset.to_batches(columns=columns, **batch_kwargs):
+                df = batch.to_pandas(ignore_metadata=True).set_index(index_column)
+                out = self.push(df)
+                if not len(out):
+                    continue
+                pending = pd.concat([pending, to_float_ints(out)])
+                if pending.index.has_duplicates:
+                    # Merge the outputs of different segmentations at the same index
+                    pending = pending.groupby(level=0, sort=False).first()
+                if not all(all(n) for n in self._next_segments.values()):
+                    # Wait until each segmentation has outputted (i.e., until all the
+                    # feature columns are known)
+                    continue
+                pending = pending.sort_index()
+                if writer is None:
+                    out_columns = sorted(pending.columns)
+                    writer = pq.ParquetWriter(
+                        str(destination), to_table(pending).schema
+                    )
+                is_final = pending.index < self._get_watermark()
+                if np.any(is_final):
+                    writer.write_table(to_table(pending[is_final], writer.schema))
+                    pending = pending[~is_final]
+            # Write the remaining features
+            pending = pending.sort_index()
+            if writer is None:
+                out_columns = sorted(pending.columns)
+                writer = pq.ParquetWriter(str(destination), to_table(pending).schema)
+            writer.write_table(to_table(pending, writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+            self.reset()
+
+    def _trim_buffers(self):
+        """Discard the buffered data that is not required for the next windows."""
+        next_start = min(
+            self._start + next_segment * stride
+            for (_, _, strides), next_segments in self._next_segments.items()
+            for stride, next_segment in zip(strides, next_segments)
+        )
+        for name, s in self._buffers.items():
+            self._buffers[name] = s.iloc[s.index.searchsorted(next_start, "left") :]
+
+    def __repr__(self) -> str:
+        """Representation string of a StreamingFeatureCollection."""
+        return f"{self.__class__.__name__}(\n{self.feature_collection})"
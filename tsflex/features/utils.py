@@ -2,11 +2,14 @@
 
 __author__ = "Jeroen Van Der Donckt, Jonas Van Der Donckt"
 
-from typing import Any, Callable, List, Optional, Tuple, Union
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from ..utils.data import flatten, load_npy_series, to_series_list
 from .feature import FuncWrapper
 
 
@@ -52,6 +55,61 @@ def _determine_bounds(bound_method, series_list: List[pd.Series]) -> Tuple[Any,
         raise ValueError(f"invalid bound method string passed {bound_method}")
 
 
+def _get_series_dict(
+    data: Union[
+        pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]], str, Path
+    ],
+    required_series: List[str],
+    bound_method: str,
+    input_dtype: Optional[Union[np.dtype, type, str]] = None,
+) -> Tuple[Dict[str, pd.Series], Any, Any]:
+    """Return the (sorted) required series, sliced on their bounds.
+
+    The numeric series are cast to the `input_dtype` (if not None). If `data` is a
+    path, the required series are loaded as memory-mapped series from the `.npy`
+    file(s).
+
+    Returns
+    -------
+    Tuple[Dict[str, pd.Series], Any, Any]
+        The series dict (with the series names as key), and the start and end
+        bound of the series.
+
+    """
+    # Convert the data to a series_dict
+    if isinstance(data, (str, Path)):
+        data = load_npy_series(data, series_names=required_series)
+
+    series_dict: Dict[str, pd.Series] = {}
+    for s in to_series_list(data):
+        if not s.index.is_monotonic_increasing:
+            warnings.warn(
+                f"The index of series '{s.name}' is not monotonic increasing. "
+                + "The series will be sorted by the index.",
+                RuntimeWarning,
+            )
+            s = s.sort_index(ascending=True, inplace=False, ignore_index=False)
+
+        # Assert the assumptions we make!
+        assert s.index.is_monotonic_increasing
+
+        if s.name in required_series:
+            if input_dtype is not None and s.dtype.kind in "iuf":
+                s = s.astype(input_dtype, copy=False)
+            series_dict[str(s.name)] = s
+
+    # Determine the bounds of the series dict items and slice on them
+    # TODO: is dit wel nodig `hier? want we doen dat ook in de strided rolling
+    start, end = _determine_bounds(bound_method, list(series_dict.values()))
+    series_dict = {
+        n: s.loc[
+            s.index.dtype.type(start) : s.index.dtype.type(end)
+        ]  # TODO: check memory efficiency of ths
+        for n, s, in series_dict.items()
+    }
+    return series_dict, start, end
+
+
 def _check_start_end_array(start_idxs: np.ndarray, end_idxs: np.ndarray):
     """Check if the start and end indices are valid.
 
@@ -73,6 +131,137 @@ def _check_start_end_array(start_idxs: np.ndarray, end_idxs: np.ndarray):
     ), "for all corresponding values: segment_start_idxs <= segment_end_idxs"
 
 
+def _get_fill_dtype(dtype: np.dtype) -> np.dtype:
+    """Return the dtype to which `dtype` is promoted to hold missing values."""
+    if dtype.kind in "iu":
+        return np.dtype(np.float64)
+    elif dtype.kind in "bOSUV":
+        return np.dtype(object)
+    return dtype
+
+
+def _get_fill_value(dtype: np.dtype) -> Any:
+    """Return the missing value representation for the given dtype."""
+    if dtype.kind in "mM":
+        return np.array("NaT", dtype=dtype)
+    return np.nan
+
+
+def _merge_feature_outputs(
+    outputs: List[Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]]
+) -> Tuple[pd.Index, List[Tuple[List[str], np.ndarray]]]:
+    """Merge the feature outputs into 2D column-blocks aligned on one index.
+
+    This is equivalent to an outer join (on the index) of the feature outputs, but
+    the alignment is performed once for each distinct output index (instead of for
+    each feature output) and the feature columns are written directly into a
+    preallocated (column-major) array for each output dtype.
+
+    Parameters
+    ----------
+    outputs: List[Tuple[pd.Index, Dict[str, Optional[np.ndarray]]]]
+        The feature outputs, each output consists of an index and the output arrays
+        (with the column-names as key). A value of None denotes an empty output.
+
+    Returns
+    -------
+    Tuple[pd.Index, List[Tuple[List[str], np.ndarray]]]
+        Tuple of 1st the (outer joined) output index, and 2nd a list of
+        `(column_names, 2D array)` blocks; one block for each output dtype. The
+        column-names are sorted within and over the blocks.
+
+    """
+    # 1. Determine the distinct output indexes (outputs of the same segmentation share
+    #    the same index)
+    indexes: List[pd.Index] = []
+    columns: Dict[str, Tuple[int, np.ndarray]] = {}
+    for index, feat_out in outputs:
+        for index_idx, other in enumerate(indexes):
+            if index is other or index.equals(other):
+                break
+        else:
+            index_idx = len(indexes)
+            indexes.append(index)
+        for col, values in feat_out.items():
+            if values is None:
+                # No output values bc no feature windows
+                values = np.empty(0, dtype=object)
+            columns[col] = (index_idx, values)
+
+    # 2. Outer join the distinct indexes & compute the position of each index in the
+    #    joined index (None when the position is the same)
+    out_index = indexes[0] if len(indexes) else pd.Index([])
+    for index in indexes[1:]:
+        out_index = out_index.union(index)
+    positions = [
+        None
+        if index is out_index or out_index.equals(index)
+        else out_index.get_indexer(index)
+        for index in indexes
+    ]
+
+    # 3. Write the columns (in sorted order) into a preallocated block for each dtype
+    dtype_columns: Dict[np.dtype, List[str]] = {}
+    for col in sorted(columns):
+        index_idx, values = columns[col]
+        dtype = values.dtype
+        if positions[index_idx] is not None:
+            dtype = _get_fill_dtype(dtype)
+        dtype_columns.setdefault(dtype, []).append(col)
+
+    blocks: List[Tuple[List[str], np.ndarray]] = []
+    for dtype, cols in dtype_columns.items():
+        # Column-major order, as we write the values column by column
+        block = np.empty((len(out_index), len(cols)), dtype=dtype, order="F")
+        for col_idx, col in enumerate(cols):
+            index_idx, values = columns[col]
+            if positions[index_idx] is None:
+                block[:, col_idx] = values
+            else:
+                block[:, col_idx] = _get_fill_value(dtype)
+                block[positions[index_idx], col_idx] = values
+        blocks.append((cols, block))
+    return out_index, blocks
+
+
+def _blocks_to_df(
+    out_index: pd.Index, blocks: List[Tuple[List[str], np.ndarray]]
+) -> pd.DataFrame:
+    """Create a DataFrame from the merged output blocks (without copying them)."""
+    dfs = [
+        pd.DataFrame(block, index=out_index, columns=cols, copy=False)
+        for cols, block in blocks
+    ]
+    if len(dfs) == 0:
+        return pd.DataFrame(index=out_index)
+    elif len(dfs) == 1:
+        return dfs[0]
+    # Multiple output dtypes -> concatenate the (aligned) blocks
+    df = pd.concat(dfs, axis=1, copy=False)
+    return df.reindex(sorted(df.columns), axis=1)
+
+
+def _blocks_to_np(
+    out_index: pd.Index, blocks: List[Tuple[List[str], np.ndarray]]
+) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """Convert the merged output blocks into a single array."""
+    if len(blocks) == 0:
+        return out_index.values, [], np.empty((len(out_index), 0))
+    elif len(blocks) == 1:
+        cols, values = blocks[0]
+        return out_index.values, cols, values
+    columns = sorted(flatten(cols for cols, _ in blocks))
+    try:
+        dtype = np.result_type(*[block.dtype for _, block in blocks])
+    except TypeError:  # e.g., datetime and numeric outputs
+        dtype = np.dtype(object)
+    values = np.empty((len(out_index), len(columns)), dtype=dtype, order="F")
+    col_positions = {col: idx for idx, col in enumerate(columns)}
+    for cols, block in blocks:
+        values[:, [col_positions[c] for c in cols]] = block
+    return out_index.values, columns, values
+
+
 def _get_name(func: Callable) -> str:
     """Get the name of the function.
 
@@ -121,6 +310,10 @@ def _get_funcwrapper_func_and_kwargs(func: FuncWrapper) -> Tuple[Callable, dict]
     func_wrapper_kwargs["output_names"] = func.output_names
     func_wrapper_kwargs["input_type"] = func.input_type
     func_wrapper_kwargs["vectorized"] = func.vectorized
+    func_wrapper_kwargs["ragged"] = func.ragged
+    func_wrapper_kwargs["max_batch_windows"] = func.max_batch_windows
+    func_wrapper_kwargs["compiled"] = func.compiled
+    func_wrapper_kwargs["output_dtype"] = func.output_dtype
     func_wrapper_kwargs.update(func.kwargs)
 
     return function, func_wrapper_kwargs
@@ -159,6 +352,8 @@ def _make_single_func_robust(
     if isinstance(func, FuncWrapper):
         # Extract the function and keyword arguments from the function wrapper
         func, func_wrapper_kwargs = _get_funcwrapper_func_and_kwargs(func)
+        # The robust wrapper is a Python function, which can not be compiled
+        func_wrapper_kwargs["compiled"] = False
 
     output_names = func_wrapper_kwargs.get("output_names")
 
@@ -7,6 +7,8 @@
 __author__ = "Jonas Van Der Donckt, Emiel Deprost, Jeroen Van Der Donckt"
 
 from .. import __pdoc__
+from ..utils.worker_pool import WorkerPool
+from .cache import ProcessingCache
 from .logger import get_processor_logs
 from .series_pipeline import SeriesPipeline
 from .series_processor import SeriesProcessor, dataframe_func
@@ -18,4 +20,6 @@ __all__ = [
     "SeriesProcessor",
     "SeriesPipeline",
     "get_processor_logs",
+    "ProcessingCache",
+    "WorkerPool",
 ]
@@ -0,0 +1,214 @@
+"""ProcessingCache class for reusing the outputs of (expensive) processing steps."""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+import hashlib
+import os
+import pickle
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import dill
+import numpy as np
+import pandas as pd
+
+from .series_processor import SeriesProcessor
+
+# The file extension of the cached outputs
+_CACHE_EXTENSION = ".pkl"
+
+
+def _hash_array(hasher, arr: np.ndarray):
+    """Update the hasher with the (raw) buffer of the array."""
+    arr = np.asarray(arr)
+    if arr.dtype.hasobject:
+        # Hash the (object) values element-wise
+        arr = pd.util.hash_array(arr.ravel())
+    hasher.update(np.ascontiguousarray(arr).view(np.uint8))
+
+
+class ProcessingCache:
+    """An on-disk cache of the outputs of `SeriesProcessor` objects.
+
+    The output of a processor is stored under a fingerprint of its input, i.e., the
+    (raw buffers of the) index and values of the required series, the (dill
+    serialized) function and the keyword arguments of the processor. When the same
+    processor is applied again on the same series, the stored output is loaded
+    instead of being recomputed.
+
+    Parameters
+    ----------
+    cache_dir : Union[str, Path]
+        The directory in which the outputs are stored; it is created if it does not
+        exist.
+    max_size : int, optional
+        The maximum size (in bytes) of the cache, by default None. If the size of the
+        stored outputs exceeds `max_size`, the least recently used outputs are
+        removed. If None, the cache size is not bounded.
+
+    Notes
+    -----
+    * Functions that are defined in a (installed) module are serialized by reference,
+      i.e., changing the code of such a function does not invalidate the cache. Use
+      `clear` in that case.
+    * The cache can be shared by multiple processes, as the outputs are written
+      atomically.
+    * Outputs that can not be loaded (e.g., truncated or corrupt files, or files
+      that are written by another pandas version) are removed and recomputed.
+
+    Examples
+    --------
+    ```python
+    cache = ProcessingCache("processing_cache", max_size=10 * 2**30)
+    df_processed = series_pipeline.process(data, return_df=True, cache=cache)
+    ```
+
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size: Optional[int] = None):
+        assert max_size is None or max_size > 0, "max_size must be > 0"
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_key(
+        self, processor: SeriesProcessor, series_dict: Dict[str, pd.Series]
+    ) -> str:
+        """Return the fingerprint of the processor on the series.
+
+        Parameters
+        ----------
+        processor : SeriesProcessor
+            The processor.
+        series_dict : Dict[str, pd.Series]
+            The series dict, which contains (at least) the required series of the
+            processor.
+
+        Returns
+        -------
+        str
+            The (hex) fingerprint.
+
+        """
+        hasher = hashlib.blake2b(digest_size=20)
+        hasher.update(
+            dill.dumps(
+                (
+                    processor.function,
+                    processor.series_names,
+                    processor.get_output_series(),
+                    sorted(processor.kwargs.items()),
+                ),
+                recurse=True,
+            )
+        )
+        for name in sorted(processor.get_required_series()):
+            series = series_dict[name]
+            hasher.update(
+                str(
+                    (name, str(series.dtype), str(series.index.dtype), len(series))
+                ).encode()
+            )
+            _hash_array(hasher, series.index.values)
+            _hash_array(hasher, series.values)
+        return hasher.hexdigest()
+
+    def _get_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{_CACHE_EXTENSION}"
+
+    def process(
+        self, processor: SeriesProcessor, series_dict: Dict[str, pd.Series]
+    ) -> Dict[str, pd.Series]:
+        """Return the (cached) output of the processor on the series dict.
+
+        Parameters
+        ----------
+        processor : SeriesProcessor
+            The processor.
+        series_dict : Dict[str, pd.Series]
+            The series dict on which the processor is applied.
+
+        Returns
+        -------
+        Dict[str, pd.Series]
+            The processed series dict, see `SeriesProcessor.__call__`.
+
+        """
+        if any(name not in series_dict for name in processor.get_required_series()):
+            # Let the processor raise the error
+            return processor(series_dict)
+
+        path = self._get_path(self.get_key(processor, series_dict))
+        try:
+            processed_dict = pd.read_pickle(path)
+            # Mark the output as recently used
+            os.utime(path)
+            return processed_dict
+        except FileNotFoundError:
+            pass
+        except (
+            EOFError,
+            pickle.UnpicklingError,
+            ValueError,
+            AttributeError,
+            ImportError,
+            TypeError,
+        ):
+            # A truncated or corrupt output (or one that is written by another
+            # pandas version) -> remove it and recompute the output
+            try:
+                path.unlink()
+            except FileNotFoundError:  # Removed by another process
+                pass
+
+        processed_dict = dict(processor(series_dict))
+        # Write to a temporary file first, so that the output is written atomically
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        pd.to_pickle(processed_dict, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+        return processed_dict
+
+    @property
+    def size(self) -> int:
+        """The size (in bytes) of the stored outputs."""
+        return sum(
+            p.stat().st_size for p in self.cache_dir.glob(f"*{_CACHE_EXTENSION}")
+        )
+
+    def _evict(self):
+        """Remove the least recently used outputs until the size is <= max_size."""
+        if self.max_size is None:
+            return
+        entries = []
+        for path in self.cache_dir.glob(f"*{_CACHE_EXTENSION}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(e[1] for e in entries)
+        for _, entry_size, path in sorted(entries, key=lambda e: e[0]):
+            if size <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:  # Removed by another process
+                pass
+            size -= entry_size
+
+    def clear(self):
+        """Remove all the stored outputs."""
+        for path in self.cache_dir.glob(f"*{_CACHE_EXTENSION}"):
+            try:
+                path.unlink()
+            except FileNotFoundError:  # Removed by another process
+                pass
+
+    def __repr__(self) -> str:
+        """Representation string of a ProcessingCache."""
+        return (
+            f"{self.__class__.__name__}(cache_dir={str(self.cache_dir)!r}, "
+            + f"max_size={self.max_size})"
+        )
@@ -3,14 +3,27 @@ from __future__ import annotations
 
 __author__ = "Jonas Van Der Donckt, Emiel Deprost, Jeroen Van Der Donckt"
 
+import os
+import weakref
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import dill
+import numpy as np
 import pandas as pd
+from multiprocess import Pool
 
-from ..utils.data import flatten, series_dict_to_df, to_series_list
+from ..utils.data import flatten, series_dict_to_df, to_list, to_series_list
 from ..utils.logging import add_logging_handler, delete_logging_handlers
+from ..utils.worker_pool import WorkerPool
+from .cache import ProcessingCache
 from .logger import logger
 from .series_processor import SeriesProcessor
 
@@ -19,16 +32,82 @@ class _ProcessingError(Exception):
     pass
 
 
+def _copy_series(series: pd.Series) -> pd.Series:
+    """Return a series with a copy of the values, which shares the (immutable) index."""
+    return pd.Series(series.array.copy(), index=series.index, name=series.name)
+
+
+class _IndexRegistry:
+    """Registry of the distinct index objects of the series in a pipeline.
+
+    Series whose index equals an index of the registry are given that (same) index
+    object, so that equal indexes are stored only once in memory.
+
+    The indexes are registered by their length, dtype and first & last value. Hence,
+    the (O(n)) comparison of the index values is only performed for indexes that
+    are very likely equal, i.e., that would otherwise be stored twice in memory.
+
+    """
+
+    def __init__(self):
+        # The (weak references to the) indexes, with as key their length, dtype and
+        # first & last value
+        self._indexes: Dict[tuple, List[weakref.ref]] = {}
+
+    @staticmethod
+    def _get_key(index: pd.Index) -> tuple:
+        if not len(index):
+            return (0, str(index.dtype))
+        return (len(index), str(index.dtype), index[0], index[-1])
+
+    def share(self, series: pd.Series) -> pd.Series:
+        """Return the series with a shared index object (if an equal one exists)."""
+        key = self._get_key(series.index)
+        refs = [r for r in self._indexes.get(key, []) if r() is not None]
+        self._indexes[key] = refs
+        if any(r() is series.index for r in refs):
+            return series
+        for r in refs:
+            index = r()
+            if index is not None and index.equals(series.index):
+                return pd.Series(series.array, index=index, name=series.name)
+        refs.append(weakref.ref(series.index))
+        return series
+
+
+def _call_processor(
+    processor: SeriesProcessor,
+    series_dict: Dict[str, pd.Series],
+    cache: Optional[ProcessingCache] = None,
+) -> Dict[str, pd.Series]:
+    if cache is not None:
+        return cache.process(processor, series_dict)
+    return processor(series_dict)
+
+
+def _submit(executor: Union[Executor, Pool], func, *args) -> Future:
+    """Submit the function to the executor (or process pool)."""
+    if isinstance(executor, Executor):
+        return executor.submit(func, *args)
+    future: Future = Future()
+    executor.apply_async(
+        func, args, callback=future.set_result, error_callback=future.set_exception
+    )
+    return future
+
+
 class SeriesPipeline:
-    """Pipeline for applying ``SeriesProcessor`` objects sequentially.
+    """Pipeline for applying ``SeriesProcessor`` objects.
 
     Parameters
     ----------
     processors : List[Union[SeriesProcessor, SeriesPipeline]], optional
         List of ``SeriesProcessor`` or ``SeriesPipeline`` instances that will be applied
-        sequentially to the internal series dict, by default None.
-        **The processing steps will be executed in the same order as passed in this
-        list.**
+        to the internal series dict, by default None.
+        **The processing steps are applied as if they are executed in the same order
+        as passed in this list.** Steps that are independent of each other (i.e.,
+        that do not read or write each other's series) can be executed concurrently,
+        see the ``n_jobs`` argument of ``process``.
 
     """
 
@@ -113,6 +192,223 @@ class SeriesPipeline:
                 + f"not {type(processor)}"
             )
 
+    def _get_step_dependencies(self, series_names: Set[str]) -> List[Set[int]]:
+        """Return for each processing step the preceding steps on which it depends.
+
+        A step depends on a preceding step when it reads a series that is written by
+        that step (or vice versa), or when both write the same series. The outputs of
+        a step without (declared) `output_names` are its input series and new series, i.e.,
+        series that are not in `series_names` (the names of the data).
+
+        """
+        reads = [set(step.get_required_series()) for step in self.processing_steps]
+        writes = [
+            reads[idx] if step.get_output_series() is None
+            # An in-place processor (also) writes its input series
+            else set(step.output_names).union(reads[idx] if step.inplace else [])
+            for idx, step in enumerate(self.processing_steps)
+        ]
+        undeclared = [
+            step.get_output_series() is None for step in self.processing_steps
+        ]
+        dependencies: List[Set[int]] = []
+        for j in range(len(self.processing_steps)):
+            # The new series that are used by step j
+            new_j = reads[j].union(writes[j]).difference(series_names)
+            dependencies.append(
+                {
+                    i
+                    for i in range(j)
+                    if writes[i].intersection(reads[j])
+                    or reads[i].intersection(writes[j])
+                    or writes[i].intersection(writes[j])
+                    or (undeclared[i] and new_j)
+                    or (
+                        undeclared[j]
+                        and reads[i].union(writes[i]).difference(series_names)
+                    )
+                }
+            )
+        return dependencies
+
+    def _prune_steps(
+        self, outputs: List[str], series_names: Set[str]
+    ) -> Tuple[List[int], Set[str]]:
+        """Return the processing steps (and series) that are required for the outputs.
+
+        The steps are traversed backwards from the outputs; a step is required when it
+        (possibly) writes a required series, the series it reads then become required.
+        A step without ``output_names`` (possibly) writes its input series and new
+        series, i.e., series that are not in ``series_names`` (the names of the data)
+        and that are not yet written by a later step (with ``output_names``).
+
+        Returns
+        -------
+        Tuple[List[int], Set[str]]
+            The (sorted) indices of the required steps and the required series names.
+
+        """
+        required = set(outputs)
+        # The required new series whose (last) writer is not yet determined
+        unresolved = required.difference(series_names)
+        step_idxs = []
+        for idx in reversed(range(len(self.processing_steps))):
+            step = self.processing_steps[idx]
+            reads = set(step.get_required_series())
+            if step.get_output_series() is None:
+                if not (reads.intersection(required) or len(unresolved)):
+                    continue
+            elif required.intersection(step.get_output_series()) or (
+                step.inplace and reads.intersection(required)
+            ):
+                # The series that are written (and not read) are resolved
+                unresolved.difference_update(
+                    set(step.get_output_series()).difference(reads)
+                )
+            else:
+                continue
+            step_idxs.append(idx)
+            required.update(reads)
+            unresolved.update(reads.difference(series_names))
+        return step_idxs[::-1], required
+
+    def get_required_steps(
+        self, outputs: List[str], series_names: Optional[List[str]] = None
+    ) -> List[SeriesProcessor]:
+        """Return the processing steps that are needed to compute the outputs.
+
+        Parameters
+        ----------
+        outputs : List[str]
+            The names of the series that should be computed.
+        series_names : List[str], optional
+            The names of the series in the data, by default None. If None, the required
+            series of this pipeline are used (i.e., ``get_required_series``).
+            A processor without ``output_names`` is assumed to (possibly) output any
+            series that is not in ``series_names``.
+
+        Returns
+        -------
+        List[SeriesProcessor]
+            The required processing steps, in the order of this pipeline.
+
+        """
+        if series_names is None:
+            series_names = self.get_required_series()
+        step_idxs, _ = self._prune_steps(to_list(outputs), set(series_names))
+        return [self.processing_steps[idx] for idx in step_idxs]
+
+    @staticmethod
+    def _prepare_inplace(
+        processor: SeriesProcessor,
+        series_dict: Dict[str, pd.Series],
+        data_values: List[np.ndarray],
+    ):
+        """Make sure that the input series of the in-place processor are writable.
+
+        The required series that (may) share their buffer with the passed data (i.e.,
+        with one of the `data_values`), that share their buffer with another series
+        of the `series_dict` (e.g., a view of that series), or that are read-only are
+        replaced (in the `series_dict`) by a copy. All other series are already owned
+        by the pipeline.
+
+        """
+        for name in processor.get_required_series():
+            series = series_dict.get(name)
+            if series is None:
+                continue  # The processor will raise a KeyError
+            values = series.values
+            if (
+                not isinstance(values, np.ndarray)
+                or not values.flags.writeable
+                or any(np.may_share_memory(values, v) for v in data_values)
+                or any(
+                    other_name != name
+                    and isinstance(other.values, np.ndarray)
+                    and np.shares_memory(values, other.values)
+                    for other_name, other in series_dict.items()
+                )
+            ):
+                series_dict[name] = _copy_series(series)
+
+    def _process_parallel(
+        self,
+        series_dict: Dict[str, pd.Series],
+        executor: Union[Executor, Pool],
+        cache: Optional[ProcessingCache] = None,
+        data_values: Optional[List[np.ndarray]] = None,
+        index_registry: Optional[_IndexRegistry] = None,
+    ) -> Set[str]:
+        """Execute the processing steps concurrently, respecting their dependencies.
+
+        The `series_dict` is updated in place (with the same key order as a sequential
+        execution) and the output series names are returned. See `_prepare_inplace`
+        for the `data_values` and `_IndexRegistry` for the `index_registry`.
+
+        """
+        dependencies = self._get_step_dependencies(set(series_dict.keys()))
+        # The (step, output position) of the last write of each series (original
+        # series have step -1), used to order the keys and to discard stale writes
+        last_write: Dict[Any, Tuple[int, int]] = {
+            k: (-1, pos) for pos, k in enumerate(series_dict.keys())
+        }
+        first_write: Dict[Any, Tuple[int, int]] = dict(last_write)
+        output_keys = set()
+
+        remaining = dict(enumerate(dependencies))
+        done: Set[int] = set()
+        running: Dict[Future, int] = {}
+        try:
+            while len(remaining) or len(running):
+                for idx in [j for j, deps in remaining.items() if deps <= done]:
+                    del remaining[idx]
+                    step = self.processing_steps[idx]
+                    if step.inplace:
+                        self._prepare_inplace(step, series_dict, data_values or [])
+                    # Only the required series are passed to the processor
+                    required_dict = {
+                        k: series_dict[k]
+                        for k in step.get_required_series()
+                        if k in series_dict
+                    }
+                    future = _submit(
+                        executor, _call_processor, step, required_dict, cache
+                    )
+                    running[future] = idx
+                finished, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    idx = running.pop(future)
+                    try:
+                        processed_dict = future.result()
+                    except Exception as e:
+                        raise _ProcessingError(
+                            "Error while processing function {}:\n {}".format(
+                                self.processing_steps[idx].name, str(e)
+                            )
+                        ) from e
+                    for pos, key in enumerate(processed_dict.keys()):
+                        output_keys.add(key)
+                        first_write.setdefault(key, (idx, pos))
+                        # A series is only replaced by the output of a later step
+                        if last_write.get(key, (-2, 0)) < (idx, pos):
+                            last_write[key] = (idx, pos)
+                            series_dict[key] = processed_dict[key]
+                            if index_registry is not None:
+                                series_dict[key] = index_registry.share(
+                                    series_dict[key]
+                                )
+                    done.add(idx)
+        finally:
+            for future in running:
+                future.cancel()
+
+        # Order the series as in a sequential execution
+        ordered_keys = sorted(series_dict.keys(), key=lambda k: first_write[k])
+        ordered_dict = {k: series_dict[k] for k in ordered_keys}
+        series_dict.clear()
+        series_dict.update(ordered_dict)
+        return output_keys
+
     def process(
         self,
         data: Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]],
@@ -121,12 +417,23 @@ class SeriesPipeline:
         drop_keys: Optional[List[str]] = None,
         copy: Optional[bool] = False,
         logging_file_path: Optional[Union[str, Path]] = None,
+        n_jobs: Optional[int] = 1,
+        executor: Optional[Union[str, WorkerPool, Executor]] = "threads",
+        outputs: Optional[List[str]] = None,
+        cache: Optional[ProcessingCache] = None,
     ) -> Union[List[pd.Series], pd.DataFrame]:
-        """Execute all ``SeriesProcessor`` objects in pipeline sequentially.
+        """Execute all ``SeriesProcessor`` objects in the pipeline.
 
         Apply all the processing steps on passed Series list or DataFrame and return the
         preprocessed Series list or DataFrame.
 
+        The processing steps form a dependency graph (i.e., a DAG), in which a step
+        depends on the earlier steps that write a series which it reads, or that read
+        or write a series which it writes. With ``n_jobs=1`` the steps are executed
+        sequentially, in the order of the pipeline. Otherwise, each step is executed
+        as soon as the steps on which it depends are finished. The output is in both
+        cases the same as the one of the sequential execution.
+
         Parameters
         ----------
         data : Union[pd.Series, pd.DataFrame, List[Union[pd.Series, pd.DataFrame]]]
@@ -148,12 +455,46 @@ class SeriesPipeline:
         drop_keys : List[str], optional
             Which keys should be dropped when returning the output, by default None.
         copy : bool, optional
-            Whether the series in ``data`` should be copied, by default False.
+            Whether the series in ``data`` should be copied, by default False. Only
+            the values are copied, the (immutable) index objects are shared. \n
+            Note that, even if False, the series that are modified by an in-place
+            processor (see the ``inplace`` option of ``SeriesProcessor``) are copied
+            (once) before they are modified. Hence, the passed data is never modified.
         logging_file_path : Union[str, Path], optional
             The file path where the logged messages are stored, by default None.
             If ``None``, then no logging ``FileHandler`` will be used and the logging
             messages are only pushed to stdout. Otherwise, a logging ``FileHandler`` will
             write the logged messages to the given file path.
+        n_jobs : int, optional
+            The number of workers that execute the processing steps, by default 1.
+            If ``None``, then the number returned by ``os.cpu_count()`` is used. \n
+            If > 1, the processing steps that are independent of each other (i.e.,
+            that do not read or write each other's series) are executed concurrently.
+            The dependencies are derived from the required series (and the
+            ``output_names`` processor option) of each ``SeriesProcessor``, hence,
+            declaring the outputs of processors that create new series avoids false
+            dependencies.
+        executor : Union[str, WorkerPool, Executor], optional
+            The backend that executes the processing steps (when ``n_jobs`` > 1),
+            by default "threads". Must be either of: \n
+            * ``"threads"``: a thread pool with ``n_jobs`` threads, the series are
+              shared in-process (nothing is serialized).
+            * ``"processes"``: a process pool with ``n_jobs`` processes, the required
+              series (and the processor) are serialized for each step.
+            * A (persistent) ``WorkerPool`` or a custom ``concurrent.futures.Executor``
+              whose workers are used; ``n_jobs`` is then ignored.
+        outputs : List[str], optional
+            The names of the series that should be returned, by default None. If not
+            None, only the processing steps that are needed to compute these series
+            are executed (see ``get_required_steps``) and only these series are
+            returned (``return_all_series`` is then ignored). \n
+            Use e.g., ``outputs=fc.get_required_series()`` to only compute the series
+            that are required by a ``FeatureCollection`` ``fc``.
+        cache : ProcessingCache, optional
+            The (on-disk) cache of the processing step outputs, by default None. If
+            not None, the output of a processing step is loaded from the cache when
+            the step was already applied on the same input series (see
+            ``ProcessingCache``).
 
         Returns
         -------
@@ -181,8 +522,40 @@ class SeriesPipeline:
         ------
         _ProcessingError
             Error raised when a processing step fails.
+        KeyError
+            Raised when a series of ``outputs`` is not in the processed series.
 
         """
+        if outputs is not None:
+            # Only execute the steps (and pass the series) that are required for the
+            # outputs
+            series_list = to_series_list(data)
+            step_idxs, required_series = self._prune_steps(
+                to_list(outputs), set(str(s.name) for s in series_list)
+            )
+            pipeline = SeriesPipeline([self.processing_steps[i] for i in step_idxs])
+            processed = pipeline.process(
+                [s for s in series_list if str(s.name) in required_series],
+                return_all_series=True,
+                copy=copy,
+                logging_file_path=logging_file_path,
+                n_jobs=n_jobs,
+                executor=executor,
+                cache=cache,
+            )
+            series_dict = {str(s.name): s for s in processed}
+            missing = set(to_list(outputs)).difference(series_dict.keys())
+            if len(missing):
+                raise KeyError(f"The outputs {sorted(missing)} are not processed")
+            series_dict = {
+                key: series_dict[key]
+                for key in to_list(outputs)
+                if drop_keys is None or key not in drop_keys
+            }
+            if return_df:
+                return series_dict_to_df(series_dict)
+            return list(series_dict.values())
+
         # Delete other logging handlers
         delete_logging_handlers(logger)
         # Add logging handler (if path provided)
@@ -198,36 +571,86 @@ class SeriesPipeline:
             # TODO: also check monotonic increasing?
 
             if s.name in self.get_required_series():
-                series_dict[str(s.name)] = s.copy() if copy else s
+                series_dict[str(s.name)] = _copy_series(s) if copy else s
             elif return_all_series:
                 # If all the series have to be returned
-                series_dict[str(s.name)] = s.copy() if copy else s
+                series_dict[str(s.name)] = _copy_series(s) if copy else s
+
+        if isinstance(executor, str) and executor not in ["threads", "processes"]:
+            raise ValueError(
+                f"Invalid executor '{executor}', must be either 'threads' or "
+                + "'processes' (or a WorkerPool / concurrent.futures.Executor)"
+            )
+        if n_jobs is None:
+            n_jobs = os.cpu_count()
+        if os.name == "nt" and executor == "processes":
+            n_jobs = 1  # On Windows no multiprocessing is supported
+        n_jobs = min(n_jobs, len(self.processing_steps))
+
+        # Equal indexes are shared by the (output) series
+        index_registry = _IndexRegistry()
+        series_dict = {k: index_registry.share(s) for k, s in series_dict.items()}
+        # The buffers of the passed data, which are copied before an in-place processor
+        # is applied on them (when not copied yet)
+        data_values = [] if copy else [s.values for s in series_dict.values()]
 
         output_keys = set()  # Maintain set of output series
-        for processor in self.processing_steps:
+        if isinstance(executor, (WorkerPool, Executor)) or n_jobs > 1:
+            pool = None
             try:
-                processed_dict = processor(series_dict)
-                output_keys.update(processed_dict.keys())
-                series_dict.update(processed_dict)
-            except Exception as e:
+                if isinstance(executor, WorkerPool):
+                    pool = executor.pool
+                elif isinstance(executor, Executor):
+                    pool = executor
+                elif executor == "threads":
+                    pool = ThreadPoolExecutor(max_workers=n_jobs)
+                else:
+                    pool = Pool(processes=n_jobs)
+                output_keys = self._process_parallel(
+                    series_dict, pool, cache, data_values, index_registry
+                )
+            finally:
                 # Close the file handler (this avoids PermissionError: [WinError 32])
                 if logging_file_path:
                     f_handler.close()
                     logger.removeHandler(f_handler)
-                raise _ProcessingError(
-                    "Error while processing function {}:\n {}".format(
-                        processor.name, str(e)
+                if executor == "threads" and pool is not None:
+                    pool.shutdown(wait=True)
+                elif executor == "processes" and pool is not None:
+                    # All the steps are finished (or an error occurred)
+                    pool.terminate()
+                    pool.join()
+        else:
+            for processor in self.processing_steps:
+                try:
+                    if processor.inplace:
+                        self._prepare_inplace(processor, series_dict, data_values)
+                    processed_dict = _call_processor(processor, series_dict, cache)
+                    output_keys.update(processed_dict.keys())
+                    series_dict.update(
+                        {k: index_registry.share(v) for k, v in processed_dict.items()}
                     )
-                ) from e
-
-        # Close the file handler (this avoids PermissionError: [WinError 32])
-        if logging_file_path:
-            f_handler.close()
-            logger.removeHandler(f_handler)
+                except Exception as e:
+                    # Close the file handler (this avoids PermissionError: [WinError 32])
+                    if logging_file_path:
+                        f_handler.close()
+                        logger.removeHandler(f_handler)
+                    raise _ProcessingError(
+                        "Error while processing function {}:\n {}".format(
+                            processor.name, str(e)
+                        )
+                    ) from e
+
+            # Close the file handler (this avoids PermissionError: [WinError 32])
+            if logging_file_path:
+                f_handler.close()
+                logger.removeHandler(f_handler)
 
         if not return_all_series:
-            # Return just the output series
-            output_dict = {key: series_dict[str(key)] for key in output_keys}
+            # Return just the output series (in the order of a sequential execution)
+            output_dict = {
+                key: series_dict[key] for key in series_dict if key in output_keys
+            }
             series_dict = output_dict
 
         if drop_keys is not None:
@@ -2,19 +2,31 @@
 
 __author__ = "Jonas Van Der Donckt, Emiel Deprost, Jeroen Van Der Donckt"
 
+import os
 import time
-from typing import Callable, Dict, List, Tuple, Union
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from multiprocess import Pool
 
 from .. import __pdoc__
 from ..utils.classes import FrozenClass
 from ..utils.data import flatten, series_dict_to_df, to_list, to_tuple
+from ..utils.worker_pool import WorkerPool
 from .logger import logger
 
 __pdoc__["SeriesProcessor.__call__"] = True
 
+# The (default) options of a SeriesProcessor, see its `processor_options` argument
+_DEFAULT_PROCESSOR_OPTIONS: Dict[str, Any] = {
+    "output_names": None,
+    "inplace": False,
+    "n_jobs": 1,
+    "executor": "threads",
+}
+
 
 def dataframe_func(func: Callable):
     """Decorate function to use a DataFrame instead of multiple series (as argument).
@@ -88,6 +100,40 @@ class SeriesProcessor(FrozenClass):
             * all a `str`
             * or, all a `tuple` _with same length_. \n
 
+    processor_options : Dict[str, Any], optional
+        The options of the processor itself, by default None. These options are not
+        passed to the `function` (as opposed to the `kwargs`). The supported options
+        are: \n
+        * `"output_names"`: Union[str, List[str]], the names of the series that are
+          output by the processor, by default None. If None, the processor is assumed
+          to either replace its input series or to output new series (i.e., series
+          that are not in the data). Declaring the outputs allows a `SeriesPipeline`
+          to determine which processors are independent of each other (and can thus
+          be executed in parallel). A processor raises an error when it outputs a
+          series that is not declared.
+        * `"inplace"`: bool, whether the function (may) modify the values of its
+          input series in place, by default False. A `SeriesPipeline` passes series
+          with a writable buffer that is owned by the pipeline to such a processor,
+          i.e., series that share their buffer with the data that is passed to
+          `SeriesPipeline.process` or with another series of the pipeline (or that
+          are read-only) are copied (once) before the processor is applied. This
+          avoids allocating a new output array in each processing step. Note that
+          when the processor is called directly (i.e., not via a `SeriesPipeline`),
+          the passed series might thus be modified.
+        * `"n_jobs"`: int, the number of workers that apply the function on the
+          (items of the) `series_names`, by default 1. If `None`, then the number
+          returned by `os.cpu_count()` is used. If > 1, the function calls (one per
+          item of `series_names`) are executed concurrently; their outputs are
+          merged in the order of `series_names`.
+        * `"executor"`: Union[str, WorkerPool, Executor], the backend of the
+          concurrent function calls (when `n_jobs` > 1), by default "threads". Must
+          be either of `"threads"` (a thread pool with `n_jobs` threads, this is the
+          fastest backend for functions that release the GIL, e.g., most scipy
+          filters), `"processes"` (a process pool with `n_jobs` processes, the
+          series and the function are serialized for each call), or a (persistent)
+          `WorkerPool` or custom `concurrent.futures.Executor` whose workers are used
+          (`n_jobs` is then ignored). Note that such an executor can not be
+          serialized (e.g., via `SeriesPipeline.serialize`).
     **kwargs: dict, optional
         Keyword arguments which will be also passed to the `function`
 
@@ -114,6 +160,7 @@ class SeriesProcessor(FrozenClass):
         self,
         function: Callable,
         series_names: Union[str, Tuple[str, ...], List[str], List[Tuple[str, ...]]],
+        processor_options: Optional[Dict[str, Any]] = None,
         **kwargs,
     ):
         series_names = [to_tuple(names) for names in to_list(series_names)]
@@ -123,6 +170,27 @@ class SeriesProcessor(FrozenClass):
             for series_name_tuple in series_names
         )
         self.series_names: List[Tuple[str, ...]] = series_names
+        options = {**_DEFAULT_PROCESSOR_OPTIONS, **(processor_options or {})}
+        invalid_options = set(options).difference(_DEFAULT_PROCESSOR_OPTIONS)
+        if len(invalid_options):
+            raise ValueError(
+                f"Invalid processor_options {sorted(invalid_options)}, must be in "
+                + f"{list(_DEFAULT_PROCESSOR_OPTIONS)}"
+            )
+        output_names = options["output_names"]
+        self.output_names: Optional[List[str]] = (
+            None if output_names is None else to_list(output_names)
+        )
+        self.inplace: bool = options["inplace"]
+        n_jobs, executor = options["n_jobs"], options["executor"]
+        if isinstance(executor, str) and executor not in ["threads", "processes"]:
+            raise ValueError(
+                f"Invalid executor '{executor}', must be either 'threads' or "
+                + "'processes' (or a WorkerPool / concurrent.futures.Executor)"
+            )
+        self.n_jobs = os.cpu_count() if n_jobs is None else n_jobs
+        assert self.n_jobs > 0, "n_jobs must be > 0"
+        self.executor = executor
         self.function = function
         self.name = self.function.__name__
 
@@ -143,6 +211,18 @@ class SeriesProcessor(FrozenClass):
         """
         return list(set(flatten(name for name in self.series_names)))
 
+    def get_output_series(self) -> Optional[List[str]]:
+        """Return the (declared) output series names of this processor.
+
+        Returns
+        -------
+        Optional[List[str]]
+            List of the output series names, None if the outputs are not declared
+            (see the `output_names` processor option).
+
+        """
+        return None if self.output_names is None else list(self.output_names)
+
     def __call__(self, series_dict: Dict[str, pd.Series]) -> Dict[str, pd.Series]:
         """**Call**culates the processed series.
 
@@ -200,10 +280,10 @@ class SeriesProcessor(FrozenClass):
             """Get a series dict view for the given keys."""
             return {key: series_dict[key] for key in keys}
 
-        for series_name_tuple in self.series_names:
-            func_output = self.function(
-                *get_series_list(series_name_tuple), **self.kwargs
-            )
+        func_outputs = self._map_function(
+            [get_series_list(names) for names in self.series_names]
+        )
+        for series_name_tuple, func_output in zip(self.series_names, func_outputs):
             func_output = _handle_seriesprocessor_func_output(
                 func_output,
                 get_series_dict(series_name_tuple),
@@ -215,6 +295,13 @@ class SeriesProcessor(FrozenClass):
             )
             processed_output.update(func_output)
 
+        if self.output_names is not None:
+            undeclared = set(processed_output.keys()).difference(self.output_names)
+            assert not len(undeclared), (
+                f"Processor {self.name} outputs the undeclared series "
+                + f"{sorted(map(str, undeclared))} (see the `output_names` option)"
+            )
+
         elapsed = time.time() - t_start
         logger.info(
             f"Finished function [{self.name}] on {self.series_names} with output "
@@ -223,6 +310,30 @@ class SeriesProcessor(FrozenClass):
 
         return processed_output
 
+    def _map_function(self, series_lists: List[List[pd.Series]]) -> List[Any]:
+        """Apply the function on each series list, concurrently if `n_jobs` > 1."""
+        n_jobs = min(self.n_jobs, len(series_lists))
+        if os.name == "nt" and self.executor == "processes":
+            n_jobs = 1  # On Windows no multiprocessing is supported
+        if not isinstance(self.executor, (WorkerPool, Executor)) and n_jobs <= 1:
+            return [self.function(*series, **self.kwargs) for series in series_lists]
+
+        tasks = [(self.function, series, self.kwargs) for series in series_lists]
+        if isinstance(self.executor, WorkerPool):
+            return list(self.executor.imap(_call_function, tasks))
+        elif isinstance(self.executor, Executor):
+            return list(self.executor.map(_call_function, tasks))
+        elif self.executor == "threads":
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                return list(pool.map(_call_function, tasks))
+        with Pool(processes=n_jobs) as pool:
+            try:
+                return pool.map(_call_function, tasks)
+            finally:
+                # Close & join because: https://github.com/uqfoundation/pathos/issues/131
+                pool.close()
+                pool.join()
+
     def __repr__(self):
         """Return formal representation of object."""
         repr_str = self.name + (" " + str(self.kwargs))
@@ -237,6 +348,12 @@ class SeriesProcessor(FrozenClass):
 # ---------------------- utility functions for a SeriesProcessor ----------------------
 
 
+def _call_function(task: Tuple[Callable, List[pd.Series], dict]) -> Any:
+    """Call the function (of a SeriesProcessor) on the series with the kwargs."""
+    function, series, kwargs = task
+    return function(*series, **kwargs)
+
+
 def _np_array_to_series(np_array: np.ndarray, series: pd.Series) -> pd.Series:
     """Convert the `np_array` into a pandas Series.
 
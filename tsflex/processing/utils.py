@@ -5,20 +5,45 @@ __author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
 
 import os
 import traceback
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import pandas as pd
 from multiprocess import Pool
 from tqdm.auto import tqdm
 
+from ..utils.worker_pool import WorkerPool, get_shared_object
 from .series_pipeline import SeriesPipeline
 
 
+def _process_same_range_chunks(
+    series_pipeline: SeriesPipeline,
+    same_range_chunks: List[Union[pd.Series, pd.DataFrame]],
+    processing_kwargs: dict,
+) -> Any:
+    try:
+        return series_pipeline.process(same_range_chunks, **processing_kwargs)
+    except Exception:
+        # Print traceback and return empty `pd.DataFrame` in order to not break the
+        # other parallel processes.
+        traceback.print_exc()
+        return pd.DataFrame()
+
+
+def _worker_pool_executor(args: Tuple[tuple, List[Union[pd.Series, pd.DataFrame]]]):
+    # The series pipeline and processing kwargs are shared (once) with the workers
+    pipeline_descriptor, same_range_chunks = args
+    series_pipeline, processing_kwargs = get_shared_object(pipeline_descriptor)
+    return _process_same_range_chunks(
+        series_pipeline, same_range_chunks, processing_kwargs
+    )
+
+
 def process_chunks_multithreaded(
     same_range_chunks_list: List[List[Union[pd.Series, pd.DataFrame]]],
     series_pipeline: SeriesPipeline,
     show_progress: Optional[bool] = True,
     n_jobs: Optional[int] = None,
+    executor: Optional[WorkerPool] = None,
     **processing_kwargs,
 ) -> List[Any]:
     """Process `same_range_chunks_list` in a multithreaded manner, order is preserved.
@@ -34,6 +59,11 @@ def process_chunks_multithreaded(
     n_jobs: int, optional
         The number of processes used for the chunked series processing. If `None`, then
         the number returned by `os.cpu_count()` is used, by default None.
+    executor: WorkerPool, optional
+        A (persistent) `WorkerPool` whose worker processes are used for the chunked
+        series processing, by default None. If passed, `n_jobs` is ignored and the
+        worker processes are reused across calls (the `series_pipeline` is shared
+        only once with the workers).
     **processing_kwargs
         Keyword arguments that will be passed on to the processing pipeline.
 
@@ -56,15 +86,29 @@ def process_chunks_multithreaded(
         n_jobs = os.cpu_count()
 
     def _executor(same_range_chunks: List[Union[pd.Series, pd.DataFrame]]):
+        return _process_same_range_chunks(
+            series_pipeline, same_range_chunks, processing_kwargs
+        )
+
+    processed_out = None
+    if executor is not None:
+        pipeline_descriptor = executor.share((series_pipeline, processing_kwargs))
         try:
-            return series_pipeline.process(same_range_chunks, **processing_kwargs)
+            results = executor.imap(
+                _worker_pool_executor,
+                [(pipeline_descriptor, chunks) for chunks in same_range_chunks_list],
+            )
+            if show_progress:
+                results = tqdm(results, total=len(same_range_chunks_list))
+            # Note: same error handling as the (non-persistent) Pool below
+            processed_out = [f for f in results]
         except Exception:
-            # Print traceback and return empty `pd.DataFrame` in order to not break the
-            # other parallel processes.
             traceback.print_exc()
-            return pd.DataFrame()
+        finally:
+            # Release the shared memory of the pipeline (as it is shared for each call)
+            executor.unshare(pipeline_descriptor)
+        return processed_out
 
-    processed_out = None
     with Pool(processes=min(n_jobs, len(same_range_chunks_list))) as pool:
         results = pool.imap(_executor, same_range_chunks_list)
         if show_progress:
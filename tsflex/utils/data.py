@@ -5,7 +5,7 @@ __author__ = "Jeroen Van Der Donckt, Jonas Van Der Donckt"
 import itertools
 import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -103,6 +103,94 @@ def to_series_list(
     return series_list
 
 
+def load_npy_series(
+    path: Union[str, Path],
+    series_names: Optional[List[str]] = None,
+    index_name: str = "index",
+    mmap_mode: Optional[str] = "r",
+) -> List[pd.Series]:
+    """Load the series that are stored in (memory-mapped) `.npy` files.
+
+    The series are backed by the memory-mapped files, i.e., the data is not loaded
+    into memory but read from the (page-cached) files when it is accessed. Hence,
+    segmenting and calculating features on these series does not require to load
+    (a copy of) the whole series in memory.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        Either of:\n
+        * a directory with a `<series_name>.npy` file for each series. The index of a
+          series is loaded from `<series_name>.<index_name>.npy`, or, if not present,
+          from the shared `<index_name>.npy` file.
+        * a `.npy` file with a structured array, with a field for each series and an
+          optional `index_name` field for the (shared) index.
+
+        If there is no index (file or field), a range index is used. Otherwise, the
+        index is named `index_name`.
+    series_names : List[str], optional
+        The names of the series that are loaded, by default None. If None, all the
+        series are loaded.
+    index_name : str, optional
+        The name of the index (file or field), by default "index".
+    mmap_mode : str, optional
+        The memory-map mode of `np.load`, by default "r". If None, the data is loaded
+        into memory.
+
+    Returns
+    -------
+    List[pd.Series]
+        The (memory-mapped) series.
+
+    """
+    path = Path(path)
+    if path.is_dir():
+        files = {f.name[: -len(".npy")]: f for f in sorted(path.glob("*.npy"))}
+        shared_index = files.get(index_name)
+        names = [
+            n for n in files if n != index_name and not n.endswith(f".{index_name}")
+        ]
+
+        def get_values_and_index(name: str) -> Tuple[np.ndarray, Any]:
+            index_file = files.get(f"{name}.{index_name}", shared_index)
+            return (
+                np.load(files[name], mmap_mode=mmap_mode),
+                None
+                if index_file is None
+                else np.load(index_file, mmap_mode=mmap_mode),
+            )
+
+    else:
+        arr = np.load(path, mmap_mode=mmap_mode)
+        if arr.dtype.names is None:
+            raise ValueError(
+                f"{path} must be either a directory or a .npy file with a structured "
+                + "array"
+            )
+        names = [n for n in arr.dtype.names if n != index_name]
+        index = arr[index_name] if index_name in arr.dtype.names else None
+
+        def get_values_and_index(name: str) -> Tuple[np.ndarray, Any]:
+            return arr[name], index
+
+    if series_names is not None:
+        names = [n for n in names if n in series_names]
+
+    series_list: List[pd.Series] = []
+    for name in names:
+        values, index = get_values_and_index(name)
+        if index is None:
+            index = pd.RangeIndex(len(values))
+        else:
+            index = pd.Index(index, name=index_name, copy=False)
+        assert len(index) == len(
+            values
+        ), f"The index and values of series '{name}' have a different length"
+        # Note: the index and values are views on the memory-mapped data (no copy)
+        series_list.append(pd.Series(values, index=index, name=name, copy=False))
+    return series_list
+
+
 def to_list(x: Any) -> List:
     """Convert the input to a list if necessary.
 
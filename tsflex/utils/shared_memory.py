@@ -0,0 +1,181 @@
+"""Utility functions for sharing series data between processes."""
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+import inspect
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from multiprocess import shared_memory
+
+
+def _array_to_shared_memory(
+    arr: np.ndarray, shms: List[shared_memory.SharedMemory]
+) -> Any:
+    """Copy the array into a new shared memory block.
+
+    The created shared memory block is appended to `shms`.
+
+    Returns
+    -------
+    Any
+        A (picklable) descriptor of the shared array. For object arrays (which cannot
+        be stored in shared memory) the array itself is returned.
+
+    """
+    if arr.dtype.hasobject:
+        return arr
+    # Note: a shared memory block of size 0 cannot be created
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    shms.append(shm)
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[:] = arr
+    return shm.name, arr.dtype.str, arr.shape
+
+
+# Whether the SharedMemory class supports attaching without tracking (Python >= 3.13)
+_SUPPORTS_TRACK = "track" in inspect.signature(shared_memory.SharedMemory).parameters
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block.
+
+    The process that created the shared memory block is responsible for unlinking
+    it. The (worker) processes of tsflex share the resource tracker of the process
+    that created them (for each start method), so registering the attached block
+    again is a no-op, whereas unregistering it would drop the registration of the
+    creating process.
+
+    """
+    if _SUPPORTS_TRACK:  # pragma: no cover
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _array_from_shared_memory(
+    descriptor: Any, shms: List[shared_memory.SharedMemory]
+) -> np.ndarray:
+    """Create a read-only view of the shared array described by `descriptor`.
+
+    The attached shared memory block is appended to `shms`.
+
+    """
+    if isinstance(descriptor, np.ndarray):
+        return descriptor
+    name, dtype, shape = descriptor
+    shm = _attach_shared_memory(name)
+    shms.append(shm)
+    arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    arr.flags.writeable = False
+    return arr
+
+
+def series_dict_to_shared_memory(
+    series_dict: Dict[str, pd.Series]
+) -> Tuple[Dict[str, dict], List[shared_memory.SharedMemory]]:
+    """Place the index and values of each series into shared memory.
+
+    Parameters
+    ----------
+    series_dict : Dict[str, pd.Series]
+        The dict with the Series.
+
+    Returns
+    -------
+    Tuple[Dict[str, dict], List[shared_memory.SharedMemory]]
+        Tuple of 1st a (picklable) descriptor of the shared series dict, and 2nd the
+        created shared memory blocks.
+
+    Note
+    ----
+    The caller is responsible for closing and unlinking the returned shared memory
+    blocks (see `close_shared_memory`) when the shared series are no longer needed.
+
+    """
+    shms: List[shared_memory.SharedMemory] = []
+    descriptor: Dict[str, dict] = {}
+    try:
+        for key, s in series_dict.items():
+            values = s.values
+            if not isinstance(values, np.ndarray):
+                # Extension arrays (e.g., categoricals) are not shared
+                descriptor[key] = {"series": s}
+                continue
+            index = s.index
+            index_dtype = index.dtype if isinstance(index, pd.DatetimeIndex) else None
+            descriptor[key] = {
+                "name": s.name,
+                "index_name": index.name,
+                "index_dtype": index_dtype,
+                "index": _array_to_shared_memory(np.asarray(index.values), shms),
+                "values": _array_to_shared_memory(values, shms),
+            }
+    except Exception:
+        close_shared_memory(shms, unlink=True)
+        raise
+    return descriptor, shms
+
+
+def series_dict_from_shared_memory(
+    descriptor: Dict[str, dict]
+) -> Tuple[Dict[str, pd.Series], List[shared_memory.SharedMemory]]:
+    """Reconstruct the series dict from its shared memory descriptor.
+
+    The series are read-only views of the shared memory, i.e., no data is copied.
+
+    Parameters
+    ----------
+    descriptor : Dict[str, dict]
+        The shared series dict descriptor, i.e., the output of
+        `series_dict_to_shared_memory`.
+
+    Returns
+    -------
+    Tuple[Dict[str, pd.Series], List[shared_memory.SharedMemory]]
+        Tuple of 1st the series dict, and 2nd the attached shared memory blocks.
+
+    Note
+    ----
+    The returned shared memory blocks must be kept alive as long as the series are
+    used, and should only be closed (not unlinked) afterwards.
+
+    """
+    shms: List[shared_memory.SharedMemory] = []
+    series_dict: Dict[str, pd.Series] = {}
+    for key, d in descriptor.items():
+        if "series" in d:
+            series_dict[key] = d["series"]
+            continue
+        index = _array_from_shared_memory(d["index"], shms)
+        if d["index_dtype"] is not None:
+            index = pd.DatetimeIndex(
+                pd.arrays.DatetimeArray(index, dtype=d["index_dtype"], copy=False),
+                name=d["index_name"],
+            )
+        else:
+            index = pd.Index(index, name=d["index_name"], copy=False)
+        series_dict[key] = pd.Series(
+            _array_from_shared_memory(d["values"], shms),
+            index=index,
+            name=d["name"],
+            copy=False,
+        )
+    return series_dict, shms
+
+
+def close_shared_memory(shms: List[shared_memory.SharedMemory], unlink: bool):
+    """Close (and unlink) the given shared memory blocks.
+
+    Parameters
+    ----------
+    shms : List[shared_memory.SharedMemory]
+        The shared memory blocks.
+    unlink : bool
+        Whether the shared memory blocks should also be unlinked (i.e., destroyed).
+        This should only be done by the process that created the blocks.
+
+    """
+    for shm in shms:
+        shm.close()
+        if unlink:
+            shm.unlink()
@@ -0,0 +1,243 @@
+"""WorkerPool class for reusing (warm) worker processes across calls."""
+
+from __future__ import annotations
+
+__author__ = "Jonas Van Der Donckt, Jeroen Van Der Donckt"
+
+import hashlib
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+import dill
+from multiprocess import Barrier, Pool, shared_memory
+
+from .shared_memory import _attach_shared_memory, close_shared_memory
+
+# The (deserialized) shared objects of a worker process, with as key their token
+_worker_shared_objects: Dict[str, Any] = {}
+# The maximum number of shared objects that are kept by a worker process
+_MAX_WORKER_SHARED_OBJECTS = 8
+# The barrier of a worker process, which is used to broadcast a function to all the
+# workers of the pool (see `WorkerPool.broadcast`)
+_worker_barrier = None
+# The time (in seconds) that a broadcasted function waits for the other workers
+_BROADCAST_TIMEOUT = 60
+
+
+def _init_worker(barrier):
+    global _worker_barrier
+    _worker_barrier = barrier
+
+
+def _broadcast_executor(args: Tuple[Callable, tuple]) -> Any:
+    """Call the function and wait until every worker has called it."""
+    func, func_args = args
+    try:
+        return func(*func_args)
+    finally:
+        # Block this worker, so that each worker executes exactly one of the tasks
+        try:
+            _worker_barrier.wait(_BROADCAST_TIMEOUT)
+        except threading.BrokenBarrierError:  # pragma: no cover
+            pass
+
+
+class WorkerPool:
+    """A pool of worker processes that is kept alive across calls.
+
+    Creating a process pool (i.e., forking the processes and importing the required
+    modules) takes a few hundred milliseconds. When the same work is done for many
+    (small) chunks of data, e.g., by calling `FeatureCollection.calculate` for each
+    chunk, a `WorkerPool` can be passed as `executor` to avoid this overhead for each
+    call.
+
+    Objects that are required by every task (e.g., the `FeatureCollection`) are
+    shared with the workers via `share`; these are serialized (once) into shared
+    memory and each worker deserializes them only once. Hence, only the (chunk) data
+    is shipped for each call.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        The number of worker processes. If `None`, then the number returned by
+        _os.cpu_count()_ is used, by default None.
+
+    Notes
+    -----
+    * The worker processes are created upon first use and are kept alive until the
+      pool is closed. Use the pool as a context manager or call `close` when done.
+    * As the workers are reused, the state of a previous call (e.g., the
+      deserialized shared objects) might be kept in the worker processes.
+
+    Examples
+    --------
+    ```python
+    from tsflex.features import WorkerPool
+
+    with WorkerPool(n_jobs=8) as pool:
+        for chunk in chunks:
+            fc.calculate(chunk, executor=pool)
+    ```
+
+    """
+
+    def __init__(self, n_jobs: Optional[int] = None):
+        if n_jobs is None:
+            n_jobs = os.cpu_count()
+        assert n_jobs > 0, "n_jobs must be > 0"
+        self.n_jobs = n_jobs
+        self._pool = None
+        self._barrier = None
+        # The shared memory blocks & descriptors of the shared objects, with as key
+        # their token
+        self._shared: Dict[str, shared_memory.SharedMemory] = {}
+        self._descriptors: Dict[str, Tuple[str, str, int]] = {}
+        # The (weak reference, version, token) of the versioned shared objects, with
+        # as key their id
+        self._versioned: Dict[int, Tuple[weakref.ref, Hashable, str]] = {}
+
+    @property
+    def pool(self) -> Pool:
+        """The (lazily created) process pool."""
+        if self._pool is None:
+            self._barrier = Barrier(self.n_jobs)
+            self._pool = Pool(
+                processes=self.n_jobs,
+                initializer=_init_worker,
+                initargs=(self._barrier,),
+            )
+        return self._pool
+
+    def share(
+        self, obj: Any, version: Optional[Hashable] = None
+    ) -> Tuple[str, str, int]:
+        """Share the object with the worker processes.
+
+        The (dill) serialized object is placed in shared memory. The same object
+        (i.e., with the same serialization) is only placed once.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to share.
+        version : Hashable, optional
+            The version of the object, by default None. If not None, the descriptor
+            is cached per object (identity) and version, i.e., the object is only
+            serialized again when its version changes. The shared memory of the
+            previous version of the object is then released. \n
+            Hence, the version must change whenever the object is modified.
+
+        Returns
+        -------
+        Tuple[str, str, int]
+            The (small) descriptor of the shared object, which should be passed to
+            `get_shared_object` in the worker process.
+
+        """
+        if version is not None:
+            ref, cached_version, token = self._versioned.get(id(obj), (None,) * 3)
+            if ref is not None and ref() is obj and token in self._descriptors:
+                if cached_version == version:
+                    return self._descriptors[token]
+                # The object is modified -> release its previous version
+                self.unshare(self._descriptors[token])
+
+        data = dill.dumps(obj)
+        token = hashlib.sha1(data).hexdigest()
+        if token not in self._shared:
+            shm = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+            shm.buf[: len(data)] = data
+            self._shared[token] = shm
+            self._descriptors[token] = (token, shm.name, len(data))
+        if version is not None:
+            self._versioned = {
+                k: v for k, v in self._versioned.items() if v[0]() is not None
+            }
+            self._versioned[id(obj)] = (weakref.ref(obj), version, token)
+        return self._descriptors[token]
+
+    def unshare(self, descriptor: Tuple[str, str, int]):
+        """Release the shared memory of the shared object with the given descriptor."""
+        shm = self._shared.pop(descriptor[0], None)
+        self._descriptors.pop(descriptor[0], None)
+        if shm is not None:
+            close_shared_memory([shm], unlink=True)
+
+    def broadcast(self, func: Callable, *args) -> list:
+        """Call the function (with the arguments) once in each worker process.
+
+        This can be used to e.g., release the state of a previous call in each worker.
+        The pool should not be used (e.g., by another thread) during the broadcast.
+
+        Returns
+        -------
+        list
+            The output of the function in each worker process.
+
+        """
+        return self.pool.map(
+            _broadcast_executor, [(func, args)] * self.n_jobs, chunksize=1
+        )
+
+    def imap(self, func: Callable, tasks: Iterable, chunksize: int = 1) -> Iterator:
+        """Apply `func` on each task in the worker processes, order is preserved."""
+        return self.pool.imap(func, tasks, chunksize)
+
+    def imap_unordered(
+        self, func: Callable, tasks: Iterable, chunksize: int = 1
+    ) -> Iterator:
+        """Apply `func` on each task in the worker processes, in arbitrary order."""
+        return self.pool.imap_unordered(func, tasks, chunksize)
+
+    def close(self):
+        """Close the pool, i.e., wait for the worker processes to exit."""
+        if self._pool is not None:
+            # Close & join because: https://github.com/uqfoundation/pathos/issues/131
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+            self._barrier = None
+        close_shared_memory(list(self._shared.values()), unlink=True)
+        self._shared, self._descriptors, self._versioned = {}, {}, {}
+
+    def __enter__(self) -> WorkerPool:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self) -> str:
+        """Representation string of a WorkerPool."""
+        return f"{self.__class__.__name__}(n_jobs={self.n_jobs})"
+
+
+def get_shared_object(descriptor: Tuple[str, str, int]) -> Any:
+    """Return the object that is shared via `WorkerPool.share`.
+
+    This function should be called in the worker process; the object is only
+    deserialized upon first use.
+
+    Parameters
+    ----------
+    descriptor : Tuple[str, str, int]
+        The descriptor of the shared object, i.e., the output of `WorkerPool.share`.
+
+    Returns
+    -------
+    Any
+        The shared object.
+
+    """
+    token, name, size = descriptor
+    if token not in _worker_shared_objects:
+        if len(_worker_shared_objects) >= _MAX_WORKER_SHARED_OBJECTS:
+            # Remove the oldest shared object
+            _worker_shared_objects.pop(next(iter(_worker_shared_objects)))
+        shm = _attach_shared_memory(name)
+        try:
+            _worker_shared_objects[token] = dill.loads(bytes(shm.buf[:size]))
+        finally:
+            shm.close()
+    return _worker_shared_objects[token]